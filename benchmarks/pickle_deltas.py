@@ -0,0 +1,168 @@
+"""Measures how large pickled deltas are and how long they take to pickle,
+unpickle, and parse.
+
+A delta with the given number of modified components is built from a
+synthetic model type, so rhino3dm is not needed. Run it from the root of the
+repository, before and after a change to the classes that make up a delta:
+
+    PYTHONPATH=src python benchmarks/pickle_deltas.py --modifications 20000
+
+To measure an earlier commit, check it out into a worktree and point
+PYTHONPATH at its src directory instead.
+
+The plain pickle is what a delta costs without DeltaPickler, which the cache
+uses to refer to the model type, component types, and properties by
+position. On trees that predate DeltaPickler, only the plain pickle is
+measured."""
+
+from argparse import ArgumentParser
+import io
+import pickle
+from time import perf_counter
+from uuid import UUID
+
+from opennurbs_diffutils.abstractmodel import (
+    ComponentModification,
+    ComponentType,
+    ComponentTypeRegistry,
+    FloatValue,
+    IntegerValue,
+    ModelDelta,
+    ModelType,
+    Property,
+    StringValue,
+    Table,
+)
+
+try:
+    from opennurbs_diffutils.abstractmodel.deltacache import (
+        DeltaPickler,
+        DeltaUnpickler,
+    )
+except ImportError:
+    DeltaPickler = DeltaUnpickler = None
+
+
+class Component:
+    pass
+
+
+class ComponentTable(Table):
+    def getComponent(self, model, id):
+        raise NotImplementedError()
+
+    def allComponents(self, model):
+        raise NotImplementedError()
+
+    @staticmethod
+    def getComponentId(component):
+        raise NotImplementedError()
+
+    @staticmethod
+    def setComponentId(component, id):
+        raise NotImplementedError()
+
+    def addComponent(self, component, model):
+        raise NotImplementedError()
+
+    def deleteComponent(self, component, model):
+        raise NotImplementedError()
+
+
+TABLE = ComponentTable("Components")
+COMPONENT_TYPE = ComponentType(
+    "Component",
+    Component,
+    TABLE,
+    [
+        Property("Name", StringValue, "Name"),
+        Property("Layer", IntegerValue, "Layer"),
+        Property("X", FloatValue, "X"),
+        Property("Y", FloatValue, "Y"),
+    ],
+)
+MODEL_TYPE = ModelType([TABLE], ComponentTypeRegistry([COMPONENT_TYPE]), [])
+
+
+def createDelta(count: int) -> ModelDelta:
+    """Returns a delta in which each component changes two or three properties."""
+    delta = ModelDelta(MODEL_TYPE)
+    properties = list(COMPONENT_TYPE.properties)
+    for i in range(count):
+        modification = ComponentModification(COMPONENT_TYPE, UUID(int=i + 1))
+        for property in properties[i % 2 : i % 2 + 2 + i % 2]:
+            older, newer = {
+                "Name": (f"component {i}", f"renamed {i}"),
+                "Layer": (i % 7, i % 5),
+                "X": (i * 0.5, i * 0.5 + 1.25),
+                "Y": (-i * 0.25, -i * 0.25 - 2.5),
+            }[property.name]
+            modification.properties[property] = property.type(older).diff(
+                property.type(newer)
+            )
+        delta.addComponent(modification)
+    return delta
+
+
+def writeDelta(delta: ModelDelta) -> str:
+    output = io.StringIO()
+    # Timestamped headers can be read by every version of the parser
+    output.write("--- model.3dm 2023-01-01 00:00:00.000000 +0000\n")
+    output.write("+++ model.3dm 2023-01-02 00:00:00.000000 +0000\n")
+    for component in delta.components:
+        component.write(output)
+    return output.getvalue()
+
+
+def best(function, repeat: int):
+    """Returns the result of the function and the shortest of the times it took."""
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        times.append(perf_counter() - start)
+    return result, min(times)
+
+
+def dumpWithPickler(delta: ModelDelta) -> bytes:
+    output = io.BytesIO()
+    DeltaPickler(output, MODEL_TYPE).dump(delta)
+    return output.getvalue()
+
+
+def loadWithUnpickler(data: bytes) -> ModelDelta:
+    return DeltaUnpickler(io.BytesIO(data), MODEL_TYPE).load()
+
+
+def parse(text: str) -> ModelDelta:
+    delta = ModelDelta(MODEL_TYPE)
+    delta.read(io.StringIO(text))
+    return delta
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modifications", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    delta = createDelta(args.modifications)
+    text = writeDelta(delta)
+    print(f"{args.modifications} modifications, {len(text) / 1e6:.2f} MB of text")
+    _, seconds = best(lambda: parse(text), args.repeat)
+    print(f"parse:          {seconds:.2f} s")
+
+    methods = [("plain pickle", pickle.dumps, pickle.loads)]
+    if DeltaPickler is not None:
+        methods.append(("DeltaPickler", dumpWithPickler, loadWithUnpickler))
+    for name, dump, load in methods:
+        data, dumpSeconds = best(lambda: dump(delta), args.repeat)
+        _, loadSeconds = best(lambda: load(data), args.repeat)
+        print(
+            f"{name + ':':15} {len(data) / 1e6:.2f} MB,"
+            f" dump {dumpSeconds:.2f} s, load {loadSeconds:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
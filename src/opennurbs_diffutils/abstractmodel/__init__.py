@@ -1,5 +1,11 @@
-from .accessor import Accessor, FunctionalAccessor, PathAccessor
-from .commontypes import Pair
+from .accessor import (
+    Accessor,
+    AccessorTree,
+    FunctionalAccessor,
+    PathAccessor,
+    Scratch,
+)
+from .commontypes import Pair, Triple
 from .componentdelta import (
     ComponentDelta,
     ComponentAddition,
@@ -7,12 +13,20 @@ from .componentdelta import (
     ComponentModification,
 )
 from .componenttype import ComponentType, ComponentTypeRegistry
+from .conflict import Conflict
 from .delta import Delta, Substitution
+from .deltacache import DeltaCache
+from .editscript import EditScript, SequenceEdit, StringEdit
+from .error import ParseError
+from .filedescription import FileDescription
+from .filter import Filter
 from .modeldelta import ModelDelta
 from .modeltype import ModelType
 from .property import Property
 from .propertymap import PropertyMap, PropertyValueMap, PropertyDeltaMap
+from .query import Query
 from .session import Session
+from .snapshot import Snapshot
 from .stringable import Stringable
 from .table import Table
 from .value import (
@@ -23,6 +37,7 @@ from .value import (
     StringValue,
     UUIDValue,
     EnumeratedValue,
+    SequenceValue,
     JSONEncodeableValue,
     RegexParseableValue,
 )
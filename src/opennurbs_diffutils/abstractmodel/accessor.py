@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Callable, Generic, TypeVar, Union
+from typing import Callable, Generic, Iterable, Tuple, TypeVar, Union
 
 
 H = TypeVar("H")
@@ -17,6 +17,34 @@ class Accessor(Generic[H, V]):
     def set(self, host: H, newValue: V) -> None:
         """Set the value of a property on the given host object."""
 
+    def split(self) -> "Tuple[Tuple[str, ...], Accessor[object, V]]":
+        """Divides the accessor into the path of attributes that leads from the
+        host to an intermediate object and an accessor that gets the value from
+        that object.
+
+        Accessors that share part of a path can then fetch the objects along it
+        once. By default, the path is empty and the accessor is returned."""
+        return (), self
+
+    def getWith(self, host: H, scratch: "Scratch") -> V:
+        """Gets the value of a property from the given host object while a
+        series of its properties is read or assigned through a Scratch.
+
+        By default, any change held in the scratch is written to the host first."""
+        scratch.flush()
+        return self.get(host)
+
+    def setWith(self, host: H, newValue: V, scratch: "Scratch") -> None:
+        """Sets the value of a property on the given host object while a
+        series of its properties is read or assigned through a Scratch.
+
+        By default, any change held in the scratch is written to the host
+        first, and the objects held in the scratch are then discarded, since
+        the assignment may have replaced them."""
+        scratch.flush()
+        self.set(host, newValue)
+        scratch.clear()
+
 
 class PathAccessor(Accessor[H, V]):
     """An implementation of Accessor that traverses a dot-delimited path to get and set an object property."""
@@ -45,6 +73,9 @@ class PathAccessor(Accessor[H, V]):
             host = getattr(host, name)
         setattr(host, self._path[-1], value)
 
+    def split(self):
+        return tuple(self._path[:-1]), PathAccessor(self._path[-1])
+
     @classmethod
     def ifString(cls, maybeAccessor: Union[Accessor, str]) -> Accessor:
         """Returns a PathAccessor based on the given parameter if that parameter is a string.
@@ -61,3 +92,115 @@ class FunctionalAccessor(Accessor[H, V]):
     def __init__(self, getter: Callable[[H], V], setter: Callable[[H, V], None]):
         self.get = getter
         self.set = setter
+
+
+class Scratch:
+    """Holds the intermediate objects fetched from one host while a series of
+    its properties is read or assigned.
+
+    Accessors that read from or change the same intermediate object, such as
+    the line of a line curve, fetch it from the host only once; changes to it
+    are written back to the host once, when the scratch is flushed."""
+
+    __slots__ = ("host", "_objects", "_changed")
+
+    def __init__(self, host):
+        self.host = host
+        self._objects = {}
+        self._changed: dict[object, Accessor] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.flush()
+
+    @staticmethod
+    def _key(accessor: Accessor):
+        # Separate accessors for the same path share an object
+        return str(accessor) if isinstance(accessor, PathAccessor) else accessor
+
+    def fetch(self, accessor: Accessor):
+        """Returns the intermediate object that the given accessor gets from the host, fetching it the first time it is needed."""
+        key = self._key(accessor)
+        try:
+            return self._objects[key]
+        except KeyError:
+            intermediate = self._objects[key] = accessor.get(self.host)
+            return intermediate
+
+    def markChanged(self, accessor: Accessor):
+        """Records that an object returned by fetch() has been changed and must be written back to the host."""
+        self._changed[self._key(accessor)] = accessor
+
+    def flush(self):
+        """Writes every changed object back to the host."""
+        for key, accessor in self._changed.items():
+            accessor.set(self.host, self._objects[key])
+        self._changed.clear()
+
+    def clear(self):
+        """Discards the objects held in the scratch without writing them back."""
+        self._objects.clear()
+        self._changed.clear()
+
+
+class AccessorTree:
+    """Gets the values of several properties at once, following the paths they
+    have in common only once.
+
+    Each node of the tree holds the properties whose values are read directly
+    from the object it is given, the properties whose value is that object
+    itself, and the nodes for the attributes of that object that lead to the
+    values of other properties."""
+
+    __slots__ = ("_leaves", "_objects", "_children")
+
+    def __init__(self, properties: Iterable["Property"] = ()):
+        self._leaves: list[Tuple["Property", Accessor]] = []
+        self._objects: list["Property"] = []
+        self._children: dict[str, AccessorTree] = {}
+        for property in properties:
+            path, accessor = property.accessor.split()
+            node = self
+            for name in path:
+                child = node._children.get(name)
+                if child is None:
+                    child = node._children[name] = AccessorTree()
+                node = child
+            node._leaves.append((property, accessor))
+        self._shareObjects()
+
+    def _shareObjects(self):
+        """Makes the properties whose value is an object on the path to other
+        properties take that object from the node that fetches it."""
+        leaves = []
+        for property, accessor in self._leaves:
+            child = None
+            if isinstance(accessor, PathAccessor):
+                child = self._children.get(str(accessor))
+            if child is not None:
+                child._objects.append(property)
+            else:
+                leaves.append((property, accessor))
+        self._leaves = leaves
+        for child in self._children.values():
+            child._shareObjects()
+
+    def read(self, host, values: dict = None) -> dict:
+        """Adds the value of each property in the tree for the given host object to a dictionary keyed by property."""
+        if values is None:
+            values = {}
+        for property in self._objects:
+            values[property] = host
+        for property, accessor in self._leaves:
+            values[property] = accessor.get(host)
+        for name, child in self._children.items():
+            try:
+                intermediate = getattr(host, name)
+            except AttributeError as e:
+                raise AttributeError(
+                    f"Unable to get {name} from object of type {host.__class__.__name__}: {e}"
+                )
+            child.read(intermediate, values)
+        return values
@@ -0,0 +1,204 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterator
+from uuid import UUID
+
+from .componentdelta import ComponentModification
+from .componenttype import ComponentType, ComponentTypeRegistry
+from .delta import Delta, Substitution
+from .property import Property
+from .propertymap import PropertyDeltaMap
+
+
+_ID_SIZE = 16
+
+_NOT_SUBSTITUTION = object()
+"Marks a cell of a column that holds a Delta rather than a pair of unwrapped values."
+
+
+class _Column:
+    """The changes made to one property of the components of one type.
+
+    The rows of the components that change the property are kept in
+    ascending order. A Substitution is stored as the unwrapped values it
+    replaces; any other Delta is stored as it is."""
+
+    __slots__ = ("rows", "older", "newer")
+
+    def __init__(self):
+        self.rows = array("L")
+        self.older = []
+        self.newer = []
+
+    def append(self, row: int, property: Property, delta: Delta):
+        self.rows.append(row)
+        if (
+            isinstance(delta, Substitution)
+            and type(delta.older) is property.type
+            and type(delta.newer) is property.type
+        ):
+            self.older.append(delta.older.value)
+            self.newer.append(delta.newer.value)
+        else:
+            self.older.append(delta)
+            self.newer.append(_NOT_SUBSTITUTION)
+
+    def index(self, row: int) -> "int | None":
+        """Returns the position of the given row in the column, or None if the row does not change the property."""
+        index = bisect_left(self.rows, row)
+        if index < len(self.rows) and self.rows[index] == row:
+            return index
+        return None
+
+    def get(self, index: int, property: Property) -> Delta:
+        """Recreates the Delta stored at the given position in the column."""
+        newer = self.newer[index]
+        if newer is _NOT_SUBSTITUTION:
+            return self.older[index]
+        return Substitution.specialize(property.type)(
+            property.type(self.older[index]), property.type(newer)
+        )
+
+
+class _TypeColumns:
+    """The modifications made to the components of one type, stored as
+    parallel arrays indexed by row."""
+
+    __slots__ = ("type", "ids", "newIds", "columns", "order")
+
+    def __init__(self, type: ComponentType):
+        self.type = type
+        self.ids = bytearray()
+        """The IDs of the modified components, 16 bytes per row."""
+        self.newIds: dict[int, UUID] = {}
+        """The IDs given to the components whose IDs are changed, by row."""
+        self.columns: dict[Property, _Column] = {}
+        self.order: list[Property] = []
+        """The properties with columns, in the order in which they are applied."""
+
+    def __len__(self):
+        return len(self.ids) // _ID_SIZE
+
+    def _sortKey(self, property: Property):
+        # Properties that are affected by others come last, as they do when
+        # the changes are found by PropertyDeltaMap.fromDifferences()
+        properties = list(self.type.properties)
+        position = properties.index(property) if property in properties else 0
+        return (property.affectedBy is not None, position)
+
+    def append(self, delta: ComponentModification):
+        row = len(self)
+        self.ids += delta.id.bytes
+        if delta.newId is not None:
+            self.newIds[row] = delta.newId
+        for property, item in delta.properties.items():
+            column = self.columns.get(property)
+            if column is None:
+                column = self.columns[property] = _Column()
+                self.order = sorted(self.columns, key=self._sortKey)
+            column.append(row, property, item)
+
+    def find(self, id: UUID) -> "int | None":
+        """Returns the row of the component with the given ID, or None if it was not modified."""
+        key = id.bytes
+        start = 0
+        while True:
+            offset = self.ids.find(key, start)
+            if offset < 0:
+                return None
+            if offset % _ID_SIZE == 0:
+                return offset // _ID_SIZE
+            start = offset + 1
+
+    def _create(self, row: int, properties: list) -> ComponentModification:
+        """Creates a ComponentModification for the given row from (property, delta) pairs."""
+        start = row * _ID_SIZE
+        delta = ComponentModification(
+            self.type, UUID(bytes=bytes(self.ids[start : start + _ID_SIZE]))
+        )
+        delta.newId = self.newIds.get(row)
+        delta.properties = PropertyDeltaMap(properties)
+        return delta
+
+    def get(self, row: int) -> ComponentModification:
+        """Creates a ComponentModification for a single row."""
+        properties = []
+        for property in self.order:
+            column = self.columns[property]
+            index = column.index(row)
+            if index is not None:
+                properties.append((property, column.get(index, property)))
+        return self._create(row, properties)
+
+    def __iter__(self) -> Iterator[ComponentModification]:
+        # Each column is read once from start to end rather than searched for every row
+        cursors = {property: 0 for property in self.order}
+        for row in range(len(self)):
+            properties = []
+            for property in self.order:
+                column = self.columns[property]
+                index = cursors[property]
+                if index < len(column.rows) and column.rows[index] == row:
+                    properties.append((property, column.get(index, property)))
+                    cursors[property] = index + 1
+            yield self._create(row, properties)
+
+
+class ColumnarModificationList:
+    """A list of ComponentModifications that stores their contents in columns
+    rather than as individual objects.
+
+    The modifications made to the components of each type are kept as an
+    array of component IDs and, for each property that changes, arrays of
+    the rows that change it and of the values before and after the change.
+    ComponentModification objects are only created when the list is iterated
+    or searched, so changes made to them are not kept."""
+
+    __slots__ = ("_componentTypes", "_types", "_typeIndices", "_order")
+
+    def __init__(self, componentTypes: ComponentTypeRegistry):
+        self._componentTypes = componentTypes
+        self._types: list[_TypeColumns] = []
+        self._typeIndices: dict[ComponentType, int] = {}
+        self._order = array("H")
+        """The index in _types of the type of each modification, in the order they were added."""
+
+    def __getstate__(self):
+        return (self._componentTypes, list(self))
+
+    def __setstate__(self, state):
+        componentTypes, deltas = state
+        self.__init__(componentTypes)
+        for delta in deltas:
+            self.append(delta)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[ComponentModification]:
+        types = [iter(columns) for columns in self._types]
+        for typeIndex in self._order:
+            yield next(types[typeIndex])
+
+    def append(self, delta: ComponentModification):
+        """Adds a modification to the end of the list."""
+        typeIndex = self._typeIndices.get(delta.type)
+        if typeIndex is None:
+            typeIndex = self._typeIndices[delta.type] = len(self._types)
+            self._types.append(_TypeColumns(delta.type))
+        self._types[typeIndex].append(delta)
+        self._order.append(typeIndex)
+
+    def find(self, id: UUID) -> "ComponentModification | None":
+        """Searches for a modification with the given ID."""
+        for columns in self._types:
+            row = columns.find(id)
+            if row is not None:
+                return columns.get(row)
+        return None
+
+    def ofType(self, typeName: str) -> Iterator[ComponentModification]:
+        """Lists the modifications of components of the given type."""
+        for columns in self._types:
+            if columns.type.name == typeName:
+                yield from columns
@@ -8,3 +8,4 @@ Model: TypeAlias = object
 
 T = TypeVar("T")
 Pair = tuple[T, T]
+Triple = tuple[T, T, T]
@@ -5,16 +5,31 @@ from uuid import UUID
 
 from .commontypes import Model
 from .componenttype import ComponentType, ComponentTypeRegistry
+from .delta import Substitution
+from .interntable import InternTable
 from .propertymap import PropertyDeltaMap, PropertyValueMap
 from .session import Session
 
 
+def _restoreComponentDelta(cls, type: ComponentType, id: bytes, properties, *extra):
+    """Recreates a ComponentDelta from the compact form produced by its __reduce__ method."""
+    delta = cls(type, UUID(bytes=id))
+    delta.properties = properties
+    delta._restoreExtra(*extra)
+    return delta
+
+
 class ComponentDelta(ABC):
     """Describes the changes to a single model component."""
 
+    __slots__ = ("type", "id", "properties")
+
     SYMBOL: str
     _CLASSES_BY_SYMBOL = {}
-    _HEADER_PATTERN = re.compile(r"^@@\s+([-+~])(\w+)\s+([-0-9a-f]+)")
+    _CLASSES_BY_OPERATION = {}
+    _HEADER_PATTERN = re.compile(
+        r"^@@\s+([-+~])(\w+)\s+([-0-9a-f]+)(?:\s+->\s+([-0-9a-f]+))?"
+    )
 
     def __init__(self, type: ComponentType, id: UUID):
         self.type = type
@@ -22,23 +37,72 @@ class ComponentDelta(ABC):
         self.id = id
         """The ID of the component."""
 
-    def __init_subclass__(cls, symbol, **kwargs):
+    def __reduce__(self):
+        return _restoreComponentDelta, (
+            self.__class__,
+            self.type,
+            self.id.bytes,
+            self.properties,
+            *self._extraState(),
+        )
+
+    def _extraState(self) -> tuple:
+        """Returns any state beyond the type, ID, and properties that a subclass needs to pickle."""
+        return ()
+
+    def _restoreExtra(self, *extra):
+        """Restores the state returned by _extraState()."""
+
+    def __init_subclass__(cls, symbol, operation, **kwargs):
         cls._SYMBOL = symbol
+        cls._OPERATION = operation
         ComponentDelta._CLASSES_BY_SYMBOL[symbol] = cls
+        ComponentDelta._CLASSES_BY_OPERATION[operation] = cls
 
     def write(self, output: TextIO):
         """Writes a textual representation of the object to the given output stream."""
-        output.write(f"@@ {self._SYMBOL}{self.type.name} {self.id} @@\n")
+        output.write(f"@@ {self._SYMBOL}{self.type.name} {self._headerId()} @@\n")
         self.properties.write(output)
 
-    def readline(self, line: str):
+    def toJSON(self) -> dict:
+        """Produces a record that describes the object and can be encoded as JSON."""
+        return {
+            "record": "component",
+            "operation": self._OPERATION,
+            "type": self.type.name,
+            "id": str(self.id),
+            "properties": self.properties.toJSON(),
+        }
+
+    def _headerId(self) -> str:
+        """Returns the textual representation of the component's ID used in the header line."""
+        return str(self.id)
+
+    @property
+    def resultingId(self) -> UUID:
+        """The ID of the component once the change has been applied."""
+        return self.id
+
+    @property
+    def operation(self) -> str:
+        """The kind of change: "added", "deleted", or "modified"."""
+        return self._OPERATION
+
+    def readline(self, line: str, interns: InternTable = None):
         """Parses a property and value or delta from the given string and adds them to the object's property map."""
-        self.properties.readline(line, self.type)
+        self.properties.readline(line, self.type, interns)
 
     @abstractmethod
     def apply(self, model: Model, session: Session):
         """Applies the changes described in this object to the given model."""
 
+    @abstractmethod
+    def check(self, model: Model, session: Session) -> int:
+        """Reports any reason the changes described in this object cannot be
+        applied cleanly to the given model, without changing the model.
+
+        Returns the number of conflicts found."""
+
     @abstractmethod
     def reverse(self):
         """Returns a ComponentDelta that has the opposite meaning of this one."""
@@ -57,6 +121,22 @@ class ComponentDelta(ABC):
         merged.properties = self.properties.merge(other.properties)
         return merged
 
+    def compose(self, other: "ComponentDelta", session: Session):
+        """Returns a ComponentDelta that has the same effect as applying this one followed by another.
+
+        Returns None if the two changes cancel each other out."""
+        if self.type != other.type:
+            raise Exception(
+                f"Cannot compose components with id {self.id}: Incompatible component types"
+            )
+        return self._compose(other, session)
+
+    def _compose(self, other: "ComponentDelta", session: Session):
+        """Composes this ComponentDelta with another one of the same type."""
+        raise Exception(
+            f"Cannot compose components with id {self.id}: Incompatible operations"
+        )
+
     @staticmethod
     def fromHeader(header: str, componentTypes: ComponentTypeRegistry):
         """Creates an empty ComponentDelta from a header line."""
@@ -66,12 +146,31 @@ class ComponentDelta(ABC):
         cls = ComponentDelta._CLASSES_BY_SYMBOL[match[1]]
         type = componentTypes.findByName(match[2])  # throws if not found
         uuid = UUID(match[3])  # throws if invalid format
-        return cls(type, uuid)
+        delta = cls(type, uuid)
+        if match[4]:
+            if cls is not ComponentModification:
+                raise ValueError("Only a modified component can change its ID")
+            delta.newId = UUID(match[4])
+        return delta
+
+    @staticmethod
+    def fromJSON(record: dict, componentTypes: ComponentTypeRegistry):
+        """Creates a ComponentDelta with an empty property map from a record produced by toJSON()."""
+        cls = ComponentDelta._CLASSES_BY_OPERATION[record["operation"]]
+        type = componentTypes.findByName(record["type"])  # throws if not found
+        delta = cls(type, UUID(record["id"]))  # throws if invalid format
+        if record.get("newId") is not None:
+            if cls is not ComponentModification:
+                raise ValueError("Only a modified component can change its ID")
+            delta.newId = UUID(record["newId"])
+        return delta
 
 
-class ComponentAddition(ComponentDelta, symbol="+"):
+class ComponentAddition(ComponentDelta, symbol="+", operation="added"):
     """Represents the addition of a component to a model."""
 
+    __slots__ = ()
+
     def __init__(self, type: ComponentType, id: UUID):
         super().__init__(type, id)
         self.properties = PropertyValueMap()
@@ -83,15 +182,62 @@ class ComponentAddition(ComponentDelta, symbol="+"):
         self.properties.apply(component, session)
         self.type._table.addComponent(component, model)
 
+    def check(self, model, session: Session):
+        if self.type._table.getComponent(model, self.id) is not None:
+            session.warn("Component to be added already exists")
+            return 1
+        return 0
+
     def reverse(self):
         reversed = ComponentDeletion(self.type, self.id)
-        reversed.properties = self.properties[:]
+        reversed.properties = PropertyValueMap(self.properties)
         return reversed
 
+    def _compose(self, other, session):
+        if isinstance(other, ComponentDeletion):
+            return None
+        if not isinstance(other, ComponentModification):
+            return super()._compose(other, session)
 
-class ComponentDeletion(ComponentDelta, symbol="-"):
+        composed = ComponentAddition(self.type, other.resultingId)
+        composed.properties = PropertyValueMap(self.properties)
+        for property, delta in other.properties.items():
+            for dependent in list(composed.properties):
+                if dependent.affectedBy == property:
+                    composed.properties[dependent] = delta.apply(
+                        composed.properties[dependent], session
+                    )
+            if property in composed.properties:
+                composed.properties[property] = delta.apply(
+                    composed.properties[property], session
+                )
+            elif isinstance(delta, Substitution):
+                composed.properties[property] = delta.newer
+            elif not property.deltaOnly:
+                # A property that is not listed has its default value
+                default = self.type.defaultValue(property)
+                if default is None:
+                    raise Exception(
+                        f"Cannot compose components with id {self.id}: Initial value of {property} is unknown"
+                    )
+                value = delta.apply(default, session)
+                if value != default:
+                    composed.properties[property] = value
+            elif not isinstance(delta, Substitution) and not any(
+                dependent.affectedBy == property for dependent in composed.properties
+            ):
+                # The added component only records the properties that depend on this one
+                raise Exception(
+                    f"Cannot compose components with id {self.id}: Change to {property} cannot be applied to the added component"
+                )
+        return composed
+
+
+class ComponentDeletion(ComponentDelta, symbol="-", operation="deleted"):
     """Represents the deletion of a component from a model."""
 
+    __slots__ = ()
+
     def __init__(self, type: ComponentType, id: UUID):
         super().__init__(type, id)
         self.properties = PropertyValueMap()
@@ -100,31 +246,137 @@ class ComponentDeletion(ComponentDelta, symbol="-"):
     def apply(self, model: Model, session: Session):
         self.type._table.deleteComponent(self.id, model)
 
+    def check(self, model: Model, session: Session):
+        if self.type._table.getComponent(model, self.id) is None:
+            session.warn("Component to be deleted does not exist")
+            return 1
+        return 0
+
     def reverse(self):
         reversed = ComponentAddition(self.type, self.id)
-        reversed.properties = self.properties[:]
+        reversed.properties = PropertyValueMap(self.properties)
         return reversed
 
+    def _compose(self, other, session):
+        if not isinstance(other, ComponentAddition):
+            return super()._compose(other, session)
+
+        composed = ComponentModification(self.type, self.id)
+        for property in self.type.properties:
+            if property not in self.properties and property not in other.properties:
+                continue
+            # A property that is only listed on one side has its default value on the other
+            older, newer = (
+                values[property]
+                if property in values
+                else self.type.defaultValue(property)
+                for values in (self.properties, other.properties)
+            )
+            if older is None or newer is None:
+                raise Exception(
+                    f"Cannot compose components with id {self.id}: Default value of {property} is unknown"
+                )
+            if older != newer:
+                composed.properties[property] = older.diff(newer)
+        return composed if len(composed.properties) > 0 else None
 
-class ComponentModification(ComponentDelta, symbol="~"):
+
+class ComponentModification(ComponentDelta, symbol="~", operation="modified"):
     """Describes the changes to a component that exists in two versions of a model."""
 
+    __slots__ = "newId"
+
     def __init__(self, type: ComponentType, id: UUID):
         super().__init__(type, id)
         self.properties = PropertyDeltaMap()
         """The properties of the object that have been modified."""
+        self.newId: UUID = None
+        """The ID given to the component by the change, or None if it keeps its ID."""
+
+    def _extraState(self):
+        return (self.newId.bytes,) if self.newId is not None else ()
+
+    def _restoreExtra(self, newId: bytes = None):
+        if newId is not None:
+            self.newId = UUID(bytes=newId)
+
+    @property
+    def hasChanges(self) -> bool:
+        """Returns true if the component's ID or any of its properties are changed."""
+        return len(self.properties) > 0 or self.newId is not None
 
     def write(self, output: TextIO):
-        if len(self.properties) > 0:
+        if self.hasChanges:
             super().write(output)
 
+    def toJSON(self):
+        record = super().toJSON()
+        if self.newId is not None:
+            record["newId"] = str(self.newId)
+        return record
+
+    def _headerId(self):
+        if self.newId is not None:
+            return f"{self.id} -> {self.newId}"
+        return str(self.id)
+
+    @property
+    def resultingId(self):
+        return self.newId if self.newId is not None else self.id
+
     def apply(self, model: Model, session: Session):
-        component = self.type._table.getComponent(
-            model, self.id
-        )
+        component = self.type._table.getComponent(model, self.id)
         self.properties.apply(component, session)
+        if self.newId is not None:
+            self.type._table.setComponentId(component, self.newId)
+
+    def check(self, model: Model, session: Session):
+        component = self.type._table.getComponent(model, self.id)
+        if component is None:
+            session.warn("Component to be modified does not exist")
+            return 1
+        conflicts = self.properties.check(component, session)
+        if (
+            self.newId is not None
+            and self.type._table.getComponent(model, self.newId) is not None
+        ):
+            session.warn(f"A component with ID {self.newId} already exists")
+            conflicts += 1
+        return conflicts
 
     def reverse(self):
-        reversed = ComponentModification(self.type, self.id)
+        reversed = ComponentModification(self.type, self.resultingId)
         reversed.properties = self.properties.reverse()
+        if self.newId is not None:
+            reversed.newId = self.id
         return reversed
+
+    def _compose(self, other, session):
+        if isinstance(other, ComponentModification):
+            composed = ComponentModification(self.type, self.id)
+            composed.properties = self.properties.compose(other.properties, session)
+            if other.resultingId != self.id:
+                composed.newId = other.resultingId
+            return composed if composed.hasChanges else None
+
+        if not isinstance(other, ComponentDeletion):
+            return super()._compose(other, session)
+
+        # The deleted component's properties are rolled back to their values
+        # before this modification, undoing dependent properties first
+        composed = ComponentDeletion(self.type, self.id)
+        composed.properties = PropertyValueMap(other.properties)
+        for property, delta in reversed(self.properties.items()):
+            undo = delta.reverse()
+            for dependent in list(composed.properties):
+                if dependent.affectedBy == property:
+                    composed.properties[dependent] = undo.apply(
+                        composed.properties[dependent], session
+                    )
+            if property in composed.properties:
+                composed.properties[property] = undo.apply(
+                    composed.properties[property], session
+                )
+            elif isinstance(delta, Substitution) and not property.deltaOnly:
+                composed.properties[property] = delta.older
+        return composed
@@ -0,0 +1,106 @@
+import io
+import sqlite3
+from typing import Iterator
+from uuid import UUID
+
+from .componentdelta import ComponentDelta
+from .componenttype import ComponentTypeRegistry
+
+
+class ComponentDeltaList:
+    """A list of ComponentDeltas that moves its contents to a temporary
+    database once it holds more than a given number of them.
+
+    Deltas beyond the limit are stored in their textual form in an SQLite
+    database that is indexed by component ID and type, and are parsed again
+    each time they are retrieved."""
+
+    __slots__ = ("_componentTypes", "_limit", "_items", "_database", "_spilled")
+
+    def __init__(self, componentTypes: ComponentTypeRegistry, limit: int = None):
+        self._componentTypes = componentTypes
+        self._limit = limit
+        self._items: list[ComponentDelta] = []
+        self._database: sqlite3.Connection = None
+        self._spilled = 0
+
+    def __getstate__(self):
+        return (self._componentTypes, self._limit, list(self))
+
+    def __setstate__(self, state):
+        componentTypes, limit, deltas = state
+        self.__init__(componentTypes, limit)
+        for delta in deltas:
+            self.append(delta)
+
+    def __len__(self):
+        return len(self._items) + self._spilled
+
+    def __iter__(self) -> Iterator[ComponentDelta]:
+        yield from self._items
+        if self._database is not None:
+            rows = self._database.execute("SELECT text FROM deltas ORDER BY position")
+            for (text,) in rows:
+                yield self._parse(text)
+
+    def append(self, delta: ComponentDelta):
+        """Adds a delta to the end of the list.
+
+        A delta is copied when it is moved to the database, so changes made to
+        it after it is added are only kept while it is held in memory."""
+        output = None
+        if self._limit is not None and len(self._items) >= self._limit:
+            output = io.StringIO()
+            delta.write(output)
+        if output is None or output.tell() == 0:
+            self._items.append(delta)
+            return
+
+        if self._database is None:
+            # An empty name creates a private database on disk that is deleted when closed
+            self._database = sqlite3.connect("")
+            self._database.execute(
+                "CREATE TABLE deltas (position INTEGER PRIMARY KEY, id TEXT, type TEXT, text TEXT)"
+            )
+            self._database.execute("CREATE INDEX deltas_by_id ON deltas (id)")
+            self._database.execute("CREATE INDEX deltas_by_type ON deltas (type)")
+
+        self._database.execute(
+            "INSERT INTO deltas (id, type, text) VALUES (?, ?, ?)",
+            (str(delta.id), delta.type.name, output.getvalue()),
+        )
+        self._spilled += 1
+
+    def find(self, id: UUID) -> "ComponentDelta | None":
+        """Searches for a delta with the given ID."""
+        for delta in self._items:
+            if delta.id == id:
+                return delta
+        if self._database is not None:
+            row = self._database.execute(
+                "SELECT text FROM deltas WHERE id = ? ORDER BY position", (str(id),)
+            ).fetchone()
+            if row is not None:
+                return self._parse(row[0])
+        return None
+
+    def ofType(self, typeName: str) -> Iterator[ComponentDelta]:
+        """Lists the deltas that describe components of the given type."""
+        for delta in self._items:
+            if delta.type.name == typeName:
+                yield delta
+        if self._database is not None:
+            rows = self._database.execute(
+                "SELECT text FROM deltas WHERE type = ? ORDER BY position",
+                (typeName,),
+            )
+            for (text,) in rows:
+                yield self._parse(text)
+
+    def _parse(self, text: str) -> ComponentDelta:
+        """Recreates a delta from the text it was stored as."""
+        lines = text.splitlines(keepends=True)
+        delta = ComponentDelta.fromHeader(lines[0], self._componentTypes)
+        for line in lines[1:]:
+            delta.readline(line)
+        return delta
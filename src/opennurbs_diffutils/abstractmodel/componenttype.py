@@ -32,12 +32,25 @@ class ComponentType(BaseType, Generic[T]):
         """The name of the type."""
         return self._name
 
+    @property
+    def table(self) -> Table:
+        """The table in which components of this type are stored."""
+        return self._table
+
     def create(self, model):
         """Creates a new component of this type."""
         if self._createDefault:
             return self._createDefault(self._class, model)
         return self._class()
 
+    def defaultValue(self, property: Property) -> "Value | None":
+        """Returns the value of the given property on a new component of this
+        type, or None if it cannot be read without a model."""
+        try:
+            return property.getValue(self.create(None))
+        except Exception:
+            return None
+
 
 class ComponentTypeRegistry:
     """A collection of component types supported by a model format."""
@@ -49,6 +62,9 @@ class ComponentTypeRegistry:
             self._typesByName[type._name.casefold()] = type
             self._typesByClass[type._class] = type
 
+    def __iter__(self):
+        return iter(self._typesByName.values())
+
     def findByName(self, name: str) -> ComponentType:
         """Returns the component type with the given name.
 
@@ -0,0 +1,34 @@
+from uuid import UUID
+
+from .componenttype import ComponentType
+from .property import Property
+
+
+class Conflict:
+    """Describes a pair of incompatible changes made to the same part of a model."""
+
+    __slots__ = ("type", "id", "property", "mine", "yours")
+
+    def __init__(
+        self,
+        type: ComponentType,
+        id: UUID,
+        property: Property,
+        mine: object,
+        yours: object,
+    ):
+        self.type = type
+        """The type of the component that was changed, or None for a model property."""
+        self.id = id
+        """The ID of the component that was changed, or None for a model property."""
+        self.property = property
+        """The property that was changed, or None if the component as a whole was changed."""
+        self.mine = mine
+        """The change made in one version of the model."""
+        self.yours = yours
+        """The change made in the other version of the model."""
+
+    def __str__(self) -> str:
+        subject = f"{self.property} property of " if self.property else ""
+        subject += f"{self.type.name} {self.id}" if self.type else "model"
+        return f"Conflicting changes to {subject} ({self.mine} vs. {self.yours})"
@@ -1,7 +1,7 @@
 from abc import abstractmethod
 from functools import cache
 import re
-from typing import Generic, Type, TypeVar
+from typing import Generic, Tuple, Type, TypeVar
 
 from .session import Session
 from .stringable import Stringable
@@ -10,9 +10,29 @@ from .stringable import Stringable
 T = TypeVar("T")
 
 
+def _unspecialize(cls: type) -> "Tuple[type, Type | None]":
+    """Returns the class on which specialize() was called to create the given
+    class and the value class it was given, or the class itself and None if
+    it was not created by specialize()."""
+    if "_VALUE_TYPE" in cls.__dict__:
+        return cls.__bases__[0], cls._VALUE_TYPE
+    return cls, None
+
+
+def _recreate(baseClass: type, valueClass: "Type | None", args: tuple):
+    """Creates an instance of a class that may have been created by specialize().
+
+    Such classes cannot be pickled by reference, so instances are pickled as
+    a call to this function instead."""
+    cls = baseClass.specialize(valueClass) if valueClass is not None else baseClass
+    return cls(*args)
+
+
 class Delta(Stringable, Generic[T]):
     """Describes how one value is changed into another."""
 
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self, olderValue: T, newerValue: T):
         pass
@@ -25,6 +45,16 @@ class Delta(Stringable, Generic[T]):
     def reverse(self) -> "Delta[T]":
         """Returns a Delta that performs the opposite change from this one."""
 
+    @abstractmethod
+    def compose(self, other: "Delta[T]", session: Session) -> "Delta[T] | None":
+        """Returns a Delta that performs this change followed by another one, or None if the two cancel each other out."""
+
+    def matches(self, currentValue: T) -> bool:
+        """Returns true if the change can be applied to the given value as it was described.
+
+        Deltas that do not record the value they change match any value."""
+        return True
+
     @abstractmethod
     def __eq__(self, other) -> bool:
         """Compares this delta to another and returns true if they are equal."""
@@ -48,14 +78,47 @@ class Substitution(Delta[T]):
             # session.warn(f"Value of {property.name} property is {property.format(current)}; expected {property.format(value[0])}")
         return self._newer
 
+    def matches(self, currentValue) -> bool:
+        return currentValue == self._older
+
+    @property
+    def older(self) -> T:
+        """The value that is replaced."""
+        return self._older
+
+    @property
+    def newer(self) -> T:
+        """The value that replaces the older one."""
+        return self._newer
+
     def reverse(self):
         return Substitution(self._newer, self._older)
 
+    def compose(self, other: Delta[T], session: Session):
+        if not isinstance(other, Substitution):
+            newer = other.apply(self._newer, session)
+            return None if self._older == newer else self.__class__(self._older, newer)
+        if self._newer != other._older:
+            session.warn(f"Expected a value of {self._newer} but got {other._older}")
+        if self._older == other._newer:
+            return None
+        return self.__class__(self._older, other._newer)
+
     def __str__(self):
         return f"{self._older} {self._DELIMITER} {self._newer}"
 
+    def __reduce__(self):
+        return _recreate, (*_unspecialize(self.__class__), (self._older, self._newer))
+
+    def toJSON(self):
+        return {"older": self._older.toJSON(), "newer": self._newer.toJSON()}
+
     def __eq__(self, other: "Substitution") -> bool:
-        return self._older == other._older and self._newer == other._newer
+        return (
+            isinstance(other, Substitution)
+            and self._older == other._older
+            and self._newer == other._newer
+        )
 
     @classmethod
     @cache
@@ -67,6 +130,7 @@ class Substitution(Delta[T]):
             (cls,),
             {
                 "__module__": cls.__module__,
+                "__slots__": (),
                 "_VALUE_TYPE": valueClass,
             },
         )
@@ -77,3 +141,12 @@ class Substitution(Delta[T]):
         input = re.sub(r"^\s*" + re.escape(cls._DELIMITER) + r"\s*", "", input)
         newer, input = cls._VALUE_TYPE.fromString(input)
         return cls(older, newer), input
+
+    @classmethod
+    def fromJSON(cls, data):
+        if not isinstance(data, dict) or data.keys() != {"older", "newer"}:
+            raise ValueError(f"{data!r} is not a valid substitution")
+        return cls(
+            cls._VALUE_TYPE.fromJSON(data["older"]),
+            cls._VALUE_TYPE.fromJSON(data["newer"]),
+        )
@@ -0,0 +1,177 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+import pickle
+import time
+from typing import Callable
+
+from .modeldelta import ModelDelta
+from .modeltype import ModelType
+
+
+PARSER_VERSION = 2
+"""Identifies the format of cached deltas.
+
+Increase it whenever a change to the parser or to the classes of the parsed
+objects would make previously cached deltas wrong or unreadable."""
+
+SUFFIX = ".pickle"
+
+TEMPORARY_SUFFIX = ".tmp"
+
+ABANDONED_AFTER = 60 * 60
+"""The age in seconds after which a temporary file is assumed to have been
+left behind by a process that stopped while writing an entry."""
+
+
+def _references(modelType: ModelType) -> list:
+    """Lists the objects that pickled deltas refer to by their position in the list.
+
+    These are the model type itself, its registry of component types, and
+    every component type and property, in the order they were defined."""
+    references = [modelType, modelType.componentTypes, *modelType.properties]
+    for componentType in modelType.componentTypes:
+        references.append(componentType)
+        references.extend(componentType.properties)
+    return references
+
+
+def signature(modelType: ModelType) -> str:
+    """Returns a string that changes whenever the positions listed by _references() do."""
+    return " ".join(
+        getattr(reference, "name", reference.__class__.__name__)
+        for reference in _references(modelType)
+    )
+
+
+class DeltaPickler(pickle.Pickler):
+    """Pickles deltas, referring to the model type, component types, and
+    properties they use by position rather than copying them."""
+
+    def __init__(self, file, modelType: ModelType):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._positions = {}
+        for position, reference in enumerate(_references(modelType)):
+            self._positions.setdefault(id(reference), position)
+
+    def persistent_id(self, obj):
+        return self._positions.get(id(obj))
+
+
+class DeltaUnpickler(pickle.Unpickler):
+    """Unpickles deltas pickled by DeltaPickler."""
+
+    def __init__(self, file, modelType: ModelType):
+        super().__init__(file)
+        self._references = _references(modelType)
+
+    def persistent_load(self, pid):
+        try:
+            return self._references[pid]
+        except (IndexError, TypeError):
+            raise pickle.UnpicklingError(f"Unknown persistent ID {pid}")
+
+
+class DeltaCache:
+    """Keeps deltas in a directory, keyed by a hash of the text they were parsed from or of another key.
+
+    Deltas that are read again are unpickled instead of parsed, and deltas
+    stored under keys of their own, such as the IDs of the files they were
+    computed from, can be retrieved instead of computed. Entries are
+    evicted in order of least recent use once their total size exceeds
+    maxBytes. Entries made by other versions of the parser, or for a model
+    type whose component types or properties have changed, are never used,
+    since both are part of the key."""
+
+    def __init__(
+        self,
+        directory: Path,
+        createDelta: Callable[[], ModelDelta],
+        maxBytes: int = 256 * 1024 * 1024,
+    ):
+        self.directory = directory
+        self._createDelta = createDelta
+        self._maxBytes = maxBytes
+        self._type = createDelta().type
+        self._signature = signature(self._type)
+
+    def _entryPath(self, key: str) -> Path:
+        """Returns the path of the file in which the delta stored under the given key is kept."""
+        hash = hashlib.sha256(f"{PARSER_VERSION}\n".encode())
+        hash.update(f"{self._signature}\n".encode("utf-8"))
+        hash.update(key.encode("utf-8"))
+        return self.directory / (hash.hexdigest() + SUFFIX)
+
+    def get(self, key: str) -> "ModelDelta | None":
+        """Returns the delta stored under the given key, or None if there is none."""
+        path = self._entryPath(key)
+        try:
+            with open(path, "rb") as file:
+                cached = DeltaUnpickler(file, self._type).load()
+            os.utime(path)  # Mark the entry as recently used
+            return cached
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A damaged or outdated entry is replaced
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, delta: ModelDelta):
+        """Stores a delta under the given key.
+
+        A key that is not the text of a delta should begin with a line that
+        no delta does, so that the two kinds of key cannot collide."""
+        self._store(self._entryPath(key), delta)
+
+    def read(self, text: str) -> ModelDelta:
+        """Returns the delta described by the given text, parsing it only if it is not cached."""
+        delta = self.get(text)
+        if delta is None:
+            delta = self._createDelta()
+            delta.read(io.StringIO(text))
+            self.put(text, delta)
+        return delta
+
+    def _store(self, path: Path, delta: ModelDelta):
+        """Writes a delta to the cache and evicts the least recently used entries if it is full."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporaryPath = path.with_suffix(f".{os.getpid()}{TEMPORARY_SUFFIX}")
+        try:
+            with open(temporaryPath, "wb") as file:
+                DeltaPickler(file, delta.type).dump(delta)
+        except BaseException:
+            temporaryPath.unlink(missing_ok=True)
+            raise
+        # Readers never see a partially written entry
+        os.replace(temporaryPath, path)
+        self._evict()
+
+    def _evict(self):
+        """Removes the least recently used entries until the cache fits in its size bound.
+
+        Temporary files count towards the bound. Those that have not been
+        written to for ABANDONED_AFTER seconds are removed; more recent ones
+        may still be written by another process and are kept."""
+        entries = []
+        total = 0
+        abandoned = time.time() - ABANDONED_AFTER
+        for entry in self.directory.iterdir():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # Evicted or renamed by another process
+            if entry.suffix == TEMPORARY_SUFFIX:
+                if stat.st_mtime < abandoned:
+                    entry.unlink(missing_ok=True)
+                else:
+                    total += stat.st_size
+            elif entry.suffix == SUFFIX:
+                entries.append((stat, entry))
+                total += stat.st_size
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+            if total <= self._maxBytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= stat.st_size
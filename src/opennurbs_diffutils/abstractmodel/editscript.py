@@ -0,0 +1,298 @@
+from functools import cache
+from itertools import chain
+import re
+from typing import Sequence, Tuple, Type, TypeVar
+
+import Levenshtein
+
+from .delta import Delta, Substitution, _recreate, _unspecialize
+from .session import Session
+
+
+T = TypeVar("T")
+
+Edit = Tuple[int, Sequence, Sequence]
+"A run of elements that starts at an index in the older sequence and the run that replaces it"
+
+
+class EditScript(Delta[T]):
+    """An implementation of Delta that records only the parts of a sequence that changed.
+
+    Each edit replaces the run of elements that starts at a given index in the
+    older sequence with another run; insertions and deletions are edits that
+    replace or are replaced by an empty run. The replaced runs are kept so that
+    the script can be reversed and checked against the value it is applied to."""
+
+    __slots__ = "_edits"
+
+    _PREFIX = "edit("
+    _DELIMITER = "->"
+    _SEPARATOR = ";"
+    _EDIT_PATTERN = re.compile(r"\s*@(\d+)\s*")
+    _VALUE_TYPE: Type["Value"]
+
+    def __init__(self, edits: list[Edit]):
+        self._edits = edits
+
+    @property
+    def edits(self) -> list[Edit]:
+        """The list of edits, ordered by their index in the older sequence."""
+        return self._edits
+
+    @classmethod
+    def between(cls, older: "Value", newer: "Value") -> "EditScript":
+        """Returns an EditScript that changes one value into another.
+
+        Adjacent insertions, deletions, and replacements are combined into a
+        single edit."""
+        edits = []
+        end = None
+        for tag, i1, i2, j1, j2 in Levenshtein.opcodes(
+            cls._keys(older.value), cls._keys(newer.value)
+        ):
+            if tag == "equal":
+                continue
+            if end == (i1, j1):
+                i1, _, inserted = edits.pop()
+                j1 -= len(inserted)
+            edits.append((i1, older.value[i1:i2], newer.value[j1:j2]))
+            end = (i2, j2)
+        return cls(edits)
+
+    def apply(self, currentValue, session: Session):
+        current = currentValue.value
+        runs = []
+        position = 0
+        for index, removed, inserted in self._edits:
+            actual = current[index : index + len(removed)]
+            if not self._VALUE_TYPE.rawEqual(actual, removed):
+                session.warn(
+                    f"Expected {self._formatRun(removed)} at position {index} but got {self._formatRun(actual)}"
+                )
+            runs.append(current[position:index])
+            runs.append(inserted)
+            position = index + len(removed)
+        runs.append(current[position:])
+        return currentValue.__class__(self._join(runs))
+
+    def matches(self, currentValue) -> bool:
+        current = currentValue.value
+        return all(
+            self._VALUE_TYPE.rawEqual(current[index : index + len(removed)], removed)
+            for index, removed, _ in self._edits
+        )
+
+    def reverse(self):
+        edits = []
+        offset = 0
+        for index, removed, inserted in self._edits:
+            edits.append((index + offset, inserted, removed))
+            offset += len(inserted) - len(removed)
+        return self.__class__(edits)
+
+    def compose(self, other: Delta, session: Session):
+        if isinstance(other, Substitution):
+            # Undoing this script recovers the value it was applied to
+            older = self.reverse().apply(other.older, session)
+            return None if older == other.newer else other.__class__(older, other.newer)
+
+        # Both scripts are expressed in terms of the intermediate sequence: the
+        # runs inserted by this script and the runs removed by the other. Runs
+        # that overlap or touch are grouped, and since every element in a group
+        # is covered by a known run, each group can be rewritten as one edit.
+        regions = []
+        offset = 0
+        for index, removed, inserted in self._edits:
+            regions.append((index + offset, len(inserted), 0, removed, inserted))
+            offset += len(inserted) - len(removed)
+        for index, removed, inserted in other._edits:
+            regions.append((index, len(removed), 1, removed, inserted))
+        regions.sort(key=lambda region: (region[0], region[2]))
+
+        groups = []
+        for region in regions:
+            if len(groups) > 0 and region[0] <= groups[-1][1]:
+                groups[-1][1] = max(groups[-1][1], region[0] + region[1])
+                groups[-1][2].append(region)
+            else:
+                groups.append([region[0], region[0] + region[1], [region]])
+
+        edits = []
+        offset = 0
+        for start, end, members in groups:
+            intermediate = [None] * (end - start)
+            for position, length, side, removed, inserted in members:
+                run = inserted if side == 0 else removed
+                for i, element in enumerate(run):
+                    if intermediate[position - start + i] is None:
+                        intermediate[position - start + i] = element
+            older = self._rewrite(start, intermediate, members, 0)
+            newer = self._rewrite(start, intermediate, members, 1)
+            if not self._VALUE_TYPE.rawEqual(older, newer):
+                edits.append((start - offset, older, newer))
+            offset += len(intermediate) - len(older)
+
+        return self.__class__(edits) if len(edits) > 0 else None
+
+    def _rewrite(self, start: int, intermediate: list, members: list, side: int):
+        """Replaces the runs of one script within a group of the intermediate sequence."""
+        runs = []
+        position = start
+        for regionStart, length, regionSide, removed, inserted in members:
+            if regionSide != side:
+                continue
+            runs.append(
+                self._fromElements(intermediate[position - start : regionStart - start])
+            )
+            runs.append(removed if side == 0 else inserted)
+            position = regionStart + length
+        runs.append(self._fromElements(intermediate[position - start :]))
+        return self._join(runs)
+
+    def __str__(self):
+        edits = [
+            f"@{index} {self._formatRun(removed)} {self._DELIMITER} {self._formatRun(inserted)}"
+            for index, removed, inserted in self._edits
+        ]
+        return self._PREFIX + f"{self._SEPARATOR} ".join(edits) + ")"
+
+    def __reduce__(self):
+        return _recreate, (*_unspecialize(self.__class__), (self._edits,))
+
+    def toJSON(self):
+        return {
+            "edits": [
+                [
+                    index,
+                    self._VALUE_TYPE(removed).toJSON(),
+                    self._VALUE_TYPE(inserted).toJSON(),
+                ]
+                for index, removed, inserted in self._edits
+            ]
+        }
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, EditScript)
+            and len(self._edits) == len(other._edits)
+            and all(
+                a[0] == b[0]
+                and self._VALUE_TYPE.rawEqual(a[1], b[1])
+                and self._VALUE_TYPE.rawEqual(a[2], b[2])
+                for a, b in zip(self._edits, other._edits)
+            )
+        )
+
+    @classmethod
+    def fromString(cls, input: str):
+        if not input.startswith(cls._PREFIX):
+            raise Exception(f"'{input}' is not a valid edit script")
+        remainder = input[len(cls._PREFIX) :]
+        edits = []
+        while not remainder.lstrip().startswith(")"):
+            match = cls._EDIT_PATTERN.match(remainder)
+            if not match:
+                raise Exception(f"'{input}' is not a valid edit script")
+            removed, remainder = cls._parseRun(remainder[match.end() :])
+            remainder = re.sub(
+                r"^\s*" + re.escape(cls._DELIMITER) + r"\s*", "", remainder
+            )
+            inserted, remainder = cls._parseRun(remainder)
+            remainder = re.sub(r"^\s*" + re.escape(cls._SEPARATOR), "", remainder)
+            edits.append((int(match[1]), removed, inserted))
+        return cls(edits), remainder.lstrip()[1:]
+
+    @classmethod
+    def fromJSON(cls, data):
+        try:
+            edits = [
+                (
+                    int(index),
+                    cls._VALUE_TYPE.fromJSON(removed).value,
+                    cls._VALUE_TYPE.fromJSON(inserted).value,
+                )
+                for index, removed, inserted in data["edits"]
+            ]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"{data!r} is not a valid edit script")
+        return cls(edits)
+
+    @classmethod
+    @cache
+    def specialize(cls, valueClass):
+        """Returns a subclass that edits values of the given type."""
+        name = valueClass.__name__ + cls.__name__
+        return type(
+            name,
+            (cls,),
+            {
+                "__module__": cls.__module__,
+                "__slots__": (),
+                "_VALUE_TYPE": valueClass,
+            },
+        )
+
+    @classmethod
+    def _formatRun(cls, run: Sequence) -> str:
+        """Produces a textual representation of a run of elements."""
+        return str(cls._VALUE_TYPE(run))
+
+    @classmethod
+    def _parseRun(cls, input: str) -> Tuple[Sequence, str]:
+        """Parses a run of elements from the beginning of the given string."""
+        value, remainder = cls._VALUE_TYPE.fromString(input)
+        return value.value, remainder
+
+    @classmethod
+    def _keys(cls, sequence: Sequence) -> Sequence:
+        """Returns a sequence of hashable keys that compare equal wherever the elements do."""
+        return sequence
+
+    @staticmethod
+    def _fromElements(elements: list) -> Sequence:
+        """Creates a run from a list of elements."""
+        return list(elements)
+
+    @staticmethod
+    def _join(runs: list[Sequence]) -> Sequence:
+        """Concatenates a list of runs."""
+        return list(chain.from_iterable(runs))
+
+
+class StringEdit(EditScript):
+    """An implementation of EditScript that edits strings.
+
+    A string delta is written either as an edit script or as a substitution,
+    so either form can be parsed."""
+
+    __slots__ = ()
+
+    @classmethod
+    def fromString(cls, input: str):
+        if not input.lstrip().startswith(cls._PREFIX):
+            return Substitution.specialize(cls._VALUE_TYPE).fromString(input)
+        return super().fromString(input.lstrip())
+
+    @classmethod
+    def fromJSON(cls, data):
+        if isinstance(data, dict) and "edits" not in data:
+            return Substitution.specialize(cls._VALUE_TYPE).fromJSON(data)
+        return super().fromJSON(data)
+
+    @staticmethod
+    def _fromElements(elements):
+        return "".join(elements)
+
+    @staticmethod
+    def _join(runs):
+        return "".join(runs)
+
+
+class SequenceEdit(EditScript):
+    """An implementation of EditScript that edits instances of SequenceValue."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _keys(cls, sequence):
+        return list(map(cls._VALUE_TYPE._ELEMENT_TYPE.rawKey, sequence))
@@ -9,6 +9,7 @@ TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f %z"
 PARSE_PATTERN = re.compile(
     r"^(\+{3}|-{3})\s+(.+?)\s+(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+ [+-]\d+)"
 )
+LABEL_PATTERN = re.compile(r"^(\+{3}|-{3})\s+(.+?)\s*$")
 
 
 class FileDescription:
@@ -32,6 +33,14 @@ class FileDescription:
         self.path = label
         self.time = None
 
+    @classmethod
+    def fromLabel(cls, label: str) -> "FileDescription":
+        """Creates a description that has a label instead of a path and timestamp,
+        for a version of a file that does not exist on disk."""
+        description = cls(Path(label), datetime.min)
+        description.label(label)
+        return description
+
     @property
     def timestamp(self) -> str:
         return self.time.strftime(TIMESTAMP_FORMAT)
@@ -43,4 +52,24 @@ class FileDescription:
             path = Path(match[2])
             time = datetime.strptime(match[3], TIMESTAMP_FORMAT)
             return cls(path, time), match[1]
-        return None
+        # A labeled file has no timestamp
+        match = LABEL_PATTERN.match(string)
+        if match:
+            return cls.fromLabel(match[2]), match[1]
+        return None, None
+
+    def toJSON(self) -> dict:
+        """Produces a representation of the description that can be encoded as JSON."""
+        return {
+            "path": str(self.path),
+            "time": self.timestamp if self.time else None,
+        }
+
+    @classmethod
+    def fromJSON(cls, data: dict) -> "FileDescription":
+        """Creates a description from the representation produced by toJSON()."""
+        if data["time"] is None:
+            return cls.fromLabel(data["path"])
+        return cls(
+            Path(data["path"]), datetime.strptime(data["time"], TIMESTAMP_FORMAT)
+        )
@@ -0,0 +1,74 @@
+from fnmatch import fnmatchcase
+from typing import Iterable
+from uuid import UUID
+
+from .property import Property
+
+
+MODEL_TYPE_NAME = "Model"
+"The name by which type patterns refer to the properties of the model itself."
+
+CATEGORIES = ("table", "type", "property", "id")
+
+
+class Filter:
+    """Limits the tables, component types, and properties that are compared, read, or applied.
+
+    Each pattern has the form table:NAME, type:NAME, property:NAME, or
+    id:UUID, where NAME and UUID may contain shell-style wildcards and are
+    compared case-insensitively. Property patterns match either the name of
+    a property or its name qualified by its type, as in Layer.Color, and ID
+    patterns match the ID of a component. Within each category, an item
+    is included if it matches at least one of the `only` patterns (or there
+    are none) and none of the `exclude` patterns."""
+
+    __slots__ = ("_only", "_exclude")
+
+    def __init__(self, only: Iterable[str] = (), exclude: Iterable[str] = ()):
+        self._only = self._parse(only)
+        self._exclude = self._parse(exclude)
+
+    @staticmethod
+    def _parse(patterns: Iterable[str]) -> dict[str, list[str]]:
+        """Sorts a list of patterns by category."""
+        parsed = {category: [] for category in CATEGORIES}
+        for pattern in patterns:
+            category, separator, name = pattern.partition(":")
+            if not separator or category.casefold() not in parsed:
+                raise ValueError(
+                    f"'{pattern}' must begin with table:, type:, property:, or id:"
+                )
+            parsed[category.casefold()].append(name.casefold())
+        return parsed
+
+    def _includes(self, category: str, *names: str) -> bool:
+        """Returns true if any of the given names of an item are included in the given category."""
+        names = [name.casefold() for name in names]
+
+        def matches(patterns):
+            return any(fnmatchcase(name, p) for name in names for p in patterns)
+
+        only = self._only[category]
+        if len(only) > 0 and not matches(only):
+            return False
+        return not matches(self._exclude[category])
+
+    def includesTable(self, name: str) -> bool:
+        """Returns true if the table with the given name is included."""
+        return self._includes("table", name)
+
+    def includesType(self, name: str) -> bool:
+        """Returns true if the component type with the given name is included."""
+        return self._includes("type", name)
+
+    def includesComponent(self, id: UUID) -> bool:
+        """Returns true if the component with the given ID is included."""
+        return self._includes("id", str(id))
+
+    def includesProperty(self, typeName: str, propertyName: str) -> bool:
+        """Returns true if the property with the given name of the given type is included."""
+        return self._includes("property", propertyName, f"{typeName}.{propertyName}")
+
+    def properties(self, typeName: str, properties: Iterable[Property]):
+        """Returns the list of the given properties of a type that are included."""
+        return [p for p in properties if self.includesProperty(typeName, p.name)]
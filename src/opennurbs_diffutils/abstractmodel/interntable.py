@@ -0,0 +1,44 @@
+from typing import Type
+
+from .delta import Substitution
+from .stringable import Stringable
+from .value import Value
+
+
+class InternTable:
+    """Shares a single instance of each distinct value or delta parsed from the same source.
+
+    Every occurrence of the same text is represented by the same object.
+    This relies on Delta.apply() producing a new value rather than
+    modifying the one it is given, which every delta that changes a value
+    in place has to honor by changing a copy."""
+
+    __slots__ = ("_parsed", "_values")
+
+    def __init__(self):
+        self._parsed = {}
+        self._values = {}
+
+    def parse(self, cls: Type[Stringable], text: str) -> Stringable:
+        """Parses an instance of the given class from the text, reusing the
+        object produced by any earlier request for the same class and text."""
+        key = (cls, text)
+        try:
+            return self._parsed[key]
+        except KeyError:
+            parsed, _ = cls.fromString(text)
+            if isinstance(parsed, Substitution):
+                parsed = parsed.__class__(
+                    self.share(parsed.older), self.share(parsed.newer)
+                )
+            else:
+                parsed = self.share(parsed)
+            self._parsed[key] = parsed
+            return parsed
+
+    def share(self, value: Value) -> Value:
+        """Returns the interned instance that is equal to the given value,
+        interning the value itself if there is none."""
+        if not isinstance(value, Value):
+            return value
+        return self._values.setdefault((value.__class__, str(value)), value)
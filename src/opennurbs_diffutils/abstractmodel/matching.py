@@ -0,0 +1,100 @@
+from collections import defaultdict
+from itertools import product
+import math
+from typing import Iterable, Tuple
+from uuid import UUID
+
+from .componenttype import ComponentTypeRegistry
+from .table import Table
+
+
+BoundingBox = Tuple[float, float, float, float, float, float]
+"The minimum and maximum corners of a box, as (x0, y0, z0, x1, y1, z1)"
+
+
+class SpatialGrid:
+    """Buckets items by a key and by the position of their bounding boxes in a uniform grid.
+
+    Boxes whose minimum corners lie within one cell of each other are found
+    by looking in the 27 surrounding cells, so each lookup takes constant
+    time on average."""
+
+    __slots__ = ("_cellSize", "_cells")
+
+    def __init__(self, cellSize: float):
+        self._cellSize = cellSize
+        self._cells = defaultdict(list)
+
+    def _cell(self, box: BoundingBox) -> Tuple[int, int, int]:
+        return tuple(math.floor(c / self._cellSize) for c in box[:3])
+
+    def insert(self, key, box: BoundingBox, item):
+        """Adds an item with the given key and bounding box to the grid."""
+        self._cells[key, self._cell(box)].append((box, item))
+
+    def remove(self, key, box: BoundingBox, item):
+        """Removes an item that was previously added to the grid."""
+        self._cells[key, self._cell(box)].remove((box, item))
+
+    def nearby(self, key, box: BoundingBox) -> Iterable[Tuple[BoundingBox, object]]:
+        """Yields the items with the given key whose boxes lie in or next to the cell of the given box."""
+        x, y, z = self._cell(box)
+        for dx, dy, dz in product((-1, 0, 1), repeat=3):
+            yield from self._cells.get((key, (x + dx, y + dy, z + dz)), ())
+
+
+def boxDistance(a: BoundingBox, b: BoundingBox) -> float:
+    """Returns the largest difference between corresponding coordinates of two bounding boxes."""
+    return max(abs(p - q) for p, q in zip(a, b))
+
+
+def _findType(component: "Component", componentTypes: ComponentTypeRegistry):
+    """Returns the type of a component, or None if the type is not supported."""
+    try:
+        return componentTypes.fromInstance(component)
+    except KeyError:
+        return None
+
+
+def matchByGeometry(
+    deleted: "dict[UUID, Component]",
+    added: "dict[UUID, Component]",
+    table: Table,
+    componentTypes: ComponentTypeRegistry,
+    tolerance: float,
+) -> list[Tuple[UUID, UUID]]:
+    """Pairs deleted components with added components of the same type whose geometry matches.
+
+    Two boxes match if none of their coordinates differ by more than the
+    tolerance. Since many different shapes share a bounding box, a pair is
+    only considered if the table also reports that the geometry itself
+    matches; see Table.geometryMatches(). Each deleted component is paired
+    with the closest unclaimed match, if any. Returns a list of (deleted ID,
+    added ID) pairs."""
+    grid = SpatialGrid(tolerance if tolerance > 0 else 1.0)
+    for id, component in added.items():
+        box = table.getBoundingBox(component)
+        componentType = _findType(component, componentTypes)
+        if box is not None and componentType is not None:
+            grid.insert(componentType, box, id)
+
+    pairs = []
+    for id, component in deleted.items():
+        box = table.getBoundingBox(component)
+        componentType = _findType(component, componentTypes)
+        if box is None or componentType is None:
+            continue
+        best = None
+        for candidateBox, candidate in grid.nearby(componentType, box):
+            distance = boxDistance(box, candidateBox)
+            if (
+                distance <= tolerance
+                and (best is None or distance < best[0])
+                and table.geometryMatches(component, added[candidate], tolerance)
+            ):
+                best = (distance, candidateBox, candidate)
+        if best is not None:
+            grid.remove(componentType, best[1], best[2])
+            pairs.append((id, best[2]))
+
+    return pairs
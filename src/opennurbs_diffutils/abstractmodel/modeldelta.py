@@ -1,44 +1,102 @@
+from copy import copy
+import io
+from itertools import chain
+import json
 from pathlib import Path
-from typing import TextIO, Tuple
+from typing import Callable, Iterable, Iterator, TextIO, Tuple
 
-from .commontypes import Model, Pair
+from .commontypes import Model, Pair, Triple
 from .componentdelta import (
     ComponentDelta,
     ComponentModification,
     ComponentAddition,
     ComponentDeletion,
 )
+from .columnarlist import ColumnarModificationList
+from .componentlist import ComponentDeltaList
+from .componenttype import ComponentType
+from .conflict import Conflict
 from .error import ParseError
 from .filedescription import FileDescription
+from .filter import Filter, MODEL_TYPE_NAME
+from .interntable import InternTable
+from .matching import matchByGeometry
 from .modeltype import ModelType
+from .property import Property
 from .propertymap import PropertyValueMap, PropertyDeltaMap
+from .query import Query
 from .session import Session
+from .snapshot import Snapshot, fingerprint
+from .table import Intersection, Table
 
 
 OLDER_FILE_PREFIX = "---"
 NEWER_FILE_PREFIX = "+++"
 
+TEXT_FORMAT = "text"
+JSON_LINES_FORMAT = "jsonl"
+FORMATS = (TEXT_FORMAT, JSON_LINES_FORMAT)
+JSON_LINES_VERSION = 1
+"The version of the layout of the records written by ModelDelta.writeJSONLines()"
+
+
+def _propertiesDiffer(components: Pair["Component"], properties: list[Property]):
+    """Returns true if any of the given properties differ between a pair of components."""
+    for property in properties:
+        if not property.type.rawEqual(
+            property.getRawValue(components[0]), property.getRawValue(components[1])
+        ):
+            return True
+    return False
+
+
+def _propertyName(line: str) -> str:
+    """Returns the name of the property on a line of a delta's text."""
+    return line.split(":", 1)[0].strip()
+
+
+def _writeRecord(output: TextIO, record: dict):
+    """Writes a record to the given output stream as a single line of JSON."""
+    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
 
 class ModelDelta:
     """Describes the differences between two version of a model."""
 
-    def __init__(self, type: ModelType):
+    def __init__(
+        self, type: ModelType, spillThreshold: int = None, columnar: bool = False
+    ):
         self.type = type
         """The type of model."""
 
+        self.spillThreshold = spillThreshold
+        """The number of additions, deletions, or modifications that are held
+        in memory before the rest are moved to a temporary database, or None
+        to hold them all in memory."""
+
+        self.columnar = columnar
+        """Whether modifications are stored in columns by component type and
+        property rather than as individual objects, which uses much less
+        memory when there are very many of them. Modifications that are
+        stored this way are not moved to a temporary database."""
+
         self.files: Tuple[FileDescription, FileDescription]
         """The files that were diffed to create the delta."""
 
         self.properties = PropertyDeltaMap()
         """The properties of the model that were changed."""
 
-        self.additions: list[ComponentAddition] = []
+        self.additions = ComponentDeltaList(type.componentTypes, spillThreshold)
         """The list of components that were added to the model."""
 
-        self.deletions: list[ComponentDeletion] = []
+        self.deletions = ComponentDeltaList(type.componentTypes, spillThreshold)
         """The list of components that were removed from the model."""
 
-        self.modifications: list[ComponentModification] = []
+        self.modifications = (
+            ColumnarModificationList(type.componentTypes)
+            if columnar
+            else ComponentDeltaList(type.componentTypes, spillThreshold)
+        )
         """The list of components that were removed from the model."""
 
     @property
@@ -65,16 +123,59 @@ class ModelDelta:
         output.write(f"{OLDER_FILE_PREFIX} {self.files[0]}\n")
         output.write(f"{NEWER_FILE_PREFIX} {self.files[1]}\n")
 
-    def write(self, output: TextIO):
-        """Writes the delta to the given output stream."""
+    def write(self, output: TextIO, format: str = TEXT_FORMAT):
+        """Writes the delta to the given output stream.
+
+        The format is either "text", the patch format meant to be read by
+        people, or "jsonl", the format written by writeJSONLines()."""
+        if format == JSON_LINES_FORMAT:
+            self.writeJSONLines(output)
+            return
+        if format != TEXT_FORMAT:
+            raise ValueError(f"Unknown format '{format}'")
         self.writeHeader(output)
         self.properties.write(output)
         for component in self.components:
             component.write(output)
 
+    def writeJSONLines(self, output: TextIO):
+        """Writes the delta to the given output stream as JSON Lines.
+
+        Each line holds one record: a header that describes the files, then a
+        record for each changed model property, then one for each changed
+        component. Values are written as JSON numbers, strings, and lists
+        wherever their types allow. Each record is written as soon as it is
+        produced, so components that are spilled to a database or stored in
+        columns are never all held in memory at once."""
+        _writeRecord(
+            output,
+            {
+                "record": "header",
+                "format": JSON_LINES_VERSION,
+                "older": self.files[0].toJSON(),
+                "newer": self.files[1].toJSON(),
+            },
+        )
+        for property, delta in self.properties.items():
+            _writeRecord(
+                output,
+                {"record": "property", "name": property.name, "delta": delta.toJSON()},
+            )
+        for component in self.components:
+            if (
+                isinstance(component, ComponentModification)
+                and not component.hasChanges
+            ):
+                continue
+            _writeRecord(output, component.toJSON())
+
     def readHeader(self, input: TextIO):
-        desc1, prefix1 = FileDescription.fromString(input.readline())
-        desc2, prefix2 = FileDescription.fromString(input.readline())
+        self._parseHeader(input.readline(), input.readline())
+
+    def _parseHeader(self, olderLine: str, newerLine: str):
+        """Sets the file descriptions from the two lines of a textual header."""
+        desc1, prefix1 = FileDescription.fromString(olderLine)
+        desc2, prefix2 = FileDescription.fromString(newerLine)
         if (
             desc1
             and desc2
@@ -83,104 +184,787 @@ class ModelDelta:
         ):
             self.files = (desc1, desc2)
 
-    def read(self, input: TextIO):
-        """Reads a delta from the given input stream."""
-        self.readHeader(input)
+    def read(self, input: TextIO, filter: Filter = None, rejects: TextIO = None):
+        """Reads a delta from the given input stream.
+
+        Identical values and deltas that appear more than once in the stream
+        are parsed once and share a single instance. If a filter is given,
+        the lines that describe excluded components and properties are
+        skipped without being parsed. If an output stream is given for
+        rejects, the skipped lines are copied to it, under the file header and
+        the header of the hunk they belong to, so that it holds a delta of the
+        excluded changes. Nothing is written to it if no line is skipped.
+
+        A delta written as JSON Lines is recognized by its first line and read
+        by readJSONLines() instead."""
+        for delta in self.iterate(input, filter, rejects):
+            self.addComponent(delta)
+
+    def iterate(
+        self, input: TextIO, filter: Filter = None, rejects: TextIO = None
+    ) -> Iterator[ComponentDelta]:
+        """Reads a delta from the given input stream like read(), yielding each
+        ComponentDelta as soon as all of its lines have been read rather than
+        adding it to this delta.
+
+        The files and the changed model properties are set on this delta as
+        they are read, which is before the first component is yielded."""
+        firstLine = input.readline()
+        if firstLine.lstrip().startswith("{"):
+            yield from self.iterateJSONLines(chain([firstLine], input), filter, rejects)
+            return
+        self._parseHeader(firstLine, input.readline())
+        # Headers that are written to rejects before the next skipped line
+        unwritten = []
+        if rejects is not None and hasattr(self, "files"):
+            header = io.StringIO()
+            self.writeHeader(header)
+            unwritten.append(header.getvalue())
+
+        def reject(line: str):
+            if rejects is not None:
+                rejects.writelines(unwritten)
+                unwritten.clear()
+                rejects.write(line)
+
+        interns = InternTable()
         current = None
+        skipping = False
         lineNumber = 3  # file starts at line 1; header is 2 lines
         for line in input:
 
+            finished = None
             try:
                 if line.startswith("@@"):
+                    if current is not None and not skipping:
+                        finished = current
                     current = ComponentDelta.fromHeader(line, self.type.componentTypes)
-                    if isinstance(current, ComponentAddition):
-                        self.additions.append(current)
-                    elif isinstance(current, ComponentDeletion):
-                        self.deletions.append(current)
+                    skipping = filter is not None and not self._includesComponent(
+                        current.type, current.id, filter
+                    )
+                    if unwritten and unwritten[-1].startswith("@@"):
+                        unwritten.pop()  # No line of the previous hunk was skipped
+                    if skipping:
+                        reject(line)
                     else:
-                        self.modifications.append(current)
+                        unwritten.append(line)
+                elif skipping:
+                    reject(line)
+                elif filter is not None and not (
+                    filter.includesProperty(current.type.name, _propertyName(line))
+                    if current
+                    else self._includesModelProperty(_propertyName(line), filter)
+                ):
+                    reject(line)
                 elif current:
-                    current.readline(line)
+                    current.readline(line, interns)
                 else:
-                    self.properties.readline(line, self.type)
+                    self.properties.readline(line, self.type, interns)
 
             except:
                 raise ParseError(lineNumber)
 
+            if finished is not None:
+                yield finished
+            lineNumber += 1
+
+        if current is not None and not skipping:
+            yield current
+
+    def readJSONLines(
+        self, input: Iterable[str], filter: Filter = None, rejects: TextIO = None
+    ):
+        """Reads a delta written by writeJSONLines() from the given input stream.
+
+        The filter and rejects are handled as they are by read(), except that
+        the records that are skipped are copied to rejects as JSON Lines."""
+        for delta in self.iterateJSONLines(input, filter, rejects):
+            self.addComponent(delta)
+
+    def iterateJSONLines(
+        self, input: Iterable[str], filter: Filter = None, rejects: TextIO = None
+    ) -> Iterator[ComponentDelta]:
+        """Reads a delta written by writeJSONLines() from the given input
+        stream one line at a time, yielding each ComponentDelta as soon as it
+        is read rather than adding it to this delta.
+
+        The files and the changed model properties are set on this delta as
+        their records are read, which is before the first component is
+        yielded. Since no component is kept, a delta of any size can be
+        processed in constant memory."""
+        # The header is written to rejects before the first skipped record
+        unwritten = []
+
+        def reject(record: dict):
+            if rejects is not None:
+                for header in unwritten:
+                    _writeRecord(rejects, header)
+                unwritten.clear()
+                _writeRecord(rejects, record)
+
+        lineNumber = 0
+        for line in input:
             lineNumber += 1
+            if not line.strip():
+                continue
 
-    def apply(self, model: Model, session: Session):
-        """Applies the changes described in the delta to the given model."""
+            try:
+                delta = None
+                record = json.loads(line)
+                kind = record["record"]
+                if kind == "header":
+                    self._readJSONHeader(record)
+                    unwritten[:] = [record]
+                elif kind == "property":
+                    if filter is not None and not self._includesModelProperty(
+                        record["name"], filter
+                    ):
+                        reject(record)
+                    else:
+                        self.properties.readJSON(
+                            record["name"], record["delta"], self.type
+                        )
+                elif kind == "component":
+                    delta = self._readJSONComponent(record, filter, reject)
+                else:
+                    raise ValueError(f"Unknown record type '{kind}'")
+            except:
+                raise ParseError(lineNumber)
+
+            if delta is not None:
+                yield delta
+
+    def _readJSONHeader(self, record: dict):
+        """Sets the file descriptions from a header record."""
+        if record["format"] != JSON_LINES_VERSION:
+            raise ValueError(f"Unsupported format version {record['format']}")
+        self.files = (
+            FileDescription.fromJSON(record["older"]),
+            FileDescription.fromJSON(record["newer"]),
+        )
+
+    def _readJSONComponent(
+        self, record: dict, filter: Filter, reject: Callable[[dict], None]
+    ) -> "ComponentDelta | None":
+        """Creates a ComponentDelta from a component record.
+
+        Returns None if the component is excluded by the filter. The excluded
+        properties of an included component are passed to reject() in a copy
+        of the record."""
+        delta = ComponentDelta.fromJSON(record, self.type.componentTypes)
+        if filter is not None and not self._includesComponent(
+            delta.type, delta.id, filter
+        ):
+            reject(record)
+            return None
+        excluded = {}
+        for name, data in record["properties"].items():
+            if filter is not None and not filter.includesProperty(
+                delta.type.name, name
+            ):
+                excluded[name] = data
+            else:
+                delta.properties.readJSON(name, data, delta.type)
+        if excluded:
+            reject({**record, "properties": excluded})
+        return delta
+
+    def apply(self, model: Model, session: Session, filter: Filter = None):
+        """Applies the changes described in the delta to the given model.
+
+        If a filter is given, only the included changes are applied."""
+        if filter is not None:
+            self.filtered(filter).apply(model, session)
+            return
         self.properties.apply(model, session)
         for delta in self.components:
+            session.setContext(delta.type.name, delta.id, None)
             delta.apply(model, session)
+        session.setContext(None, None, None)
+
+    def check(self, model: Model, session: Session) -> int:
+        """Reports any change in the delta that cannot be applied cleanly to the
+        given model, without changing the model.
 
-    def compare(self, files: Pair[Model], session: Session):
-        """Finds differences between the given pair of models."""
+        Every component the delta refers to is looked up, and the current value
+        of each property is compared with the value the change expects. Returns
+        the number of conflicts found."""
+        conflicts = self.properties.check(model, session)
+        for delta in self.components:
+            session.setContext(delta.type.name, delta.id, None)
+            conflicts += delta.check(model, session)
+        session.setContext(None, None, None)
+        return conflicts
+
+    def compare(
+        self,
+        files: Pair[Model],
+        session: Session,
+        matchTolerance: float = None,
+        streaming: bool = False,
+        filter: Filter = None,
+    ):
+        """Finds differences between the given pair of models.
+
+        If a matchTolerance is given, components that appear to have been
+        deleted are paired with added components of the same type whose
+        bounding boxes match within the tolerance, and each pair is described
+        as a modification that changes the component's ID.
+
+        If streaming is true, components are retrieved from each table one at a
+        time in order of ID rather than all at once, which reduces peak memory
+        use; components are then listed in order of ID.
+
+        If a filter is given, excluded tables are not searched, and excluded
+        components and properties are skipped before any of their properties
+        are read."""
         self.properties = PropertyDeltaMap.fromDifferences(
-            files, self.type.properties, session
+            files, self._modelProperties(filter), session, self.type
         )
+        for delta in self.iterateDifferences(
+            files, session, matchTolerance, streaming, filter
+        ):
+            self.addComponent(delta)
+
+    def iterateDifferences(
+        self,
+        files: Pair[Model],
+        session: Session,
+        matchTolerance: float = None,
+        streaming: bool = False,
+        filter: Filter = None,
+    ) -> Iterator[ComponentDelta]:
+        """Finds differences between the components of the given pair of models
+        like compare(), yielding each ComponentDelta as soon as it is found
+        rather than adding it to this delta.
+
+        The properties of the models themselves are not compared. Combined
+        with streaming, the components of both models are compared one at a
+        time without the changes being collected."""
         for table in self.type.tables:
-            intersection = table.intersect(files)
-
-            for uuid, entities in intersection.common.items():
-                try:
-                    componentType = self.type.componentTypes.fromInstance(entities[0])
-                    # TODO: Handle case where object types are different
-                    delta = ComponentModification(componentType, uuid)
-                    delta.properties = PropertyDeltaMap.fromDifferences(
-                        entities, componentType.properties, session
+            if filter is not None and not filter.includesTable(table.name):
+                continue
+            if streaming:
+                intersection = Intersection()
+                for uuid, older, newer in table.iterateIntersection(files):
+                    if older is None:
+                        if matchTolerance is None:
+                            yield from self._findDescription(
+                                ComponentAddition, uuid, newer, session, filter
+                            )
+                        else:
+                            intersection.added[uuid] = newer
+                    elif newer is None:
+                        if matchTolerance is None:
+                            yield from self._findDescription(
+                                ComponentDeletion, uuid, older, session, filter
+                            )
+                        else:
+                            intersection.deleted[uuid] = older
+                    else:
+                        yield from self._findModification(
+                            uuid, (older, newer), session, filter
+                        )
+            else:
+                intersection = table.intersect(files)
+                for uuid, entities in intersection.common.items():
+                    yield from self._findModification(uuid, entities, session, filter)
+
+            if matchTolerance is not None:
+                for olderId, newerId in matchByGeometry(
+                    intersection.deleted,
+                    intersection.added,
+                    table,
+                    self.type.componentTypes,
+                    matchTolerance,
+                ):
+                    entities = (
+                        intersection.deleted.pop(olderId),
+                        intersection.added.pop(newerId),
                     )
-                    if len(delta.properties) > 0:
-                        self.modifications.append(delta)
-                except KeyError as err:
-                    session.warn(str(err))
+                    delta = self._describeModification(
+                        olderId, entities, session, filter
+                    )
+                    if delta is not None:
+                        delta.newId = newerId
+                        yield delta
 
             for uuid, component in intersection.added.items():
-                try:
-                    componentType = self.type.componentTypes.fromInstance(component)
-                    default = componentType.create(component.model)
-                    delta = ComponentAddition(componentType, uuid)
-                    delta.properties = PropertyValueMap.fromNonDefaultValues(
-                        componentType.properties, component, default
-                    )
-                    self.additions.append(delta)
-                except KeyError as err:
-                    session.warn(str(err))
+                yield from self._findDescription(
+                    ComponentAddition, uuid, component, session, filter
+                )
 
             for uuid, component in intersection.deleted.items():
+                yield from self._findDescription(
+                    ComponentDeletion, uuid, component, session, filter
+                )
+
+    def _findModification(
+        self, uuid, entities: Pair["Component"], session: Session, filter: Filter
+    ) -> Iterator[ComponentModification]:
+        """Yields a ComponentModification if the given versions of a component differ."""
+        try:
+            delta = self._describeModification(uuid, entities, session, filter)
+        except KeyError as err:
+            session.warn(str(err))
+            return
+        if delta is not None and delta.hasChanges:
+            yield delta
+
+    def _findDescription(
+        self, cls, uuid, component, session: Session, filter: Filter
+    ) -> Iterator[ComponentDelta]:
+        """Yields a ComponentAddition or ComponentDeletion for the given component."""
+        try:
+            delta = self._describeComponent(cls, uuid, component, filter)
+        except KeyError as err:
+            session.warn(str(err))
+            return
+        if delta is not None:
+            yield delta
+
+    def compareIncrementally(
+        self,
+        files: Pair[Model],
+        session: Session,
+        previous: Snapshot = None,
+        filter: Filter = None,
+    ) -> Snapshot:
+        """Finds differences between the given pair of models like compare(),
+        reusing the changes found when a previous version of the newer model
+        was compared with the same older model and the same filter.
+
+        Each component of the newer model is fingerprinted. Only those whose
+        fingerprints differ both from the ones in the previous snapshot and
+        from those of the same components in the older model, along with
+        added and deleted components that were not added or deleted before,
+        are compared. The components of the older model are listed and
+        fingerprinted once and kept in the snapshot, so each call still
+        reads every property of the newer model but only the properties of
+        the components of the older model that have not been seen before.
+        Returns a snapshot of the newer model to be passed to the next call."""
+        snapshot = Snapshot(previous)
+        self.properties = PropertyDeltaMap.fromDifferences(
+            files, self._modelProperties(filter), session, self.type
+        )
+        for table in self.type.tables:
+            if filter is not None and not filter.includesTable(table.name):
+                continue
+            if table.name not in snapshot.baseComponents:
+                snapshot.baseComponents[table.name] = table.listComponents(files[0])
+            intersection = table.intersect(files, snapshot.baseComponents[table.name])
+            for uuid, entities in intersection.common.items():
+                self._recordChange(
+                    uuid,
+                    entities,
+                    lambda: self._describeModification(uuid, entities, session, filter),
+                    previous,
+                    snapshot,
+                    session,
+                    filter,
+                )
+            for uuid, component in intersection.added.items():
+                self._recordChange(
+                    uuid,
+                    (None, component),
+                    lambda: self._describeComponent(
+                        ComponentAddition, uuid, component, filter
+                    ),
+                    previous,
+                    snapshot,
+                    session,
+                    filter,
+                )
+            for uuid, component in intersection.deleted.items():
+                self._recordChange(
+                    uuid,
+                    (component, None),
+                    lambda: self._describeComponent(
+                        ComponentDeletion, uuid, component, filter
+                    ),
+                    previous,
+                    snapshot,
+                    session,
+                    filter,
+                )
+        return snapshot
+
+    def _fingerprint(self, component: "Component", filter: Filter) -> bytes:
+        """Returns the fingerprint of the properties of a component that are compared."""
+        componentType = self.type.componentTypes.fromInstance(component)
+        return fingerprint(
+            componentType,
+            component,
+            list(self._componentProperties(componentType, filter)),
+        )
+
+    def _recordChange(
+        self,
+        uuid,
+        entities: "Pair[Component | None]",
+        describe: Callable[[], "ComponentDelta | None"],
+        previous: "Snapshot | None",
+        snapshot: Snapshot,
+        session: Session,
+        filter: Filter,
+    ):
+        """Adds the change to a component to the delta and records it in the
+        snapshot, calling describe() to find the change only if the previous
+        snapshot has none for the component in its current state and the
+        component is not in the same state as in the older model."""
+        older, newer = entities
+        try:
+            componentFingerprint = None
+            if newer is not None:
+                componentFingerprint = self._fingerprint(newer, filter)
+            reusable, delta = (
+                previous.reusableChange(uuid, componentFingerprint)
+                if previous is not None
+                else (False, None)
+            )
+            if not reusable and older is not None and newer is not None:
+                if uuid not in snapshot.baseFingerprints:
+                    try:
+                        baseFingerprint = self._fingerprint(older, filter)
+                    except KeyError:
+                        baseFingerprint = None  # Reported by describe()
+                    snapshot.baseFingerprints[uuid] = baseFingerprint
+                # Fingerprints include the name of the component type
+                reusable = (
+                    snapshot.baseFingerprints[uuid] is not None
+                    and snapshot.baseFingerprints[uuid] == componentFingerprint
+                )
+            if not reusable:
+                delta = describe()
+                if isinstance(delta, ComponentModification) and not delta.hasChanges:
+                    delta = None
+        except KeyError as err:
+            session.warn(str(err))
+            return
+        snapshot.record(uuid, componentFingerprint, delta)
+        if delta is not None:
+            self.addComponent(delta)
+
+    def differs(self, files: Pair[Model], session: Session) -> bool:
+        """Returns true if the given pair of models differ in any way that compare() would report.
+
+        The cheapest checks are made first and the search stops at the first
+        difference found: the properties of the models, then the number of
+        components in each table, then their IDs, and finally the properties
+        of each component. Like compare(), components of types that are not
+        registered with the model type are ignored, but a component that is
+        of a registered type in only one of the models counts as a difference."""
+        if _propertiesDiffer(files, self.type.properties):
+            session.info("Model properties differ")
+            return True
+
+        keys = []
+        for table in self.type.tables:
+            older = self._registeredComponentKeys(table, files[0])
+            newer = self._registeredComponentKeys(table, files[1])
+            if len(older) != len(newer):
+                session.info("Models have different numbers of components")
+                return True
+            if older.keys() != newer.keys():
+                session.info("Models have different sets of components")
+                return True
+            keys.append((table, older, newer))
+
+        for table, older, newer in keys:
+            for id, (key, componentType) in older.items():
+                newerKey, newerType = newer[id]
+                if componentType is not newerType:
+                    session.info(f"{componentType.name} {id} changed type")
+                    return True
+                components = (
+                    table.getComponentByKey(files[0], key),
+                    table.getComponentByKey(files[1], newerKey),
+                )
+                if _propertiesDiffer(components, componentType.properties):
+                    session.info(f"{componentType.name} {id} differs")
+                    return True
+
+        return False
+
+    def _registeredComponentKeys(self, table: Table, model: Model) -> dict:
+        """Maps the ID of each component in the table whose type is registered
+        with the model type to the key that retrieves it and its type."""
+        types = self.type.componentTypes
+        keys = {}
+        for id, key in table.componentKeys(model):
+            try:
+                keys[id] = key, types.fromInstance(table.getComponentByKey(model, key))
+            except KeyError:
+                continue  # compare() skips components of unknown types
+        return keys
+
+    def compareThreeWay(self, files: Triple[Model], session: Session) -> list[Conflict]:
+        """Finds the changes made to a common ancestor in two divergent versions of a model.
+
+        The models are given in the order base, mine, yours. Each table is
+        intersected once and each property is read once per model. Changes
+        that were made in only one version, or identically in both, are
+        combined into this delta; the incompatible ones are returned."""
+        conflicts = []
+
+        self.properties, propertyConflicts = PropertyDeltaMap.fromThreeWayDifferences(
+            files, self.type.properties, session, self.type
+        )
+        for property, (mine, yours) in propertyConflicts.items():
+            conflicts.append(Conflict(None, None, property, mine, yours))
+
+        for table in self.type.tables:
+            for uuid, components in table.intersectThreeWay(files).items():
                 try:
-                    componentType = self.type.componentTypes.fromInstance(component)
-                    default = componentType.create(component.model)
-                    delta = ComponentDeletion(componentType, uuid)
-                    delta.properties = PropertyValueMap.fromNonDefaultValues(
-                        componentType.properties, component, default
+                    conflicts.extend(
+                        self._compareComponentThreeWay(uuid, components, session)
                     )
-                    self.deletions.append(delta)
                 except KeyError as err:
                     session.warn(str(err))
 
+        return conflicts
+
+    def _compareComponentThreeWay(
+        self, uuid, components: Triple["Component"], session: Session
+    ) -> list[Conflict]:
+        """Adds the changes made to one component in either version of a model
+        to this delta and returns any conflicts between them."""
+        base, mine, yours = components
+        versionTypes = [
+            self.type.componentTypes.fromInstance(c) if c is not None else None
+            for c in components
+        ]
+        componentType = next(t for t in versionTypes if t is not None)
+        if any(t not in (None, componentType) for t in versionTypes):
+            # A change of type cannot be described as a modification
+            absent = "deleted" if base is not None else "absent"
+            return [
+                Conflict(
+                    componentType,
+                    uuid,
+                    None,
+                    *(t.name if t is not None else absent for t in versionTypes[1:]),
+                )
+            ]
+
+        if base is None:
+            if mine is None or yours is None:
+                added = mine if mine is not None else yours
+                self.additions.append(
+                    self._describeComponent(ComponentAddition, uuid, added)
+                )
+                return []
+            myAddition = self._describeComponent(ComponentAddition, uuid, mine)
+            yourAddition = self._describeComponent(ComponentAddition, uuid, yours)
+            if myAddition.properties == yourAddition.properties:
+                self.additions.append(myAddition)
+                return []
+            return [Conflict(componentType, uuid, None, "added", "added")]
+
+        if mine is None or yours is None:
+            remaining = mine if mine is not None else yours
+            if remaining is not None:
+                changes = PropertyDeltaMap.fromDifferences(
+                    (base, remaining), componentType.properties, session, componentType
+                )
+                if len(changes) > 0:
+                    operations = ("deleted", "modified")
+                    if mine is not None:
+                        operations = operations[::-1]
+                    return [Conflict(componentType, uuid, None, *operations)]
+            self.deletions.append(
+                self._describeComponent(ComponentDeletion, uuid, base)
+            )
+            return []
+
+        delta = ComponentModification(componentType, uuid)
+        delta.properties, propertyConflicts = PropertyDeltaMap.fromThreeWayDifferences(
+            components, componentType.properties, session, componentType
+        )
+        if len(delta.properties) > 0:
+            self.modifications.append(delta)
+        return [
+            Conflict(componentType, uuid, property, mine, yours)
+            for property, (mine, yours) in propertyConflicts.items()
+        ]
+
+    def _describeModification(
+        self, uuid, entities: Pair["Component"], session, filter: Filter = None
+    ):
+        """Creates a ComponentModification that lists the differences between two versions of a component.
+
+        Returns None if the component or its type is excluded by the filter."""
+        componentType = self.type.componentTypes.fromInstance(entities[0])
+        newerType = self.type.componentTypes.fromInstance(entities[1])
+        if newerType is not componentType:
+            # Reported like a component of an unknown type, since a
+            # ComponentModification cannot change the type of a component
+            raise KeyError(f"{componentType.name} {uuid} became a {newerType.name}")
+        if filter is not None and not self._includesComponent(
+            componentType, uuid, filter
+        ):
+            return None
+        delta = ComponentModification(componentType, uuid)
+        delta.properties = PropertyDeltaMap.fromDifferences(
+            entities,
+            self._componentProperties(componentType, filter),
+            session,
+            componentType,
+        )
+        return delta
+
+    def _describeComponent(self, cls, uuid, component, filter: Filter = None):
+        """Creates a ComponentAddition or ComponentDeletion that lists the non-default properties of the given component.
+
+        Returns None if the component or its type is excluded by the filter."""
+        componentType = self.type.componentTypes.fromInstance(component)
+        if filter is not None and not self._includesComponent(
+            componentType, uuid, filter
+        ):
+            return None
+        default = componentType.create(component.model)
+        delta = cls(componentType, uuid)
+        delta.properties = PropertyValueMap.fromNonDefaultValues(
+            self._componentProperties(componentType, filter),
+            component,
+            default,
+            componentType,
+        )
+        return delta
+
+    @staticmethod
+    def _includesComponent(componentType: ComponentType, id, filter: Filter) -> bool:
+        """Returns true if the filter includes the component with the given ID, its type, and its table."""
+        return (
+            filter.includesType(componentType.name)
+            and filter.includesTable(componentType.table.name)
+            and filter.includesComponent(id)
+        )
+
+    @staticmethod
+    def _includesModelProperty(name: str, filter: Filter) -> bool:
+        """Returns true if the filter includes the property of the model with the given name."""
+        return filter.includesType(MODEL_TYPE_NAME) and filter.includesProperty(
+            MODEL_TYPE_NAME, name
+        )
+
+    @staticmethod
+    def _componentProperties(componentType: ComponentType, filter: Filter):
+        """Returns the properties of the given component type that the filter includes."""
+        if filter is None:
+            return componentType.properties
+        return filter.properties(componentType.name, componentType.properties)
+
+    def _modelProperties(self, filter: Filter):
+        """Returns the properties of the model that the filter includes."""
+        if filter is None:
+            return self.type.properties
+        if not filter.includesType(MODEL_TYPE_NAME):
+            return []
+        return filter.properties(MODEL_TYPE_NAME, self.type.properties)
+
+    def filtered(self, filter: Filter, rejects: "ModelDelta" = None) -> "ModelDelta":
+        """Returns a delta that contains only the changes that the filter includes.
+
+        If a delta is given for rejects, the changes that the filter excludes
+        are added to it, each under the same header as in this delta."""
+        filtered = self.__class__(self.type, self.spillThreshold, self.columnar)
+        filtered.files = self.files
+        properties = self._modelProperties(filter)
+        filtered.properties = PropertyDeltaMap(
+            (property, delta)
+            for property, delta in self.properties.items()
+            if property in properties
+        )
+        if rejects is not None:
+            rejects.files = self.files
+            rejects.properties.update(
+                (property, delta)
+                for property, delta in self.properties.items()
+                if property not in properties
+            )
+        for delta in self.components:
+            if not self._includesComponent(delta.type, delta.id, filter):
+                if rejects is not None:
+                    rejects.addComponent(delta)
+                continue
+            properties = self._componentProperties(delta.type, filter)
+            included = copy(delta)
+            included.properties = delta.properties.__class__(
+                (property, item)
+                for property, item in delta.properties.items()
+                if property in properties
+            )
+            if not isinstance(delta, ComponentModification) or included.hasChanges:
+                filtered.addComponent(included)
+            if rejects is not None and len(included.properties) < len(delta.properties):
+                rejected = copy(delta)
+                rejected.properties = delta.properties.__class__(
+                    (property, item)
+                    for property, item in delta.properties.items()
+                    if property not in properties
+                )
+                rejects.addComponent(rejected)
+        return filtered
+
     def reverse(self):
         """Returns a delta that has the opposite meaning of this one."""
-        reversed = self.__class__(self.type)
+        reversed = self.__class__(self.type, self.spillThreshold, self.columnar)
         reversed.files = (self.files[1], self.files[0])
         reversed.properties = self.properties.reverse()
-        reversed.additions = self.deletions
-        reversed.deletions = self.additions
-        for delta in self.modifications:
-            reversed.modifications.append(delta.reverse())
+        for delta in self.components:
+            reversed.addComponent(delta.reverse())
         return reversed
 
     def findComponent(self, id):
         """Searches for a ComponentDelta with the given ID."""
-        for component in self.components:
-            if component.id == id:
+        for components in (self.additions, self.modifications, self.deletions):
+            component = components.find(id)
+            if component is not None:
                 return component
         return None
 
+    def query(self, **criteria) -> Iterator[ComponentDelta]:
+        """Lists the changes to components in this delta that match a query.
+
+        The keyword arguments are the criteria of a Query, as in
+        delta.query(type="TextDot", property="PrimaryText")."""
+        query = Query(**criteria)
+        return (delta for delta in self.components if query.matches(delta))
+
+    def queryInput(self, input: TextIO, **criteria) -> Iterator[ComponentDelta]:
+        """Reads the changes to components that match a query from the given
+        input stream, yielding each one as soon as it has been read.
+
+        The components and properties that cannot match are skipped without
+        being parsed, and nothing is added to this delta except the files and
+        the model properties; see iterate()."""
+        query = Query(**criteria)
+        return (
+            delta for delta in self.iterate(input, query.filter) if query.matches(delta)
+        )
+
+    def queryModels(
+        self, files: Pair[Model], session: Session, **criteria
+    ) -> Iterator[ComponentDelta]:
+        """Compares the given pair of models, yielding each change to a
+        component that matches a query as soon as it is found.
+
+        The tables, components, and properties that cannot match are not
+        compared, and components are retrieved one at a time; see
+        iterateDifferences()."""
+        query = Query(**criteria)
+        return (
+            delta
+            for delta in self.iterateDifferences(
+                files, session, streaming=True, filter=query.filter
+            )
+            if query.matches(delta)
+        )
+
     def merge(self, other, session):
         """Returns a delta that contains both the changes described in this delta as well as those described in another."""
-        merged = self.__class__(self.type)
+        merged = self.__class__(self.type, self.spillThreshold, self.columnar)
         merged.files = self.files  # temp
         merged.properties = self.properties.merge(other.properties)
 
@@ -197,6 +981,28 @@ class ModelDelta:
 
         return merged
 
+    def compose(self, other: "ModelDelta", session: Session) -> "ModelDelta":
+        """Returns a delta that has the same effect as applying this delta followed by another.
+
+        The two deltas are combined in a single pass over their components,
+        which are correlated by ID; neither model needs to be loaded."""
+        composed = self.__class__(self.type, self.spillThreshold, self.columnar)
+        composed.files = (self.files[0], other.files[1])
+        composed.properties = self.properties.compose(other.properties, session)
+
+        later = {delta.id: delta for delta in other.components}
+        for delta in self.components:
+            otherDelta = later.pop(delta.resultingId, None)
+            if otherDelta is not None:
+                delta = delta.compose(otherDelta, session)
+            if delta is not None:
+                composed.addComponent(delta)
+
+        for otherDelta in later.values():
+            composed.addComponent(otherDelta)
+
+        return composed
+
     def addComponent(self, component):
         """Adds a component to the delta."""
         if isinstance(component, ComponentAddition):
@@ -1,20 +1,41 @@
 from collections import OrderedDict
+from typing import Any, Iterable
+
+from .accessor import AccessorTree
 from .property import Property
 
 
 class BaseType:
     """Enumerates the properties belonging to a type of object."""
 
-    __slots__ = "_properties"
+    __slots__ = ("_properties", "_accessorTrees")
 
     def __init__(self, properties: list[Property]):
         self._properties = OrderedDict([(p.name.casefold(), p) for p in properties])
+        self._accessorTrees: dict[tuple, AccessorTree] = {}
 
     @property
     def properties(self):
         """The list of properties supported by objects of this type."""
         yield from self._properties.values()
 
+    def readValues(
+        self, obj, properties: Iterable[Property] = None
+    ) -> dict[Property, Any]:
+        """Returns the unwrapped values of the given properties, or of all of
+        the type's properties, for an object of this type.
+
+        Intermediate objects that lie on the paths to more than one property,
+        such as the attributes of a model object, are fetched only once. The
+        tree of paths for each set of properties is built the first time it is
+        used."""
+        properties = tuple(self.properties if properties is None else properties)
+        key = tuple(map(id, properties))
+        tree = self._accessorTrees.get(key)
+        if tree is None:
+            tree = self._accessorTrees[key] = AccessorTree(properties)
+        return tree.read(obj)
+
     def getProperty(self, name: str) -> Property:
         """Returns the property with the given name.
 
@@ -1,6 +1,6 @@
 from typing import Type, Union
 
-from .accessor import Accessor, PathAccessor
+from .accessor import Accessor, PathAccessor, Scratch
 from .value import Value
 
 
@@ -33,13 +33,31 @@ class Property:
         """The type of the property."""
         return self._type
 
-    def getValue(self, component: "Component") -> Value:
-        """Returns the value of the property for the given component."""
+    @property
+    def accessor(self) -> Accessor:
+        """The object that gets and sets the property's value on a component."""
+        return self._accessor
+
+    def getValue(self, component: "Component", scratch: Scratch = None) -> Value:
+        """Returns the value of the property for the given component.
+
+        If a Scratch is given, intermediate objects are shared through it."""
+        if scratch is not None:
+            return self._type(self._accessor.getWith(component, scratch))
         return self._type(self._accessor.get(component))
 
-    def setValue(self, component: "Component", value: Value):
-        """Assigns the given value to the property on the given component."""
-        self._accessor.set(component, value.value)
+    def getRawValue(self, component: "Component"):
+        """Returns the value of the property for the given component without wrapping it in a Value."""
+        return self._accessor.get(component)
+
+    def setValue(self, component: "Component", value: Value, scratch: Scratch = None):
+        """Assigns the given value to the property on the given component.
+
+        If a Scratch is given, intermediate objects are shared through it."""
+        if scratch is not None:
+            self._accessor.setWith(component, value.value, scratch)
+        else:
+            self._accessor.set(component, value.value)
 
     def __hash__(self) -> int:
         return hash(self._name.casefold())
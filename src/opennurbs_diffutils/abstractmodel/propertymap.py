@@ -1,35 +1,102 @@
 from abc import ABC, abstractmethod
-from typing import TextIO, Type
+from typing import TextIO, Tuple, Type
 
-from .commontypes import Pair
+from .accessor import Scratch
+from .commontypes import Pair, Triple
 from .componenttype import ComponentType
+from .delta import Delta, Substitution
+from .interntable import InternTable
 from .property import Property
 from .stringable import Stringable
-from .session import Session
+from .session import Session, SilentSession
 
 
 INDENT = "\t"
 
 
+def _diffRawValues(
+    property: Property, older, newer, parentDelta: Delta, session: Session
+) -> "Delta | None":
+    """Returns a Delta that describes how one unwrapped value of a property
+    changed into another, or None if they are equal.
+
+    The values are only wrapped in instances of Value when a difference is
+    recorded or when the change made to the property that affects this one
+    has to be applied to the older value first."""
+    if parentDelta is not None:
+        olderValue = parentDelta.apply(property.type(older), session)
+        newerValue = property.type(newer)
+        return olderValue.diff(newerValue) if olderValue != newerValue else None
+    if property.type.rawEqual(older, newer):
+        return None
+    return property.type(older).diff(property.type(newer))
+
+
+def _readRawValues(
+    components: tuple, properties: list[Property], objectType: "BaseType" = None
+) -> list[dict]:
+    """Returns a dictionary of the unwrapped values of the given properties for each component.
+
+    The values are read through the accessor tree of the type of the
+    components if it is given, or from each property in turn if it is not."""
+    if objectType is not None:
+        return [objectType.readValues(c, properties) for c in components]
+    return [{p: p.getRawValue(c) for p in properties} for c in components]
+
+
+def _omittedParents(properties: list[Property]) -> set[Property]:
+    """Returns the properties that affect the given ones but are not among them.
+
+    Properties that are compared without their parent are compared as if the
+    parent had not changed."""
+    return {
+        property.affectedBy
+        for property in properties
+        if property.affectedBy is not None
+    } - set(properties)
+
+
 class PropertyMap(dict, ABC):
     """Correlates a Property to a Value or Delta."""
 
+    __slots__ = ()
+
+    def __reduce__(self):
+        return self.__class__, (tuple(self.items()),)
+
     def write(self, output: TextIO):
         """Writes a textual representation of the map to the given output stream."""
         for property, item in self.items():
             output.write(f"{INDENT}{property}: {item}\n")
 
-    def readline(self, string: str, objectType: "ComponentType"):
-        """Parses a property and value or delta from the given string and adds them to the map."""
-        parts = string.split(":", 2)
+    def readline(
+        self, string: str, objectType: "ComponentType", interns: InternTable = None
+    ):
+        """Parses a property and value or delta from the given string and adds them to the map.
+
+        If an InternTable is given, identical values and deltas share one instance."""
+        parts = string.split(":", 1)
         if len(parts) != 2:
             raise ValueError("Invalid line format")
 
         name = parts[0].strip()
         property = objectType.getProperty(name)  # throws if not found
-        value, _ = self._stringableFromProperty(property).fromString(parts[1].strip())
+        stringable = self._stringableFromProperty(property)
+        if interns is None:
+            value, _ = stringable.fromString(parts[1].strip())
+        else:
+            value = interns.parse(stringable, parts[1].strip())
         self[property] = value
 
+    def toJSON(self) -> dict:
+        """Produces a representation of the map that can be encoded as JSON, keyed by property name."""
+        return {property.name: item.toJSON() for property, item in self.items()}
+
+    def readJSON(self, name: str, data, objectType: "ComponentType"):
+        """Creates a value or delta from its JSON representation and adds it to the map under the property with the given name."""
+        property = objectType.getProperty(name)  # throws if not found
+        self[property] = self._stringableFromProperty(property).fromJSON(data)
+
     @abstractmethod
     def _stringableFromProperty(self, property: Property) -> Type[Stringable]:
         """Returns an class on which fromString() can be called to parse a value or delta."""
@@ -50,13 +117,16 @@ class PropertyMap(dict, ABC):
 class PropertyValueMap(PropertyMap):
     """Correlates a Property to a Value."""
 
+    __slots__ = ()
+
     def _stringableFromProperty(self, property: Property):
         return property.type
 
     def apply(self, component, session: Session):
         """Assigns the values listed in this map to their corresponding properties on the given component."""
-        for property, value in self.items():
-            property.setValue(component, value)
+        with Scratch(component) as scratch:
+            for property, value in self.items():
+                property.setValue(component, value, scratch)
 
     def reverse(self):
         return self
@@ -76,31 +146,65 @@ class PropertyValueMap(PropertyMap):
 
     @classmethod
     def fromNonDefaultValues(
-        cls, properties: list[Property], component: "Component", default: "Component"
+        cls,
+        properties: list[Property],
+        component: "Component",
+        default: "Component",
+        objectType: "BaseType" = None,
     ):
-        """Creates a PropertyValueMap that discribes how the given component differs from the default state of a component of its type."""
+        """Creates a PropertyValueMap that discribes how the given component differs from the default state of a component of its type.
+
+        If the type of the component is given, the values of all the properties
+        are read at once through its accessor tree."""
         values = cls()
+        properties = [property for property in properties if not property.deltaOnly]
+        instanceValues, defaultValues = _readRawValues(
+            (component, default), properties, objectType
+        )
         for property in properties:
-            if not property.deltaOnly:
-                instanceValue = property.getValue(component)
-                defaultValue = property.getValue(default)
-                if instanceValue != defaultValue:
-                    values[property] = instanceValue
+            instanceValue = instanceValues[property]
+            if not property.type.rawEqual(instanceValue, defaultValues[property]):
+                values[property] = property.type(instanceValue)
         return values
 
 
 class PropertyDeltaMap(PropertyMap):
     """Correlates a Property to a Delta."""
 
+    __slots__ = ()
+
     def _stringableFromProperty(self, property: Property):
         return property.type.deltaType()
 
     def apply(self, component, session: Session):
         """Applies the deltas listed in this map to their corresponding properties on the given component."""
+        with Scratch(component) as scratch:
+            for property, delta in self.items():
+                currentValue = property.getValue(component, scratch)
+                newValue = delta.apply(currentValue, session)
+                property.setValue(component, newValue, scratch)
+
+    def check(self, component, session: Session) -> int:
+        """Compares the current values of the given component's properties with
+        the values the deltas in this map expect, without changing the component.
+
+        Each mismatch is reported through the session, and the number of
+        mismatches is returned."""
+        conflicts = 0
+        scratch = Scratch(component)
         for property, delta in self.items():
-            currentValue = property.getValue(component)
-            newValue = delta.apply(currentValue, session)
-            property.setValue(component, newValue)
+            currentValue = property.getValue(component, scratch)
+            parentDelta = self.get(property.affectedBy)
+            if parentDelta is not None:
+                # The delta expects the value left by the change to its parent,
+                # whose own mismatch is reported when the parent is checked
+                currentValue = parentDelta.apply(currentValue, SilentSession())
+            if not delta.matches(currentValue):
+                session.warn(
+                    f"Value of {property} property is {currentValue}, which does not match {delta}"
+                )
+                conflicts += 1
+        return conflicts
 
     def reverse(self):
         return PropertyDeltaMap(
@@ -120,35 +224,68 @@ class PropertyDeltaMap(PropertyMap):
                 merged[property] = value
         return merged
 
+    def compose(self, other: "PropertyDeltaMap", session: Session):
+        """Returns a PropertyDeltaMap that has the same effect as applying this map followed by another."""
+        composed = PropertyDeltaMap()
+        for property, delta in self.items():
+            parent = property.affectedBy
+            if (
+                parent is not None
+                and parent in other
+                and isinstance(delta, Substitution)
+            ):
+                # The later change to the parent property carries this change along with it
+                delta = delta.__class__(
+                    other[parent].apply(delta.older, session),
+                    other[parent].apply(delta.newer, session),
+                )
+            if property in other:
+                delta = delta.compose(other[property], session)
+            if delta is not None:
+                composed[property] = delta
+        for property, delta in other.items():
+            if property not in self:
+                composed[property] = delta
+        # Changes to parent properties must be applied before those that depend on them
+        return PropertyDeltaMap(
+            sorted(composed.items(), key=lambda item: item[0].affectedBy is not None)
+        )
+
     @classmethod
     def fromDifferences(
-        cls, components: Pair["Component"], properties: list[Property], session: Session
+        cls,
+        components: Pair["Component"],
+        properties: list[Property],
+        session: Session,
+        objectType: "BaseType" = None,
     ):
-        """Creates a PropertyDeltaMap that lists the differences between the given pair of components."""
+        """Creates a PropertyDeltaMap that lists the differences between the given pair of components.
+
+        If the type of the components is given, the values of all the
+        properties are read at once through its accessor tree."""
         differences = PropertyDeltaMap()
         propertiesToCheck = list(properties)
-        propertiesChecked = set()
+        propertiesChecked = _omittedParents(propertiesToCheck)
+        olderValues, newerValues = _readRawValues(
+            components, propertiesToCheck, objectType
+        )
 
         while len(propertiesToCheck) > 0:
             deferredProperties = []
             for property in propertiesToCheck:
-                if property.affectedBy is None:
-                    # print(f"{property} does not depend on any other properties")
-                    olderValue = property.getValue(components[0])
-                    newerValue = property.getValue(components[1])
-                    if olderValue != newerValue:
-                        differences[property] = olderValue.diff(newerValue)
-                    propertiesChecked.add(property)
-                elif property.affectedBy in propertiesChecked:
-                    # print(f"{property} depends on {property.affectedBy}")
-                    olderValue = property.getValue(components[0])
-                    newerValue = property.getValue(components[1])
-                    if property.affectedBy in differences:
-                        olderValue = differences[property.affectedBy].apply(
-                            olderValue, session
-                        )
-                    if olderValue != newerValue:
-                        differences[property] = olderValue.diff(newerValue)
+                if (
+                    property.affectedBy is None
+                    or property.affectedBy in propertiesChecked
+                ):
+                    delta = _diffRawValues(
+                        property,
+                        olderValues[property],
+                        newerValues[property],
+                        differences.get(property.affectedBy),
+                        session,
+                    )
+                    if delta is not None:
+                        differences[property] = delta
                     propertiesChecked.add(property)
                 else:
                     # print("deferring", property)
@@ -157,3 +294,66 @@ class PropertyDeltaMap(PropertyMap):
             propertiesToCheck = deferredProperties
 
         return differences
+
+    @classmethod
+    def fromThreeWayDifferences(
+        cls,
+        components: Triple["Component"],
+        properties: list[Property],
+        session: Session,
+        objectType: "BaseType" = None,
+    ) -> "Tuple[PropertyDeltaMap, dict[Property, Pair[Delta]]]":
+        """Combines the changes made to a common ancestor in two divergent versions of a component.
+
+        The components are given in the order base, mine, yours. Returns a
+        PropertyDeltaMap containing the changes that were made in only one
+        version or identically in both, along with a dictionary that pairs
+        each conflicting property with the changes made to it in each version.
+
+        Each property is read once from each component; if the type of the
+        components is given, the values are read at once through its
+        accessor tree."""
+        merged = cls()
+        conflicts = {}
+        sides = (cls(), cls())
+        propertiesToCheck = list(properties)
+        propertiesChecked = _omittedParents(propertiesToCheck)
+        baseValues, *sideValues = _readRawValues(
+            components, propertiesToCheck, objectType
+        )
+
+        while len(propertiesToCheck) > 0:
+            deferredProperties = []
+            for property in propertiesToCheck:
+                if (
+                    property.affectedBy is not None
+                    and property.affectedBy not in propertiesChecked
+                ):
+                    deferredProperties.append(property)
+                    continue
+
+                for side, values in zip(sides, sideValues):
+                    delta = _diffRawValues(
+                        property,
+                        baseValues[property],
+                        values[property],
+                        side.get(property.affectedBy),
+                        session,
+                    )
+                    if delta is not None:
+                        side[property] = delta
+
+                mine = sides[0].get(property)
+                yours = sides[1].get(property)
+                if mine is None:
+                    if yours is not None:
+                        merged[property] = yours
+                elif yours is None or mine == yours:
+                    merged[property] = mine
+                else:
+                    conflicts[property] = (mine, yours)
+                propertiesChecked.add(property)
+
+            propertiesToCheck = deferredProperties
+
+        return merged, conflicts
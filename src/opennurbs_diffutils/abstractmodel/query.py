@@ -0,0 +1,64 @@
+from uuid import UUID
+
+from .componentdelta import ComponentDelta
+from .filter import Filter
+
+
+OPERATIONS = tuple(ComponentDelta._CLASSES_BY_OPERATION)
+"The names of the kinds of change made to a component."
+
+
+class Query:
+    """Selects the changes to components by their type, table, ID, the
+    properties they change, and whether the components were added, deleted,
+    or modified.
+
+    Each criterion that is given narrows the selection. Names and IDs may
+    contain shell-style wildcards and are compared case-insensitively, as
+    they are by a Filter. The criteria other than the operation are also
+    expressed as a Filter, so that a delta that is being read or computed
+    can skip the components and properties that cannot match before they
+    are parsed or compared. When a property is given, only that property of
+    each component is read or compared."""
+
+    __slots__ = ("property", "operation", "filter")
+
+    def __init__(
+        self,
+        type: str = None,
+        property: str = None,
+        id: "UUID | str" = None,
+        table: str = None,
+        operation: str = None,
+    ):
+        if operation is not None and operation not in OPERATIONS:
+            raise ValueError(f"'{operation}' is not one of {', '.join(OPERATIONS)}")
+        self.property = property
+        """The pattern that a property changed by a selected component must match, or None."""
+        self.operation = operation
+        """The kind of change that is selected, or None to select any kind."""
+
+        criteria = {"type": type, "property": property, "id": id, "table": table}
+        self.filter = Filter(
+            f"{category}:{value}"
+            for category, value in criteria.items()
+            if value is not None
+        )
+        """The filter that includes the components and properties that can match."""
+
+    def matches(self, delta: ComponentDelta) -> bool:
+        """Returns true if the given change is selected by the query."""
+        if self.operation is not None and delta.operation != self.operation:
+            return False
+        if not (
+            self.filter.includesType(delta.type.name)
+            and self.filter.includesTable(delta.type.table.name)
+            and self.filter.includesComponent(delta.id)
+        ):
+            return False
+        if self.property is None:
+            return True
+        return any(
+            self.filter.includesProperty(delta.type.name, property.name)
+            for property in delta.properties
+        )
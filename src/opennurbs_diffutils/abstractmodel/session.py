@@ -13,6 +13,9 @@ class Session(ABC):
     def warn(self, message: str) -> None:
         pass
 
+    def info(self, message: str) -> None:
+        """Reports information, such as timings, that is not needed to interpret the results."""
+
     @abstractmethod
     def fatal(self, message: str) -> None:
         pass
@@ -20,3 +23,21 @@ class Session(ABC):
     @abstractmethod
     def setContext(self, componentType: str, componentID: UUID, property):
         pass
+
+
+class SilentSession(Session):
+    """A session that ignores warnings, for changes whose mismatches are reported elsewhere.
+
+    Questions are answered no, and fatal errors are raised as exceptions."""
+
+    def ask(self, question: str):
+        return False
+
+    def warn(self, message: str) -> None:
+        pass
+
+    def fatal(self, message: str) -> None:
+        raise Exception(message)
+
+    def setContext(self, componentType: str, componentID: UUID, property):
+        pass
@@ -0,0 +1,85 @@
+import hashlib
+import os
+from uuid import UUID
+
+from .componentdelta import ComponentDelta
+from .componenttype import ComponentType
+from .property import Property
+
+
+def fingerprint(
+    componentType: ComponentType, component: "Component", properties: list[Property]
+) -> bytes:
+    """Returns a digest of the given properties of a component that changes whenever any of their values does.
+
+    The digest is taken over the keys of the unwrapped values, which must
+    consist of strings, numbers, bytes, UUIDs, None, and tuples of these to
+    be represented by their values. If any key does not, such as an object
+    of an extension module whose type defines no rawKey(), a random digest
+    is returned instead, so that the component is always treated as changed
+    rather than wrongly treated as unchanged."""
+    values = componentType.readValues(component, properties)
+    keys = [(p.name, p.type.rawKey(values[p])) for p in properties]
+    if not all(_isPlainKey(key) for _, key in keys):
+        return os.urandom(16)
+    return hashlib.blake2b(
+        repr((componentType.name, keys)).encode("utf-8"), digest_size=16
+    ).digest()
+
+
+def _isPlainKey(key) -> bool:
+    """Returns true if the textual representation of a key depends only on its value."""
+    if isinstance(key, tuple):
+        return all(map(_isPlainKey, key))
+    return key is None or isinstance(key, (str, bytes, int, float, UUID))
+
+
+class Snapshot:
+    """Records the state of each component in one version of a model along
+    with the change found for it relative to a base model.
+
+    When a later version of the model is compared with the same base model,
+    the changes found for the components whose state is the same in both
+    versions are reused instead of being found again. The components of the
+    base model and their fingerprints are listed once and shared by every
+    snapshot that follows from the first."""
+
+    __slots__ = ("fingerprints", "changes", "baseComponents", "baseFingerprints")
+
+    def __init__(self, previous: "Snapshot | None" = None):
+        self.fingerprints: dict[UUID, "bytes | None"] = {}
+        """The fingerprint of each component in this version, or None for a
+        component of the base model that does not appear in this version."""
+
+        self.changes: dict[UUID, "ComponentDelta | None"] = {}
+        """The change found for each component, or None if the component is
+        the same in both models or was not compared."""
+
+        self.baseComponents: dict[str, "dict[UUID, Component]"] = (
+            previous.baseComponents if previous is not None else {}
+        )
+        """The components of each table of the base model, by ID, for the
+        tables that have been listed."""
+
+        self.baseFingerprints: dict[UUID, "bytes | None"] = (
+            previous.baseFingerprints if previous is not None else {}
+        )
+        """The fingerprint of each component of the base model that has been
+        fingerprinted, or None for one whose type is not registered."""
+
+    def reusableChange(
+        self, id: UUID, fingerprint: "bytes | None"
+    ) -> "tuple[bool, ComponentDelta | None]":
+        """Returns whether the change recorded for the component with the given
+        ID still applies to a component with the given fingerprint, along
+        with that change."""
+        if id in self.changes and self.fingerprints.get(id) == fingerprint:
+            return True, self.changes[id]
+        return False, None
+
+    def record(
+        self, id: UUID, fingerprint: "bytes | None", change: "ComponentDelta | None"
+    ):
+        """Records the state of a component and the change found for it."""
+        self.fingerprints[id] = fingerprint
+        self.changes[id] = change
@@ -5,6 +5,8 @@ from typing import Tuple
 class Stringable(ABC):
     """An object that can be converted to and from a textual representation."""
 
+    __slots__ = ()
+
     @abstractmethod
     def __str__(self) -> str:
         """Produces a textual representation of the object."""
@@ -15,3 +17,19 @@ class Stringable(ABC):
         """Attempts to parses an object from the beginning of the given string.
 
         Any part of the string that follows the parsed textual representation is returned."""
+
+    def toJSON(self):
+        """Produces a representation of the object that can be encoded as JSON.
+
+        By default, this is the textual representation of the object."""
+        return str(self)
+
+    @classmethod
+    def fromJSON(cls, data) -> "Self":
+        """Creates an object from the representation produced by toJSON()."""
+        if not isinstance(data, str):
+            raise ValueError(f"{data!r} is not a valid {cls.__name__}")
+        result, remainder = cls.fromString(data)
+        if remainder.strip():
+            raise ValueError(f"Unexpected text '{remainder}' after {cls.__name__}")
+        return result
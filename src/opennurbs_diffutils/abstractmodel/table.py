@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Hashable, Iterable, Iterator, Tuple
 from uuid import UUID
-from .commontypes import Pair, Model
+from .commontypes import Pair, Model, Triple
 
 # from .component import Component
 
@@ -15,14 +16,35 @@ class Intersection:
 class Table(ABC):
     """Specifies how to retrieve components from, add them to, and delete them from a model."""
 
+    def __init__(self, name: str = ""):
+        self.name = name
+        """The name of the table."""
+
     @abstractmethod
     def getComponent(self, model: Model, id: UUID):
-        """Retrieves the component with the given ID."""
+        """Retrieves the component with the given ID, or None if there is no such component."""
 
     @abstractmethod
     def allComponents(self, model: Model) -> "Iterable[Component]":
         """Retrieves the complete set of components in the table."""
 
+    def count(self, model: Model) -> int:
+        """Returns the number of components in the table."""
+        return sum(1 for _ in self.allComponents(model))
+
+    def componentKeys(self, model: Model) -> "Iterable[Tuple[UUID, Hashable]]":
+        """Lists the ID of each component in the table along with a key that
+        getComponentByKey() can use to retrieve it again.
+
+        The default implementation uses the ID itself as the key."""
+        for component in self.allComponents(model):
+            id = self.getComponentId(component)
+            yield id, id
+
+    def getComponentByKey(self, model: Model, key: Hashable):
+        """Retrieves a component using a key listed by componentKeys()."""
+        return self.getComponent(model, key)
+
     @staticmethod
     @abstractmethod
     def getComponentId(component: "Component"):
@@ -33,14 +55,45 @@ class Table(ABC):
     def setComponentId(component: "Component", id: UUID):
         """Sets the unique ID of a component."""
 
-    def intersect(self, models: Pair[Model]) -> Intersection:
+    def getBoundingBox(self, component: "Component") -> "BoundingBox | None":
+        """Returns the bounding box of a component's geometry as (x0, y0, z0, x1, y1, z1).
+
+        Components that have no geometry return None and are never matched by
+        geometry when their IDs change."""
+        return None
+
+    def geometryMatches(
+        self, older: "Component", newer: "Component", tolerance: float
+    ) -> bool:
+        """Returns true if the geometry of two components whose bounding boxes
+        match is also the same up to the given tolerance, such as by having
+        the same number of points at the same positions.
+
+        Only components for which this returns true are paired when their
+        IDs change. By default, the bounding boxes alone are compared."""
+        return True
+
+    def listComponents(self, model: Model) -> "dict[UUID, Component]":
+        """Returns the components of a model by their IDs."""
+        return {
+            self.getComponentId(component): component
+            for component in self.allComponents(model)
+        }
+
+    def intersect(
+        self, models: Pair[Model], olderComponents: "dict[UUID, Component]" = None
+    ) -> Intersection:
         """Determines which components have been removed from the older model,
-        which ones have been added to the newer model, and which ones appear in both."""
-        intersection = Intersection()
+        which ones have been added to the newer model, and which ones appear in both.
 
-        for component in self.allComponents(models[0]):
-            id = self.getComponentId(component)
-            intersection.deleted[id] = component
+        The components of the older model, as returned by listComponents(),
+        can be given so that they are not listed again."""
+        intersection = Intersection()
+        intersection.deleted = (
+            dict(olderComponents)
+            if olderComponents is not None
+            else self.listComponents(models[0])
+        )
 
         for component in self.allComponents(models[1]):
             id = self.getComponentId(component)
@@ -53,6 +106,53 @@ class Table(ABC):
 
         return intersection
 
+    def iterateIntersection(
+        self, models: Pair[Model]
+    ) -> "Iterator[Tuple[UUID, Component | None, Component | None]]":
+        """Correlates the components of two versions of a model without holding on to them.
+
+        Only the ID and key of each component are collected up front. Both lists
+        are sorted by ID and merged, and each component is retrieved when it is
+        reached, so the components are yielded in order of ID as (id, older,
+        newer) tuples, where None stands in for a component that was added or
+        deleted."""
+        older = sorted((id.int, key) for id, key in self.componentKeys(models[0]))
+        newer = sorted((id.int, key) for id, key in self.componentKeys(models[1]))
+        i = j = 0
+
+        while i < len(older) or j < len(newer):
+            if j == len(newer) or (i < len(older) and older[i][0] < newer[j][0]):
+                id, key = older[i]
+                yield UUID(int=id), self.getComponentByKey(models[0], key), None
+                i += 1
+            elif i == len(older) or newer[j][0] < older[i][0]:
+                id, key = newer[j]
+                yield UUID(int=id), None, self.getComponentByKey(models[1], key)
+                j += 1
+            else:
+                yield (
+                    UUID(int=older[i][0]),
+                    self.getComponentByKey(models[0], older[i][1]),
+                    self.getComponentByKey(models[1], newer[j][1]),
+                )
+                i += 1
+                j += 1
+
+    def intersectThreeWay(self, models: Triple[Model]) -> "dict[UUID, list[Component]]":
+        """Correlates the components of three versions of a model in a single pass.
+
+        Returns a dictionary that maps each ID to the list of components with
+        that ID in each model, in the order given. None stands in for a
+        component that does not appear in a model."""
+        components = {}
+
+        for i, model in enumerate(models):
+            for component in self.allComponents(model):
+                id = self.getComponentId(component)
+                components.setdefault(id, [None] * len(models))[i] = component
+
+        return components
+
     @abstractmethod
     def addComponent(self, component: "Component", model: Model):
         """Adds the given component to the table in the given model."""
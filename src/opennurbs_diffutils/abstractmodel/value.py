@@ -1,15 +1,25 @@
 from abc import abstractmethod
 import json
 import re
+import sys
 from typing import Any, Generic, Type, TypeVar
 import uuid
 from .delta import Substitution
+from .editscript import SequenceEdit, StringEdit
 from .stringable import Stringable
 
 
 T = TypeVar("T")
 
 
+def _callerModule() -> str:
+    """Returns the name of the module that called the function calling this one.
+
+    Classes created by defineSubclass() claim that module as their own, so
+    that they can be pickled by reference like any other class."""
+    return sys._getframe(2).f_globals.get("__name__", __name__)
+
+
 class Value(Stringable, Generic[T]):
     """Holds a piece of information that was retrieved from or that can be assigned to a component property."""
 
@@ -19,6 +29,9 @@ class Value(Stringable, Generic[T]):
         # whatever comes out of the accessor is passed into here
         self.value = value
 
+    def __reduce__(self):
+        return self.__class__, (self.value,)
+
     def __repr__(self):
         """Produces a textual representation of the value to be used during development."""
         return f"{self.__class__.__qualname__}({self})"
@@ -29,7 +42,20 @@ class Value(Stringable, Generic[T]):
 
     def __eq__(self, other: "Value[T]") -> bool:
         """Compares this value to another and returns true if they are equal."""
-        return self.value == other.value
+        return self.rawEqual(self.value, other.value)
+
+    @classmethod
+    def rawEqual(cls, a: T, b: T) -> bool:
+        """Compares two unwrapped values of this type and returns true if they are equal.
+
+        This allows values that come straight out of an accessor to be compared
+        without first wrapping each of them in an instance of Value."""
+        return a == b
+
+    @classmethod
+    def rawKey(cls, raw: T):
+        """Returns a hashable object that is equal to the key of another unwrapped value of this type exactly when the two values are equal."""
+        return raw
 
     def diff(self, newer: "Value[T]"):
         """Returns an instance of Delta that describes how this value can be transformed into another."""
@@ -47,6 +73,8 @@ class Value(Stringable, Generic[T]):
 class JSONEncodeableValue(Value):
     """An implementation of Value that uses the json package to convert values to and from their textual representations."""
 
+    __slots__ = ()
+
     _DECODER = json.JSONDecoder(strict=False)
     _EXPECTED_TYPE = object
     _LABEL = ""
@@ -61,6 +89,15 @@ class JSONEncodeableValue(Value):
             raise Exception(f"'{input}' is not a valid {cls._LABEL}")
         return cls(value), input[end:]
 
+    def toJSON(self):
+        return self.value
+
+    @classmethod
+    def fromJSON(cls, data):
+        if not isinstance(data, cls._EXPECTED_TYPE):
+            raise Exception(f"{data!r} is not a valid {cls._LABEL}")
+        return cls(data)
+
     @classmethod
     def defineSubclass(
         cls, name: str, label: str, expected_type
@@ -70,7 +107,8 @@ class JSONEncodeableValue(Value):
             name,
             (cls,),
             {
-                "__module__": cls.__module__,
+                "__module__": _callerModule(),
+                "__slots__": (),
                 "_LABEL": label,
                 "_EXPECTED_TYPE": expected_type,
             },
@@ -80,12 +118,108 @@ class JSONEncodeableValue(Value):
 BooleanValue = JSONEncodeableValue.defineSubclass("BooleanValue", "boolean", bool)
 FloatValue = JSONEncodeableValue.defineSubclass("FloatValue", "float", float)
 IntegerValue = JSONEncodeableValue.defineSubclass("IntegerValue", "integer", int)
-StringValue = JSONEncodeableValue.defineSubclass("StringValue", "string", str)
+
+
+class StringValue(JSONEncodeableValue):
+    """An implementation of Value that holds strings.
+
+    A change to a string is described by an edit script when that is shorter
+    than substituting the whole string."""
+
+    __slots__ = ()
+
+    _LABEL = "string"
+    _EXPECTED_TYPE = str
+
+    def diff(self, newer):
+        substitution = super().diff(newer)
+        edit = self.deltaType().between(self, newer)
+        return edit if len(str(edit)) < len(str(substitution)) else substitution
+
+    @classmethod
+    def deltaType(cls):
+        return StringEdit.specialize(cls)
+
+
+class SequenceValue(Value):
+    """An implementation of Value that holds an ordered list of values of another type.
+
+    Sequences are diffed into an edit script, so that changing a few elements
+    of a long list does not rewrite the whole list."""
+
+    __slots__ = ()
+
+    _LABEL = ""
+    _ELEMENT_TYPE: Type[Value]
+
+    def __str__(self):
+        elements = (str(self._ELEMENT_TYPE(element)) for element in self.value)
+        return "[" + ", ".join(elements) + "]"
+
+    def toJSON(self):
+        return [self._ELEMENT_TYPE(element).toJSON() for element in self.value]
+
+    @classmethod
+    def fromJSON(cls, data):
+        if not isinstance(data, list):
+            raise Exception(f"{data!r} is not a valid {cls._LABEL}")
+        return cls([cls._ELEMENT_TYPE.fromJSON(element).value for element in data])
+
+    @classmethod
+    def fromString(cls, input):
+        text, count = re.subn(r"^\s*\[\s*", "", input)
+        if count != 1:
+            raise Exception(f"'{input}' is not a valid {cls._LABEL}")
+        elements = []
+        if text.startswith("]"):
+            return cls(elements), text[1:]
+        while True:
+            element, text = cls._ELEMENT_TYPE.fromString(text)
+            elements.append(element.value)
+            match = re.match(r"\s*([,\]])\s*", text)
+            if not match:
+                raise Exception(f"'{input}' is not a valid {cls._LABEL}")
+            if match[1] == "]":
+                return cls(elements), text[match.end() :]
+            text = text[match.end() :]
+
+    @classmethod
+    def rawEqual(cls, a, b):
+        return len(a) == len(b) and all(map(cls._ELEMENT_TYPE.rawEqual, a, b))
+
+    @classmethod
+    def rawKey(cls, raw):
+        return tuple(map(cls._ELEMENT_TYPE.rawKey, raw))
+
+    def diff(self, newer):
+        return self.deltaType().between(self, newer)
+
+    @classmethod
+    def deltaType(cls):
+        return SequenceEdit.specialize(cls)
+
+    @classmethod
+    def defineSubclass(
+        cls, name: str, label: str, elementType: Type[Value]
+    ) -> "Type[SequenceValue]":
+        """Returns a subclass of SequenceValue that holds elements of the given type."""
+        return type(
+            name,
+            (cls,),
+            {
+                "__module__": _callerModule(),
+                "__slots__": (),
+                "_LABEL": label,
+                "_ELEMENT_TYPE": elementType,
+            },
+        )
 
 
 class RegexParseableValue(Value):
     """An implementation of Value that parses values from a string using a regular expression."""
 
+    __slots__ = ()
+
     _LABEL: str
     _PATTERN: re.Pattern
 
@@ -105,6 +239,8 @@ class RegexParseableValue(Value):
 class UUIDValue(RegexParseableValue):
     """An implementation of Value that stores UUIDs."""
 
+    __slots__ = ()
+
     _PATTERN = re.compile(
         r"\s*([0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12})",
         re.IGNORECASE,
@@ -118,6 +254,8 @@ class UUIDValue(RegexParseableValue):
 class EnumeratedValue(Value):
     """An implementation of Value that maps members of an enumeration to their textual representations."""
 
+    __slots__ = ()
+
     _LABEL = ""
     _VALUES_TO_STRINGS = {}
     _STRINGS_TO_VALUES = {}
@@ -125,6 +263,12 @@ class EnumeratedValue(Value):
     def __str__(self):
         return self._VALUES_TO_STRINGS[self.value]
 
+    @classmethod
+    def rawKey(cls, raw):
+        # Members of enumerations defined by extension modules may not have
+        # a textual representation that depends only on their value
+        return cls._VALUES_TO_STRINGS.get(raw, raw)
+
     @classmethod
     def fromString(cls, input):
         match = re.match(r"\s*(\w+)", input)
@@ -136,6 +280,16 @@ class EnumeratedValue(Value):
         except:
             raise Exception(f"{match[1]} is not a valid {cls._LABEL}")
 
+    def __reduce__(self):
+        # Members of enumerations defined by extension modules are not
+        # necessarily picklable, so the value is pickled by its label instead
+        return self.__class__._fromLabel, (str(self),)
+
+    @classmethod
+    def _fromLabel(cls, label: str):
+        """Creates a value from its textual representation."""
+        return cls(cls._STRINGS_TO_VALUES[label.casefold()])
+
     @classmethod
     def defineSubclass(cls, name: str, label: str, translation_table: dict[Any, str]):
         """Returns a subclass of EnumeratedValue that uses  the given mapping to tranlate between values and strings."""
@@ -143,7 +297,8 @@ class EnumeratedValue(Value):
             name,
             (cls,),
             {
-                "__module__": cls.__module__,
+                "__module__": _callerModule(),
+                "__slots__": (),
                 "_LABEL": label,
                 "_VALUES_TO_STRINGS": translation_table,
                 "_STRINGS_TO_VALUES": {
@@ -10,4 +10,11 @@ from .enums import (
     InstanceDefinitionUpdateType,
 )
 
-from .model import File3dmDelta
+from .model import (
+    File3dmDelta,
+    compareHistory,
+    readModel,
+    readModelFromBytes,
+    readModels,
+    watchPaths,
+)
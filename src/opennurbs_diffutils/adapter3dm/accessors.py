@@ -1,8 +1,8 @@
 from typing import Union
-from ..abstractmodel import Accessor, PathAccessor, Table, UUIDValue
+from ..abstractmodel import Accessor, PathAccessor, Scratch, Table, UUIDValue
 
 
-class IndexReferenceAccessor:
+class IndexReferenceAccessor(Accessor):
     def __init__(self, baseAccessor: Union[Accessor, str], table: Table):
         self._baseAccessor = PathAccessor.ifString(baseAccessor)
         self._table = table
@@ -35,3 +35,17 @@ class ValueObjectAccessor(Accessor):
         immutable_object = self._objectAccessor.get(host)
         self._propertyAccessor.set(immutable_object, value)
         self._objectAccessor.set(host, immutable_object)
+
+    def split(self):
+        if isinstance(self._objectAccessor, PathAccessor):
+            # The value object is fetched once for every property read from it
+            return tuple(str(self._objectAccessor).split(".")), self._propertyAccessor
+        return (), self
+
+    def getWith(self, host, scratch: Scratch):
+        return self._propertyAccessor.get(scratch.fetch(self._objectAccessor))
+
+    def setWith(self, host, value, scratch: Scratch):
+        immutable_object = scratch.fetch(self._objectAccessor)
+        self._propertyAccessor.set(immutable_object, value)
+        scratch.markChanged(self._objectAccessor)
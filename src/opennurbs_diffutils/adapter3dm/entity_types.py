@@ -78,9 +78,12 @@ ENTITY_TYPES = File3dmComponentTypeRegistry(
             props.TextDotProperties,
             createDefault=createTextDot,
         ),
-        # GeometricObjectType("PolylineCurve", rhino3dm.PolylineCurve, tables.Geometry, properties.GeometryProperties + [
-        #     Property("Point", codecs.Point3d, )
-        # ]),
+        GeometricObjectType(
+            "PolylineCurve",
+            rhino3dm.PolylineCurve,
+            tables.GEOMETRY_TABLE,
+            props.PolylineCurveProperties,
+        ),
         ComponentType(
             "Material",
             rhino3dm.Material,
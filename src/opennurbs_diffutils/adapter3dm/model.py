@@ -1,7 +1,20 @@
+import filecmp
 from pathlib import Path
+import os
+import tempfile
+from time import perf_counter, sleep
+from typing import Iterable, Iterator, Sequence, Tuple
 from rhino3dm import File3dm
 
-from ..abstractmodel import ModelDelta, ModelType, Pair, Session
+from ..abstractmodel import (
+    ComponentDelta,
+    FileDescription,
+    Filter,
+    ModelDelta,
+    ModelType,
+    Pair,
+    Session,
+)
 
 from .entity_types import ENTITY_TYPES
 from .properties import ModelProperties
@@ -18,21 +31,157 @@ from .tables import ALL_TABLES
 FILE3DM_TYPE = ModelType(ALL_TABLES, ENTITY_TYPES, ModelProperties)
 
 
+def readModel(path: Path) -> File3dm:
+    """Reads the model stored in the given file."""
+    model = File3dm.Read(str(path))
+    if model is None:
+        raise ValueError(f"Failed to read file {path}")
+    return model
+
+
+def readModelFromBytes(data: bytes, name: str) -> File3dm:
+    """Reads a model from the contents of a file, such as a blob in a git repository.
+
+    File3dm reads models from files, so the contents are written to a
+    temporary file first."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "model.3dm"
+        path.write_bytes(data)
+        model = File3dm.Read(str(path))
+    if model is None:
+        raise ValueError(f"Failed to read {name}")
+    return model
+
+
+def readModels(paths: Sequence[Path], session: Session) -> tuple[File3dm, ...]:
+    """Reads the models stored in the given files, one after another.
+
+    File3dm.Read holds the GIL, so threads would not overlap the reads, and
+    a File3dm cannot be returned from a worker process without encoding it
+    and reading it again. The time taken to read each file is reported
+    through the session."""
+    models = []
+    for path in paths:
+        start = perf_counter()
+        models.append(readModel(path))
+        session.info(f"Read {path} in {perf_counter() - start:.3f}s")
+    return tuple(models)
+
+
 class File3dmDelta(ModelDelta):
-    def __init__(self, type=FILE3DM_TYPE):
-        super().__init__(type)
+    def __init__(self, type=FILE3DM_TYPE, spillThreshold=None, columnar=False):
+        super().__init__(type, spillThreshold, columnar)
 
-    def comparePaths(self, paths: Pair[Path], session: Session):
-        olderModel = File3dm.Read(str(paths[0]))
-        if olderModel is None:
-            raise ValueError(f"Failed to read file {paths[0]}")
+    def comparePaths(self, paths: Pair[Path], session: Session, **options):
+        """Finds differences between the models stored in the given files.
 
-        newerModel = File3dm.Read(str(paths[1]))
-        if newerModel is None:
-            print(f"Failed to read file {paths[1]}")
-            exit(1)
+        Any keyword arguments are passed on to compare()."""
+        olderModel, newerModel = readModels(paths, session)
 
         # olderModel = ModelWrapper(olderModel)
         # newerModel = ModelWrapper(newerModel)
-        self.compare((olderModel, newerModel), session)
+        self.compare((olderModel, newerModel), session, **options)
+        self.setFilePaths(paths)
+
+    def queryPaths(
+        self, paths: Pair[Path], session: Session, **criteria
+    ) -> Iterator[ComponentDelta]:
+        """Compares the models stored in the given files, yielding each change
+        to a component that matches a query as soon as it is found.
+
+        Any keyword arguments are passed on to queryModels()."""
+        models = readModels(paths, session)
         self.setFilePaths(paths)
+        return self.queryModels(models, session, **criteria)
+
+    def pathsDiffer(self, paths: Pair[Path], session: Session) -> bool:
+        """Returns true if the models stored in the given files differ, stopping at the first difference found.
+
+        Files that are identical byte for byte are not read at all."""
+        self.setFilePaths(paths)
+        if filecmp.cmp(paths[0], paths[1], shallow=False):
+            return False
+        return self.differs(readModels(paths, session), session)
+
+
+def _fileState(path: Path) -> "tuple[int, int] | None":
+    """Returns the modification time and size of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watchPaths(
+    paths: Pair[Path],
+    session: Session,
+    interval: float = 1.0,
+    filter: Filter = None,
+    **options,
+) -> Iterator[File3dmDelta]:
+    """Compares the model stored in the second file with the one stored in the
+    first each time the second file is saved, yielding a new delta each time.
+
+    The first model is read, listed, and fingerprinted once and kept in
+    memory. The second file is polled every `interval` seconds and read
+    again in full once it has stopped changing. Only the components that
+    changed since the previous version are compared again; see
+    ModelDelta.compareIncrementally(). Any keyword
+    arguments, such as spillThreshold or columnar, are passed on to the
+    constructor of each delta."""
+    olderModel = readModel(paths[0])
+    snapshot = None
+    compared = None
+    while True:
+        state = _fileState(paths[1])
+        if state is None or state == compared:
+            sleep(interval)
+            continue
+        # Wait for the file to stop changing so that a partly saved file is not read
+        sleep(interval)
+        if _fileState(paths[1]) != state:
+            continue
+        compared = state
+
+        start = perf_counter()
+        try:
+            newerModel = readModel(paths[1])
+        except ValueError as e:
+            session.warn(str(e))
+            continue
+        delta = File3dmDelta(**options)
+        snapshot = delta.compareIncrementally(
+            (olderModel, newerModel), session, snapshot, filter
+        )
+        delta.setFilePaths(paths)
+        session.info(f"Compared {paths[1]} in {perf_counter() - start:.3f}s")
+        yield delta
+
+
+def compareHistory(
+    versions: Iterable[Tuple[FileDescription, File3dm]],
+    session: Session,
+    filter: Filter = None,
+    **options,
+) -> Iterator[File3dmDelta]:
+    """Compares each of a series of versions of a model with the one before
+    it, yielding one delta per step.
+
+    The versions are given oldest first, each with the description of the
+    file it came from, and are taken from the iterable one at a time. Each
+    version is read once and is the older side of the next comparison, so
+    no more than two models are held in memory. Any keyword arguments are
+    passed on to compare()."""
+    older = None
+    for description, model in versions:
+        if older is not None:
+            start = perf_counter()
+            delta = File3dmDelta()
+            delta.compare((older[1], model), session, filter=filter, **options)
+            delta.files = (older[0], description)
+            session.info(
+                f"Compared {older[0].path} with {description.path} in {perf_counter() - start:.3f}s"
+            )
+            yield delta
+        older = (description, model)
@@ -1,4 +1,8 @@
+import rhino3dm
+
 from ..abstractmodel import (
+    Accessor,
+    FunctionalAccessor,
     Property,
     BooleanValue,
     FloatValue,
@@ -182,19 +186,28 @@ ArcCurveProperties = CurveProperties + [
 ]
 
 
-class PolylineCurvePointsAccessor:
-    def getIndices(self, component):
-        return (i for i in range(component.PointCount))
-
-    def get(self, component, index):
-        return component.Point(index)
+class PolylineCurvePointsAccessor(Accessor):
+    def get(self, component):
+        geometry = component.Geometry
+        return [geometry.Point(i) for i in range(geometry.PointCount)]
 
-    def set(self, component, index, value):
-        component.SetPoint(index, value)
+    def set(self, component, points):
+        geometry = component.Geometry
+        if len(points) == geometry.PointCount:
+            for i, point in enumerate(points):
+                geometry.SetPoint(i, point)
+        elif isinstance(component, rhino3dm.File3dmObject):
+            # The number of points is fixed once a PolylineCurve is created,
+            # and the geometry of an object in a model cannot be reassigned
+            component.__wrapped__ = tables.GEOMETRY_TABLE.replaceGeometry(
+                component, rhino3dm.PolylineCurve(points)
+            )
+        else:
+            component.Geometry = rhino3dm.PolylineCurve(points)
 
 
-PolylineCurveProperties = CurveProperties = [
-    Property("Points", value_types.Point3d, PolylineCurvePointsAccessor())
+PolylineCurveProperties = CurveProperties + [
+    Property("Points", value_types.Point3dList, PolylineCurvePointsAccessor())
 ]
 
 TextDotProperties = GeometryProperties + [
@@ -243,7 +256,11 @@ def setSegments(linetype, segments):
 
 
 LinetypeProperties = CommonProperties + [
-    # Property("Segments", value_types.LINETYPE_SEGMENTS, FunctionalAccessor(getSegments, setSegments))
+    Property(
+        "Segments",
+        value_types.LinetypeSegments,
+        FunctionalAccessor(getSegments, setSegments),
+    ),
 ]
 
 
@@ -1,4 +1,5 @@
 from uuid import UUID
+import rhino3dm
 from rhino3dm import File3dm
 
 from wrapt import ObjectProxy
@@ -17,8 +18,7 @@ class File3dmComponentWrapper(ObjectProxy):
 
 class File3dmTable(Table):
     def __init__(self, name: str):
-        super().__init__()
-        self.name = name
+        super().__init__(name)
 
     def getTable(self, model: File3dm):
         return getattr(model, self.name)
@@ -26,6 +26,8 @@ class File3dmTable(Table):
     def getComponent(self, model, id):
         table = self.getTable(model)
         object = table.FindId(id)
+        if object is None:
+            return None
         return File3dmComponentWrapper(object, model)
 
     def allComponents(self, model):
@@ -33,6 +35,16 @@ class File3dmTable(Table):
         for component in table:
             yield File3dmComponentWrapper(component, model)
 
+    def count(self, model):
+        return len(self.getTable(model))
+
+    def componentKeys(self, model):
+        for index, component in enumerate(self.getTable(model)):
+            yield self.getComponentId(component), index
+
+    def getComponentByKey(self, model, key):
+        return File3dmComponentWrapper(self.getTable(model)[key], model)
+
     @staticmethod
     def getComponentId(component):
         return component.Id
@@ -66,12 +78,52 @@ class GeometricObjectTable(File3dmTable):
     def setComponentId(component, id):
         component.Attributes.Id = id
 
+    def getBoundingBox(self, component):
+        box = component.Geometry.GetBoundingBox()
+        return (box.Min.X, box.Min.Y, box.Min.Z, box.Max.X, box.Max.Y, box.Max.Z)
+
+    def geometryMatches(self, older, newer, tolerance):
+        if type(older.Geometry) is not type(newer.Geometry):
+            return False
+        olderPoints = _samplePoints(older.Geometry)
+        newerPoints = _samplePoints(newer.Geometry)
+        return len(olderPoints) == len(newerPoints) and all(
+            abs(p.X - q.X) <= tolerance
+            and abs(p.Y - q.Y) <= tolerance
+            and abs(p.Z - q.Z) <= tolerance
+            for p, q in zip(olderPoints, newerPoints)
+        )
+
     def addComponent(self, component, model: File3dm):
         self.getTable(model).Add(component.Geometry, component.Attributes)
 
     def deleteComponent(self, component, model: File3dm):
         self.getTable(model).Delete(component)
 
+    def replaceGeometry(self, component, geometry):
+        """Replaces an object in its model with one that has the given geometry
+        and the same ID and attributes, and returns the new object."""
+        table = self.getTable(component.model)
+        attributes = component.Attributes
+        table.Delete(attributes.Id)
+        return table.FindId(table.Add(geometry, attributes))
+
+
+def _samplePoints(geometry) -> list:
+    """Returns points that together describe the shape of a piece of geometry,
+    or an empty list for kinds of geometry whose shape is not sampled."""
+    if isinstance(geometry, rhino3dm.Point):
+        return [geometry.Location]
+    if isinstance(geometry, rhino3dm.PolylineCurve):
+        return [geometry.Point(i) for i in range(geometry.PointCount)]
+    if isinstance(geometry, rhino3dm.Curve):
+        t0, t1 = geometry.Domain.T0, geometry.Domain.T1
+        return [geometry.PointAt(t0 + (t1 - t0) * i / 4) for i in range(5)]
+    if isinstance(geometry, rhino3dm.Mesh):
+        vertices = geometry.Vertices
+        return [vertices[i] for i in range(len(vertices))]
+    return []
+
 
 BITMAP_TABLE = File3dmTable("Bitmaps")
 DIMENSION_STYLE_TABLE = File3dmTable("DimStyles")
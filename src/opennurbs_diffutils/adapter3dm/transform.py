@@ -1,3 +1,5 @@
+from copy import copy
+import copyreg
 import re
 import rhino3dm
 from ..abstractmodel import Delta, FloatValue
@@ -6,6 +8,34 @@ from ..abstractmodel import Delta, FloatValue
 # PATTERN = re.compile(r"transform\(([-\.0-9]+)([^-\.0-9]+([-\.0-9]+))*\)", re.IGNORECASE)
 
 
+def createTransform(values) -> rhino3dm.Transform:
+    """Creates a transform from its 16 elements, listed row by row."""
+    t = rhino3dm.Transform(1)
+    t.M00 = values[0]
+    t.M01 = values[1]
+    t.M02 = values[2]
+    t.M03 = values[3]
+    t.M10 = values[4]
+    t.M11 = values[5]
+    t.M12 = values[6]
+    t.M13 = values[7]
+    t.M20 = values[8]
+    t.M21 = values[9]
+    t.M22 = values[10]
+    t.M23 = values[11]
+    t.M30 = values[12]
+    t.M31 = values[13]
+    t.M32 = values[14]
+    t.M33 = values[15]
+    return t
+
+
+copyreg.pickle(
+    rhino3dm.Transform,
+    lambda t: (createTransform, (tuple(t.ToFloatArray(True)),)),
+)
+
+
 class Transformation(Delta):
 
     __slots__ = "_transform"
@@ -47,31 +77,27 @@ class Transformation(Delta):
                 value, remainder = FloatValue.fromString(remainder)
                 values.append(value)
             if len(values) == 16:
-                t = rhino3dm.Transform(1)
-                t.M00 = values[0].value
-                t.M01 = values[1].value
-                t.M02 = values[2].value
-                t.M03 = values[3].value
-                t.M10 = values[4].value
-                t.M11 = values[5].value
-                t.M12 = values[6].value
-                t.M13 = values[7].value
-                t.M20 = values[8].value
-                t.M21 = values[9].value
-                t.M22 = values[10].value
-                t.M23 = values[11].value
-                t.M30 = values[12].value
-                t.M31 = values[13].value
-                t.M32 = values[14].value
-                t.M33 = values[15].value
+                t = createTransform([value.value for value in values])
                 return Transformation(t), remainder
 
         raise Exception("Not a valid transformation")
 
+    def toJSON(self):
+        return {"transform": list(self._transform.ToFloatArray(True))}
+
+    @classmethod
+    def fromJSON(cls, data):
+        values = data.get("transform") if isinstance(data, dict) else None
+        if not isinstance(values, list) or len(values) != 16:
+            raise Exception("Not a valid transformation")
+        return Transformation(createTransform([float(v) for v in values]))
+
     def apply(self, geometry, session):
-        result = geometry.value.Transform(self._transform)
+        # Values can be shared by several deltas, so a copy is transformed
+        value = copy(geometry.value)
+        result = value.Transform(self._transform)
         if result is True:
-            return geometry
+            return geometry.__class__(value)
         return geometry.__class__(result)
 
     def reverse(self):
@@ -79,3 +105,9 @@ class Transformation(Delta):
         if ok:
             return Transformation(inverse)
         raise Exception("Unable to calculate inverse of transform")
+
+    def compose(self, other, session):
+        product = rhino3dm.Transform.Multiply(other._transform, self._transform)
+        if product.IsIdentity:
+            return None
+        return Transformation(product)
@@ -1,11 +1,47 @@
+import copyreg
 import re
 import rhino3dm
 
-from ..abstractmodel import Value, RegexParseableValue, FloatValue
+from ..abstractmodel import (
+    Value,
+    RegexParseableValue,
+    FloatValue,
+    SequenceValue,
+)
 
 from .transform import Transformation
 
 
+# Values held by deltas are pickled when deltas are cached
+copyreg.pickle(rhino3dm.Point3d, lambda p: (rhino3dm.Point3d, (p.X, p.Y, p.Z)))
+copyreg.pickle(rhino3dm.Vector3d, lambda v: (rhino3dm.Vector3d, (v.X, v.Y, v.Z)))
+copyreg.pickle(rhino3dm.Interval, lambda i: (rhino3dm.Interval, (i.T0, i.T1)))
+copyreg.pickle(rhino3dm.Line, lambda l: (rhino3dm.Line, (l.From, l.To)))
+
+
+def _createArc(plane, radius, angleDomain) -> rhino3dm.Arc:
+    """Creates an arc from its plane, radius, and the interval of angles it spans."""
+    arc = rhino3dm.Arc(rhino3dm.Circle(plane, radius), angleDomain.Length)
+    arc.AngleDomain = angleDomain
+    return arc
+
+
+copyreg.pickle(rhino3dm.Arc, lambda a: (_createArc, (a.Plane, a.Radius, a.AngleDomain)))
+
+
+def _numbers(data, count: int, label: str) -> list[float]:
+    """Checks that a value read from JSON is a list of the given number of numbers."""
+    if (
+        not isinstance(data, list)
+        or len(data) != count
+        or not all(
+            isinstance(n, (int, float)) and not isinstance(n, bool) for n in data
+        )
+    ):
+        raise Exception(f"{data!r} is not a valid {label}")
+    return data
+
+
 class Color(RegexParseableValue):
 
     _LABEL = "color"
@@ -14,6 +50,13 @@ class Color(RegexParseableValue):
     def __str__(self):
         return f"({self.value[0]}, {self.value[1]}, {self.value[2]}, {self.value[3]})"
 
+    def toJSON(self):
+        return list(self.value)
+
+    @classmethod
+    def fromJSON(cls, data):
+        return cls(tuple(int(n) for n in _numbers(data, 4, cls._LABEL)))
+
     @staticmethod
     def _createValueFromMatch(match):
         r = int(match[1])
@@ -31,11 +74,26 @@ class Interval(Value):
 
     _LABEL = "interval"
 
+    @classmethod
+    def rawEqual(cls, a, b):
+        return a.T0 == b.T0 and a.T1 == b.T1
+
+    @classmethod
+    def rawKey(cls, raw):
+        return (raw.T0, raw.T1)
+
     def __str__(self):
         t0 = FloatValue(self.value.T0)
         t1 = FloatValue(self.value.T1)
         return f"[{t0}, {t1}]"
 
+    def toJSON(self):
+        return [self.value.T0, self.value.T1]
+
+    @classmethod
+    def fromJSON(cls, data):
+        return cls(rhino3dm.Interval(*map(float, _numbers(data, 2, cls._LABEL))))
+
     @classmethod
     def fromString(cls, text):
         try:
@@ -58,15 +116,32 @@ class Interval(Value):
 
 class Object3d(RegexParseableValue):
 
+    _RAW_TYPE: type
     _PATTERN = re.compile(r"\s*\(([-\.\d\.]+)[,\s]+([-\.\d\.]+)[,\s]+([-\.\d\.]+)\)")
 
     def __str__(self):
         return f"({self.value.X}, {self.value.Y}, {self.value.Z})"
 
+    def toJSON(self):
+        return [self.value.X, self.value.Y, self.value.Z]
+
+    @classmethod
+    def fromJSON(cls, data):
+        return cls(cls._RAW_TYPE(*map(float, _numbers(data, 3, cls._LABEL))))
+
+    @classmethod
+    def rawEqual(cls, a, b):
+        return a.X == b.X and a.Y == b.Y and a.Z == b.Z
+
+    @classmethod
+    def rawKey(cls, raw):
+        return (raw.X, raw.Y, raw.Z)
+
 
 class Point3d(Object3d):
 
     _LABEL = "3D point"
+    _RAW_TYPE = rhino3dm.Point3d
 
     @staticmethod
     def _createValueFromMatch(match):
@@ -79,6 +154,7 @@ class Point3d(Object3d):
 class Vector3d(Object3d):
 
     _LABEL = "3D vector"
+    _RAW_TYPE = rhino3dm.Vector3d
 
     @staticmethod
     def _createValueFromMatch(match):
@@ -88,6 +164,42 @@ class Vector3d(Object3d):
         return rhino3dm.Vector3d(x, y, z)
 
 
+Point3dList = SequenceValue.defineSubclass("Point3dList", "list of 3D points", Point3d)
+
+
+class LinetypeSegment(RegexParseableValue):
+
+    _LABEL = "linetype segment"
+    _PATTERN = re.compile(r"\s*\(([-+\deE\.]+)[,\s]+(true|false)\)")
+
+    def __str__(self):
+        length, solid = self.value
+        return f"({FloatValue(length)}, {'true' if solid else 'false'})"
+
+    def toJSON(self):
+        length, solid = self.value
+        return [length, solid]
+
+    @classmethod
+    def fromJSON(cls, data):
+        if (
+            not isinstance(data, list)
+            or len(data) != 2
+            or not isinstance(data[1], bool)
+        ):
+            raise Exception(f"{data!r} is not a valid {cls._LABEL}")
+        return cls((float(_numbers(data[:1], 1, cls._LABEL)[0]), data[1]))
+
+    @staticmethod
+    def _createValueFromMatch(match):
+        return (float(match[1]), match[2] == "true")
+
+
+LinetypeSegments = SequenceValue.defineSubclass(
+    "LinetypeSegments", "list of linetype segments", LinetypeSegment
+)
+
+
 class GeometricValue(Value):
     def __str__(self):
         raise NotImplementedError()
@@ -102,8 +214,13 @@ class GeometricValue(Value):
 
 
 class Line(GeometricValue):
-    def __eq__(self, other):
-        return self.value.From == other.value.From and self.value.To == other.value.To
+    @classmethod
+    def rawEqual(cls, a, b):
+        return Point3d.rawEqual(a.From, b.From) and Point3d.rawEqual(a.To, b.To)
+
+    @classmethod
+    def rawKey(cls, raw):
+        return (Point3d.rawKey(raw.From), Point3d.rawKey(raw.To))
 
     def diff(self, other):
         older: rhino3dm.Line = self.value
@@ -129,12 +246,22 @@ class Line(GeometricValue):
 
 
 class Arc(GeometricValue):
-    def __eq__(self, other):
+    @classmethod
+    def rawEqual(cls, a, b):
+        return (
+            Point3d.rawEqual(a.Center, b.Center)
+            and a.Radius == b.Radius
+            and Vector3d.rawEqual(a.Plane.ZAxis, b.Plane.ZAxis)
+            and a.AngleRadians == b.AngleRadians
+        )
+
+    @classmethod
+    def rawKey(cls, raw):
         return (
-            self.value.Center == other.value.Center
-            and self.value.Radius == other.value.Radius
-            and self.value.Plane.ZAxis == other.value.Plane.ZAxis
-            and self.value.AngleRadians == other.value.AngleRadians
+            Point3d.rawKey(raw.Center),
+            raw.Radius,
+            Vector3d.rawKey(raw.Plane.ZAxis),
+            raw.AngleRadians,
         )
 
     def diff(self, other):
@@ -1,7 +1,7 @@
 from argparse import ArgumentParser
 from sys import exit, stderr
 from colorama import Fore, Style
-from ..abstractmodel import Session
+from ..abstractmodel import Filter, Session
 
 
 def print_version(programName):
@@ -29,8 +29,37 @@ def checkForVersionArgument(programName) -> ArgumentParser:
     return parser
 
 
+def addFilterArguments(parser: ArgumentParser):
+    parser.add_argument(
+        "--only",
+        "--include",
+        dest="only",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="limit to the tables, types, properties, or components that match PATTERN (table:NAME, type:NAME, property:NAME, or id:UUID)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="skip the tables, types, properties, or components that match PATTERN",
+    )
+
+
+def filterFromArguments(parser: ArgumentParser, args) -> "Filter | None":
+    if len(args.only) == 0 and len(args.exclude) == 0:
+        return None
+    try:
+        return Filter(args.only, args.exclude)
+    except ValueError as e:
+        parser.error(str(e))
+
+
 class ConsoleSession(Session):
-    def __init__(self):
+    def __init__(self, verbose=False):
+        self._verbose = verbose
         self._componentType = None
         self._componentID = None
         self._property = None
@@ -58,6 +87,10 @@ class ConsoleSession(Session):
             file=stderr,
         )
 
+    def info(self, message: str) -> None:
+        if self._verbose:
+            print(message, file=stderr)
+
     def fatal(self, message: str) -> None:
         print(
             Fore.RED + "Fatal error: " + message + self._context() + Style.RESET_ALL,
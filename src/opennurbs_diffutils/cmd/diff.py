@@ -1,22 +1,50 @@
 from argparse import ArgumentParser
+import importlib.metadata
 from pathlib import Path
 import sys
 
-from ..adapter3dm import File3dmDelta
-from .common import ConsoleSession, checkForArgument, checkForVersionArgument
+from ..abstractmodel import DeltaCache, FileDescription, Session
+from ..adapter3dm import (
+    File3dmDelta,
+    compareHistory,
+    readModel,
+    readModelFromBytes,
+    watchPaths,
+)
+from .common import (
+    ConsoleSession,
+    addFilterArguments,
+    checkForArgument,
+    checkForVersionArgument,
+    filterFromArguments,
+)
+from .git import ObjectReader, gitDirectory, listRevisions, objectPath
 
 PROGRAM_NAME = "3dmdiff"
 
+CACHE_DIRECTORY_NAME = "3dmdiff-cache"
+"The directory within the git directory in which the deltas found by gitExternalDiff() are kept."
+
+NULL_OBJECT_IDS = {".", "0" * 40, "0" * 64}
+"The object IDs git passes for a file that does not exist or has not been hashed."
+
 
 def main():
     versionParser = checkForVersionArgument(PROGRAM_NAME)
     gitOptionParser, useGit = checkForArgument(
         "--git", help="expect arguments provided to GIT_EXTERNAL_DIFF"
     )
+    historyOptionParser, history = checkForArgument(
+        "--history",
+        help="compare each of a series of versions of a model with the one before it",
+    )
 
     if useGit:
         procedure = gitExternalDiff
         usage = "%(prog)s --git path oldfile oldhex oldmode newfile newhex newmode"
+    elif history:
+        procedure = historyDiff
+        usage = "%(prog)s --history [options] file...\n       %(prog)s --history --revisions RANGE [options] file"
     else:
         procedure = standardDiff
         usage = "%(prog)s [options] fromfile tofile"
@@ -25,7 +53,7 @@ def main():
         prog=PROGRAM_NAME,
         usage=usage,
         description="Find differences between two openNURBS models",
-        parents=[versionParser, gitOptionParser],
+        parents=[versionParser, gitOptionParser, historyOptionParser],
     )
     procedure(parser)
 
@@ -38,17 +66,84 @@ def gitExternalDiff(parser: ArgumentParser):
     parser.add_argument("newFile", type=Path)
     parser.add_argument("newHex", type=str)
     parser.add_argument("newMode", type=str)
+    parser.add_argument(
+        "--verbose", action="store_true", help="report how long each step takes"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always compare the files instead of reusing the delta found the last time the same pair of files was compared",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="keep at most MB megabytes of deltas in the cache in the git directory (default: %(default)s)",
+    )
+    addFilterArguments(parser)
     args = parser.parse_args()
+    filter = filterFromArguments(parser, args)
 
-    session = ConsoleSession()
+    session = ConsoleSession(args.verbose)
 
-    delta = File3dmDelta()
-    delta.comparePaths((args.oldFile, args.newFile), session)
+    cache, key = None, None
+    if not args.no_cache and not {args.oldHex, args.newHex} & NULL_OBJECT_IDS:
+        try:
+            cache = DeltaCache(
+                gitDirectory() / CACHE_DIRECTORY_NAME,
+                File3dmDelta,
+                args.cache_size * 1024 * 1024,
+            )
+            key = externalDiffCacheKey(args)
+        except ValueError as e:
+            session.info(f"Not caching delta: {e}")
+
+    delta = cache.get(key) if cache is not None else None
+    if delta is not None:
+        session.info(f"Reused delta between {args.oldHex} and {args.newHex}")
+    else:
+        delta = File3dmDelta()
+        delta.comparePaths((args.oldFile, args.newFile), session, filter=filter)
+        if cache is not None:
+            cache.put(key, delta)
     delta.files[0].label(f"a/{args.path}")
     delta.files[1].label(f"b/{args.path}")
     delta.write(sys.stdout)
 
 
+def externalDiffCacheKey(args) -> str:
+    """Returns the key under which the delta between the pair of files given
+    to gitExternalDiff() is cached.
+
+    Files with the same object IDs have the same contents, so the key is
+    made of the object IDs, the version of the tool, and the filter
+    options, which are all that determine the delta."""
+    try:
+        version = importlib.metadata.version("opennurbs_diffutils")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return "\n".join(
+        [
+            "git external diff",
+            args.oldHex,
+            args.newHex,
+            version,
+            *(f"only {pattern}" for pattern in args.only),
+            *(f"exclude {pattern}" for pattern in args.exclude),
+        ]
+    )
+
+
+def addFormatArgument(parser: ArgumentParser):
+    parser.add_argument(
+        "--format",
+        choices=["text", "jsonl"],
+        default="text",
+        help="write the delta as a patch (text) or as one JSON record per line (jsonl) (default: %(default)s)",
+    )
+
+
 def standardDiff(parser: ArgumentParser):
     parser.add_argument("fromfile", type=Path)
     parser.add_argument("tofile", type=Path)
@@ -64,12 +159,72 @@ def standardDiff(parser: ArgumentParser):
     parser.add_argument(
         "--label", action="append", default=[], help="use LABEL instead of file name"
     )
+    addFormatArgument(parser)
+    parser.add_argument(
+        "--match-geometry",
+        type=float,
+        metavar="TOLERANCE",
+        help="treat a deleted and an added object whose bounding boxes match within TOLERANCE as one object whose ID changed",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="retrieve components one at a time, listing them in order of ID",
+    )
+    parser.add_argument(
+        "--spill-after",
+        type=int,
+        metavar="COUNT",
+        help="keep at most COUNT added, deleted, or modified components of each kind in memory, moving the rest to a temporary database",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="store modified components in columns by type and property, which uses less memory when there are very many",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep fromfile in memory and write a new delta each time tofile is saved; tofile is read and fingerprinted in full each time, but only its changed components are compared",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="how often to check whether tofile has been saved when watching (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="report how long each step takes"
+    )
+    addFilterArguments(parser)
     args = parser.parse_args()
+    filter = filterFromArguments(parser, args)
+
+    session = ConsoleSession(args.verbose)
 
-    session = ConsoleSession()
+    if args.watch:
+        if args.brief or args.match_geometry is not None or args.low_memory:
+            parser.error(
+                "--watch cannot be combined with --brief, --match-geometry, or --low-memory"
+            )
+        watchDiff(args, session, filter)
+        return
 
-    delta = File3dmDelta()
-    delta.comparePaths((args.fromfile, args.tofile), session)
+    delta = File3dmDelta(spillThreshold=args.spill_after, columnar=args.columnar)
+    paths = (args.fromfile, args.tofile)
+    # The early exit of pathsDiffer() compares whole tables, so it cannot honor a filter
+    if args.brief and filter is None:
+        differ = delta.pathsDiffer(paths, session)
+    else:
+        delta.comparePaths(
+            paths,
+            session,
+            matchTolerance=args.match_geometry,
+            streaming=args.low_memory,
+            filter=filter,
+        )
+        differ = delta.hasDifferences
 
     if len(args.label) >= 1:
         delta.files[0].label(args.label[0])
@@ -77,11 +232,103 @@ def standardDiff(parser: ArgumentParser):
     if len(args.label) >= 2:
         delta.files[1].label(args.label[1])
 
-    if delta.hasDifferences:
+    if differ:
         if args.brief:
             print(f"Files {delta.files[0].path} and {delta.files[1].path} differ")
         else:
-            delta.write(sys.stdout)
+            delta.write(sys.stdout, args.format)
         sys.exit(1)
     elif args.report_identical_files:
         print(f"Files {delta.files[0].path} and {delta.files[1].path} are identical")
+
+
+def watchDiff(args, session: ConsoleSession, filter):
+    """Writes a delta each time the working model is saved until interrupted."""
+    try:
+        for delta in watchPaths(
+            (args.fromfile, args.tofile),
+            session,
+            args.interval,
+            filter,
+            spillThreshold=args.spill_after,
+            columnar=args.columnar,
+        ):
+            for file, label in zip(delta.files, args.label):
+                file.label(label)
+            delta.write(sys.stdout, args.format)
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    except ValueError as e:
+        session.fatal(str(e))
+
+
+def historyDiff(parser: ArgumentParser):
+    parser.add_argument(
+        "files",
+        type=Path,
+        nargs="+",
+        help="the versions of the model, oldest first, or with --revisions, the file whose versions are compared",
+    )
+    parser.add_argument(
+        "--revisions",
+        metavar="RANGE",
+        help="compare the versions of the file committed in RANGE of the git repository in the current directory, such as v1.0..main",
+    )
+    addFormatArgument(parser)
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="retrieve components one at a time, listing them in order of ID",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="report how long each step takes"
+    )
+    addFilterArguments(parser)
+    args = parser.parse_args()
+    filter = filterFromArguments(parser, args)
+
+    session = ConsoleSession(args.verbose)
+
+    if args.revisions is not None:
+        if len(args.files) != 1:
+            parser.error("--revisions takes exactly one file")
+        versions = gitVersions(args.files[0], args.revisions, session)
+    elif len(args.files) < 2:
+        parser.error("--history needs at least two files")
+    else:
+        versions = fileVersions(args.files)
+
+    differ = False
+    try:
+        for delta in compareHistory(
+            versions, session, filter, streaming=args.low_memory
+        ):
+            delta.write(sys.stdout, args.format)
+            differ = differ or delta.hasDifferences
+    except ValueError as e:
+        session.fatal(str(e))
+    if differ:
+        sys.exit(1)
+
+
+def fileVersions(paths: list[Path]):
+    """Reads the models stored in the given files one at a time."""
+    for path in paths:
+        yield FileDescription(path), readModel(path)
+
+
+def gitVersions(path: Path, revisionRange: str, session: Session):
+    """Reads the versions of the model stored in the given file that were committed in a range of revisions, one at a time.
+
+    Every version is read through the same git process. Revisions in which
+    the file does not exist, such as one that deletes it, are skipped."""
+    revisions = listRevisions(revisionRange, path)
+    with ObjectReader() as objects:
+        for revision in revisions:
+            name = f"{revision}:{objectPath(path)}"
+            data = objects.read(name)
+            if data is None:
+                session.warn(f"{path} does not exist in {revision}")
+                continue
+            yield FileDescription.fromLabel(name), readModelFromBytes(data, name)
@@ -1,9 +1,8 @@
 from argparse import ArgumentParser
 from pathlib import Path
 import sys
-import rhino3dm
 
-from ..adapter3dm import File3dmDelta
+from ..adapter3dm import File3dmDelta, readModels
 from .common import ConsoleSession, checkForVersionArgument
 
 PROGRAM_NAME = "3dmdiff3"
@@ -21,24 +20,27 @@ def main():
     parser.add_argument("yourfile", type=Path)
     parser.add_argument("-m", "--merge", action="store_true")
     parser.add_argument("-o", "--output", type=Path, metavar="FILE")
+    parser.add_argument(
+        "--verbose", action="store_true", help="report how long each step takes"
+    )
     args = parser.parse_args()
 
-    session = ConsoleSession()
-
-    mine = File3dmDelta()
-    mine.comparePaths((args.oldfile, args.myfile), session)
-
-    yours = File3dmDelta()
-    yours.comparePaths((args.oldfile, args.yourfile), session)
+    session = ConsoleSession(args.verbose)
 
-    merged = mine.merge(yours, session)
+    # The base model is kept, rather than read again, to apply the merged changes to
+    models = readModels((args.oldfile, args.myfile, args.yourfile), session)
+    merged = File3dmDelta()
+    conflicts = merged.compareThreeWay(models, session)
+    merged.setFilePaths((args.oldfile, args.myfile))
+    for conflict in conflicts:
+        session.warn(str(conflict))
 
     if args.merge:
-        session = ConsoleSession()
-        model = rhino3dm.File3dm.Read(str(args.oldfile))
-        if model is None:
-            session.fatal(f"Failed to read file {args.oldfile}")
+        if len(conflicts) > 0:
+            session.fatal(f"Unable to merge {len(conflicts)} conflicting changes")
 
+        # Comparing the models does not change them
+        model = models[0]
         merged.apply(model, session)
 
         outputPath = args.output if args.output else args.oldfile
@@ -49,3 +51,5 @@ def main():
 
     else:
         merged.write(sys.stdout)
+        if len(conflicts) > 0:
+            sys.exit(1)
@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+import subprocess
+
+
+def runGit(*args: str) -> str:
+    """Runs a git command in the current directory and returns its output.
+
+    Raises a ValueError with git's error message if the command fails."""
+    completed = subprocess.run(
+        ["git", *args], capture_output=True, text=True, encoding="utf-8"
+    )
+    if completed.returncode != 0:
+        raise ValueError(completed.stderr.strip() or f"git {args[0]} failed")
+    return completed.stdout
+
+
+def gitDirectory() -> Path:
+    """Returns the directory of the repository in the current directory that
+    is shared by all of its worktrees."""
+    return Path(runGit("rev-parse", "--git-common-dir").strip()).resolve()
+
+
+def objectPath(path: Path) -> str:
+    """Returns the form of a path in the working tree that git resolves
+    relative to the current directory when it follows a revision, as in
+    HEAD:./model.3dm."""
+    relative = Path(os.path.relpath(path)).as_posix()
+    if relative.startswith("../"):
+        return relative
+    return "./" + relative
+
+
+def listRevisions(revisionRange: str, path: Path) -> list[str]:
+    """Lists the commits in the given range that changed the file at the given path, oldest first.
+
+    When the range has the form START..END, the commit named by START is
+    listed first, so that the first change in the range is compared with
+    the version of the file it was made to."""
+    revisions = runGit("rev-list", "--reverse", revisionRange, "--", str(path)).split()
+    start, separator, end = revisionRange.partition("..")
+    if separator and start and not end.startswith("."):
+        revisions.insert(
+            0, runGit("rev-parse", "--verify", f"{start}^{{commit}}").strip()
+        )
+    return revisions
+
+
+class ObjectReader:
+    """Reads the contents of objects from the repository in the current
+    directory through a single git cat-file --batch process, rather than
+    starting a process for each object."""
+
+    __slots__ = "_process"
+
+    def __init__(self):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def read(self, name: str) -> "bytes | None":
+        """Returns the contents of the blob with the given name, such as
+        HEAD:./model.3dm, or None if there is no such object."""
+        self._process.stdin.write(name.encode("utf-8") + b"\n")
+        self._process.stdin.flush()
+        # The header is "<id> <type> <size>", or "<name> missing" and the
+        # like, where the name may itself contain spaces
+        header = self._process.stdout.readline().decode("utf-8").rstrip("\n")
+        if header.endswith((" missing", " ambiguous")):
+            return None
+        _, type, size = header.rsplit(" ", 2)
+        data = self._process.stdout.read(int(size))
+        self._process.stdout.read(1)  # The newline that follows the contents
+        if type != "blob":
+            raise ValueError(f"{name} is a {type}, not a file")
+        return data
+
+    def close(self):
+        """Ends the git process."""
+        self._process.stdin.close()
+        self._process.wait()
@@ -1,50 +1,221 @@
 from argparse import ArgumentParser
+import io
 from pathlib import Path
 import sys
 from typing import TextIO
 
 import rhino3dm
 
-from ..abstractmodel import Session
+from ..abstractmodel import DeltaCache, Filter, ParseError, Session
+from ..abstractmodel.session import SilentSession
 from ..adapter3dm import File3dmDelta
-from .common import ConsoleSession, checkForVersionArgument
+from .common import (
+    ConsoleSession,
+    addFilterArguments,
+    checkForArgument,
+    checkForVersionArgument,
+    filterFromArguments,
+)
 
 PROGRAM_NAME = "3dmpatch"
 
 
-def readPatch(input: TextIO, session: Session) -> File3dmDelta:
+def readPatch(
+    input: TextIO,
+    session: Session,
+    filter: Filter = None,
+    cache: DeltaCache = None,
+    rejects: TextIO = None,
+) -> File3dmDelta:
+    if cache is not None:
+        delta = cache.read(input.read())
+        if filter is None:
+            return delta
+        rejected = File3dmDelta()
+        delta = delta.filtered(filter, rejected)
+        if rejects is not None and rejected.hasDifferences:
+            rejected.write(rejects)
+        return delta
     delta = File3dmDelta()
     # try:
-    delta.read(input)
+    delta.read(input, filter, rejects)
     return delta
     # except ParseError as e:
     #     session.fatal(f"Error on line {e.lineNumber}: {e.__context__.args[0]}")
 
 
 def main():
+    versionParser = checkForVersionArgument(PROGRAM_NAME)
+    squashOptionParser, squash = checkForArgument(
+        "--squash", help="combine a series of deltas into one instead of applying them"
+    )
+
+    if squash:
+        procedure = squashPatches
+        usage = "%(prog)s --squash [options] patchfile..."
+    else:
+        procedure = applyPatch
+        usage = "%(prog)s [options] [originalfile [patchfile...]]"
+
     parser = ArgumentParser(
         prog=PROGRAM_NAME,
-        usage="%(prog)s [options] [originalfile [patchfile]]",
+        usage=usage,
         description="Apply a delta to an openNURBS model",
-        parents=[checkForVersionArgument(PROGRAM_NAME)],
+        parents=[versionParser, squashOptionParser],
+    )
+    procedure(parser)
+
+
+def readSeries(path: Path) -> list[Path]:
+    """Reads the names of the patch files listed in a series file, one per line.
+
+    Blank lines and comments beginning with '#' are ignored. Relative names
+    are resolved against the directory that contains the series file."""
+    with open(path, "r", encoding="utf-8") as file:
+        lines = [line.split("#", 1)[0].split() for line in file]
+    return [path.parent / words[0] for words in lines if len(words) > 0]
+
+
+def readPatchFiles(
+    paths: list[Path],
+    session: Session,
+    filter: Filter = None,
+    cache: Path = None,
+    rejects: list[TextIO] = None,
+) -> list[File3dmDelta]:
+    """Reads the deltas stored in the given files, where '-' denotes standard input.
+
+    If a filter is given, only the changes it includes are read, and if a
+    list of output streams is given for rejects, the changes it excludes
+    from each file are written as a delta to the stream at the same
+    position. If a cache directory is given, deltas that were parsed before
+    are loaded from it."""
+    cache = DeltaCache(cache, File3dmDelta) if cache is not None else None
+    deltas = []
+    for number, path in enumerate(paths):
+        output = rejects[number] if rejects is not None else None
+        try:
+            if str(path) == "-":
+                deltas.append(readPatch(sys.stdin, session, filter, cache, output))
+            else:
+                with open(path, "r", encoding="utf-8") as file:
+                    deltas.append(readPatch(file, session, filter, cache, output))
+        except ParseError as e:
+            session.fatal(
+                f"Error on line {e.lineNumber} of {path}: {e.__context__}"
+            )
+    return deltas
+
+
+def rejectPaths(path: Path, count: int) -> list[Path]:
+    """Returns the names of the files to which the changes skipped from each of a number of patches are written.
+
+    The changes skipped from a single patch are written to the given path,
+    and those skipped from a series of patches to a file for each patch,
+    numbered from 1 as in rejects.1.3dmdiff."""
+    if count == 1:
+        return [path]
+    return [
+        path.with_name(f"{path.stem}.{number}{path.suffix}")
+        for number in range(1, count + 1)
+    ]
+
+
+def composeDeltas(steps: list[tuple[Path, File3dmDelta]], session: Session):
+    """Combines a series of deltas, each paired with the file it was read from, into one."""
+    composed = None
+    for path, delta in steps:
+        try:
+            composed = (
+                composed.compose(delta, session) if composed is not None else delta
+            )
+        except Exception as e:
+            session.fatal(f"Failed to squash {path}: {e}")
+    return composed
+
+
+def squashPatches(parser: ArgumentParser):
+    parser.add_argument(
+        "patchfiles",
+        type=Path,
+        nargs="*",
+        help="The files containing the deltas, in the order they apply",
+    )
+    parser.add_argument(
+        "--series",
+        type=Path,
+        metavar="FILE",
+        help="read the names of the patch files from FILE",
+    )
+    parser.add_argument("-o", "--output", type=Path, metavar="FILE")
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        metavar="DIR",
+        help="keep parsed patches in DIR and reuse them when the same patch is read again",
     )
+    addFilterArguments(parser)
+    args = parser.parse_args()
+    filter = filterFromArguments(parser, args)
+
+    session = ConsoleSession()
+
+    paths = args.patchfiles + (readSeries(args.series) if args.series else [])
+    if len(paths) == 0:
+        parser.error("no patch files given")
+
+    steps = list(zip(paths, readPatchFiles(paths, session, filter, args.cache)))
+    squashed = composeDeltas(steps, session)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            squashed.write(file)
+    else:
+        squashed.write(sys.stdout)
+
+
+def applyPatch(parser: ArgumentParser):
     parser.add_argument(
         "originalfile", type=Path, nargs="?", help="The model to be patched"
     )
     parser.add_argument(
-        "patchfile",
+        "patchfiles",
         type=Path,
-        nargs="?",
-        default="-",
-        help="The file containing the delta",
+        nargs="*",
+        help="The files containing the deltas, applied in the order given",
+    )
+    parser.add_argument(
+        "--series",
+        type=Path,
+        metavar="FILE",
+        help="read the names of the patch files from FILE",
     )
     parser.add_argument("-o", "--output", type=Path, metavar="FILE")
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        metavar="DIR",
+        help="keep parsed patches in DIR and reuse them when the same patch is read again",
+    )
     parser.add_argument("-R", "--reverse", action="store_true")
+    parser.add_argument(
+        "-r",
+        "--reject-file",
+        type=Path,
+        metavar="FILE",
+        help="write the changes skipped by --include or --exclude to FILE, or to a numbered file for each patch (FILE.1, FILE.2, ...) when there are several",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="report whether the patches apply cleanly without changing any files",
+    )
+    addFilterArguments(parser)
     args = parser.parse_args()
+    filter = filterFromArguments(parser, args)
 
     # Consider implementing:
     # -f, --force               Assume that the user knows exactly what he or she is doing, and do not ask any questions
-    # -r, --reject-file         Use reject-file as the reject file name
     # -s, --quiet, --silent     Work silently unless an error occurs
     # -t, --batch               Do not ask any questions
     # -T, --set-time            Set the modification and access times of patched files from timestamps given in context diff headers, assuming that the context diff headers use local time
@@ -53,23 +224,58 @@ def main():
 
     session = ConsoleSession()
 
-    if str(args.patchfile) == "-":
-        delta = readPatch(sys.stdin, session)
+    paths = args.patchfiles + (readSeries(args.series) if args.series else [])
+    if len(paths) == 0:
+        paths = [Path("-")]
+
+    # Every patch is parsed before the model is loaded so that a malformed
+    # patch is reported without paying for the read
+    rejects = [io.StringIO() for _ in paths] if args.reject_file is not None else None
+    deltas = readPatchFiles(paths, session, filter, args.cache, rejects)
+    if rejects is not None:
+        for path, output in zip(rejectPaths(args.reject_file, len(paths)), rejects):
+            if output.tell() > 0:
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(output.getvalue())
+    if Path("-") in paths:
         # Return stdin to the terminal in case we need interactive input
         sys.stdin = open("/dev/tty", "r")
-    else:
-        with open(args.patchfile, "r", encoding="utf-8") as file:
-            delta = readPatch(file, session)
 
+    steps = list(zip(paths, deltas))
     if args.reverse:
-        delta = delta.reverse()
+        steps = [(path, delta.reverse()) for path, delta in reversed(steps)]
 
-    inputPath = args.originalfile if args.originalfile else delta.files[0].path
+    inputPath = args.originalfile if args.originalfile else steps[0][1].files[0].path
     model = rhino3dm.File3dm.Read(str(inputPath))
     if model is None:
         session.fatal(f"Failed to read file {inputPath}")
 
-    delta.apply(model, session)
+    if args.check:
+        # Later patches expect the values left by earlier ones, so each patch
+        # is checked against the model as changed by the patches before it.
+        # The changes are only made to the copy of the model in memory.
+        conflicts = 0
+        for number, (path, delta) in enumerate(steps, 1):
+            conflicts += delta.check(model, session)
+            if number == len(steps):
+                break
+            try:
+                delta.apply(model, SilentSession())
+            except Exception as e:
+                session.fatal(
+                    f"Failed to check {path} (patch {number} of {len(steps)}): {e}"
+                )
+        if conflicts > 0:
+            session.fatal(f"{conflicts} conflicting changes in {inputPath}")
+        return
+
+    for number, (path, delta) in enumerate(steps, 1):
+        try:
+            delta.apply(model, session)
+        except Exception as e:
+            session.fatal(
+                f"Failed to apply {path} (patch {number} of {len(steps)}): {e}"
+            )
 
     outputPath = args.output if args.output else inputPath
 
@@ -0,0 +1,132 @@
+"""A small model format that exercises the abstract model without rhino3dm."""
+
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from opennurbs_diffutils.abstractmodel import (
+    ComponentType,
+    ComponentTypeRegistry,
+    IntegerValue,
+    ModelDelta,
+    ModelType,
+    Property,
+    SequenceValue,
+    Session,
+    StringValue,
+    Table,
+)
+
+
+class Model:
+    def __init__(self, title: str = "", components=()):
+        self.Title = title
+        self.components = {}
+        for component in components:
+            component.model = self
+            self.components[component.Id] = component
+
+
+class Thing:
+    def __init__(self, Id: UUID = None, Name="", N=0, Points=(), Box=None):
+        self.Id = Id if Id is not None else uuid4()
+        self.Name = Name
+        self.N = N
+        self.Points = list(Points)
+        self.Box = Box
+        self.model = None
+
+
+class Other:
+    """A component of a type that is not registered with the model type."""
+
+    def __init__(self, Id: UUID = None):
+        self.Id = Id if Id is not None else uuid4()
+        self.model = None
+
+
+class ThingTable(Table):
+    def getComponent(self, model, id):
+        return model.components.get(id)
+
+    def allComponents(self, model):
+        return list(model.components.values())
+
+    @staticmethod
+    def getComponentId(component):
+        return component.Id
+
+    @staticmethod
+    def setComponentId(component, id):
+        component.Id = id
+
+    def getBoundingBox(self, component):
+        return component.Box
+
+    def geometryMatches(self, older, newer, tolerance):
+        return len(older.Points) == len(newer.Points) and all(
+            abs(p - q) <= tolerance for p, q in zip(older.Points, newer.Points)
+        )
+
+    def addComponent(self, component, model):
+        component.model = model
+        model.components[component.Id] = component
+
+    def deleteComponent(self, id, model):
+        del model.components[id]
+
+
+IntegerList = SequenceValue.defineSubclass(
+    "IntegerList", "list of integers", IntegerValue
+)
+
+TABLE = ThingTable("Things")
+THING = ComponentType(
+    "Thing",
+    Thing,
+    TABLE,
+    [
+        Property("Name", StringValue, "Name"),
+        Property("N", IntegerValue, "N"),
+        Property("Points", IntegerList, "Points"),
+    ],
+)
+MODEL_TYPE = ModelType(
+    [TABLE], ComponentTypeRegistry([THING]), [Property("Title", StringValue, "Title")]
+)
+
+
+class RecordingSession(Session):
+    """A session that records its warnings instead of printing them."""
+
+    def __init__(self):
+        self.warnings = []
+
+    def ask(self, question):
+        return False
+
+    def warn(self, message):
+        self.warnings.append(message)
+
+    def info(self, message):
+        pass
+
+    def fatal(self, message):
+        raise RuntimeError(message)
+
+    def setContext(self, componentType, componentID, property):
+        pass
+
+
+def compareModels(older: Model, newer: Model, **options) -> ModelDelta:
+    """Returns the delta between two models, labeled with placeholder file names."""
+    delta = ModelDelta(MODEL_TYPE, **options)
+    delta.compare((older, newer), RecordingSession())
+    label(delta)
+    return delta
+
+
+def label(delta: ModelDelta):
+    """Gives the files of a delta fixed labels so that its text can be compared."""
+    delta.setFilePaths((Path(__file__), Path(__file__)))
+    delta.files[0].label("a/model")
+    delta.files[1].label("b/model")
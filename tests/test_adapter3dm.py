@@ -0,0 +1,28 @@
+import pytest
+
+rhino3dm = pytest.importorskip("rhino3dm")
+
+from opennurbs_diffutils.adapter3dm import properties, tables
+
+
+def points(count: int):
+    return [rhino3dm.Point3d(i, i * i, 0) for i in range(count)]
+
+
+def test_changing_polyline_point_count_replaces_object():
+    model = rhino3dm.File3dm()
+    attributes = rhino3dm.ObjectAttributes()
+    attributes.Name = "polyline"
+    id = model.Objects.Add(rhino3dm.PolylineCurve(points(3)), attributes)
+    component = tables.GEOMETRY_TABLE.getComponent(model, id)
+
+    accessor = properties.PolylineCurvePointsAccessor()
+    accessor.set(component, points(5))
+
+    assert len(model.Objects) == 1
+    replaced = model.Objects.FindId(id)
+    assert replaced.Attributes.Name == "polyline"
+    assert replaced.Geometry.PointCount == 5
+    assert [(p.X, p.Y) for p in accessor.get(component)] == [
+        (p.X, p.Y) for p in points(5)
+    ]
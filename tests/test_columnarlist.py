@@ -0,0 +1,50 @@
+import io
+import pickle
+from uuid import uuid4
+
+from opennurbs_diffutils.abstractmodel import ModelDelta
+
+from .fakemodel import THING, Model, Thing, compareModels, label
+
+
+def models():
+    older = [Thing(Name=f"thing {i}", N=i, Points=range(i)) for i in range(6)]
+    newer = [
+        Thing(t.Id, t.Name if i % 2 else f"renamed {i}", t.N + i % 3, t.Points[1:])
+        for i, t in enumerate(older)
+    ]
+    return Model(components=older), Model(components=newer)
+
+
+def text(delta: ModelDelta) -> str:
+    output = io.StringIO()
+    delta.write(output)
+    return output.getvalue()
+
+
+def test_columnar_delta_matches_object_delta():
+    older, newer = models()
+    objects = compareModels(older, newer)
+    columns = compareModels(older, newer, columnar=True)
+    assert len(columns.modifications) == len(objects.modifications)
+    assert text(columns) == text(objects)
+
+
+def test_columnar_modifications_are_found_by_id_and_type():
+    older, newer = models()
+    columns = compareModels(older, newer, columnar=True).modifications
+    id = next(iter(newer.components))
+    found = columns.find(id)
+    assert found.id == id
+    assert found.properties[THING.getProperty("Name")].newer.value == "renamed 0"
+    assert columns.find(uuid4()) is None
+    assert len(list(columns.ofType("Thing"))) == len(columns)
+    assert list(columns.ofType("Other")) == []
+
+
+def test_columnar_delta_pickles():
+    older, newer = models()
+    delta = compareModels(older, newer, columnar=True)
+    restored = pickle.loads(pickle.dumps(delta))
+    label(restored)
+    assert text(restored) == text(delta)
@@ -0,0 +1,49 @@
+import io
+
+from opennurbs_diffutils.abstractmodel import ModelDelta
+
+from .fakemodel import MODEL_TYPE, THING, Model, Thing, compareModels
+
+
+def text(delta: ModelDelta, format="text") -> str:
+    output = io.StringIO()
+    delta.write(output, format)
+    return output.getvalue()
+
+
+def models():
+    older = [Thing(Name=f"thing {i}", N=i) for i in range(4)]
+    newer = [Thing(older[0].Id, "http://example.com/a:b", 0)]
+    newer += [Thing(t.Id, t.Name, t.N + 1) for t in older[1:3]]
+    newer.append(Thing(Name="ftp://added", N=7))
+    return Model(components=older), Model(components=newer)
+
+
+def test_spilled_deltas_match_deltas_held_in_memory():
+    older, newer = models()
+    inMemory = compareModels(older, newer)
+    spilled = compareModels(older, newer, spillThreshold=0)
+    assert len(spilled.modifications) == len(inMemory.modifications) == 3
+    for format in ("text", "jsonl"):
+        assert text(spilled, format) == text(inMemory, format)
+
+
+def test_spilled_deltas_can_be_found_by_id_and_type():
+    older, newer = models()
+    delta = compareModels(older, newer, spillThreshold=1)
+    id = next(iter(newer.components))
+    found = delta.findComponent(id)
+    assert found is not None
+    assert (
+        str(found.properties[THING.getProperty("Name")].newer)
+        == '"http://example.com/a:b"'
+    )
+    assert len(list(delta.modifications.ofType("Thing"))) == 3
+
+
+def test_values_containing_colons_are_read_back():
+    older, newer = models()
+    delta = compareModels(older, newer)
+    reread = ModelDelta(MODEL_TYPE)
+    reread.read(io.StringIO(text(delta)))
+    assert text(reread) == text(delta)
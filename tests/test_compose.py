@@ -0,0 +1,105 @@
+import pytest
+
+from opennurbs_diffutils.abstractmodel import (
+    ComponentType,
+    IntegerValue,
+    Property,
+    StringValue,
+    Substitution,
+)
+from opennurbs_diffutils.abstractmodel.componentdelta import (
+    ComponentAddition,
+    ComponentModification,
+)
+
+from .fakemodel import (
+    IntegerList,
+    TABLE,
+    THING,
+    Model,
+    RecordingSession,
+    Thing,
+    compareModels,
+)
+
+
+def compose(*models):
+    deltas = [compareModels(older, newer) for older, newer in zip(models, models[1:])]
+    return deltas[0].compose(deltas[1], RecordingSession())
+
+
+def test_deletion_and_readdition_compose_against_defaults():
+    thing = Thing(Name="x", N=3)
+    readded = Thing(Id=thing.Id, Name="y", Points=[1, 2])
+    composed = compose(Model(components=[thing]), Model(), Model(components=[readded]))
+
+    (delta,) = composed.components
+    assert isinstance(delta, ComponentModification)
+    assert {str(property) for property in delta.properties} == {"Name", "N", "Points"}
+
+    model = Model(components=[Thing(Id=thing.Id, Name="x", N=3)])
+    composed.apply(model, RecordingSession())
+    result = model.components[thing.Id]
+    assert (result.Name, result.N, result.Points) == ("y", 0, [1, 2])
+
+
+def test_deletion_and_identical_readdition_cancel_out():
+    thing = Thing(Name="x")
+    composed = compose(
+        Model(components=[thing]),
+        Model(),
+        Model(components=[Thing(Id=thing.Id, Name="x")]),
+    )
+    assert list(composed.components) == []
+
+
+def test_addition_and_modification_compose_into_addition():
+    thing = Thing(Name="x", Points=[1, 2, 3])
+    modified = Thing(Id=thing.Id, Name="xy", N=4, Points=[1, 3])
+    composed = compose(Model(), Model(components=[thing]), Model(components=[modified]))
+
+    (delta,) = composed.components
+    assert isinstance(delta, ComponentAddition)
+    values = {
+        str(property): value.value for property, value in delta.properties.items()
+    }
+    assert values == {"Name": "xy", "N": 4, "Points": [1, 3]}
+
+
+def test_addition_and_edit_of_default_property_compose():
+    thing = Thing(Name="x")
+    edited = Thing(Id=thing.Id, Name="x", Points=[1, 2])
+    delta = compareModels(Model(components=[thing]), Model(components=[edited]))
+    (modification,) = delta.components
+    assert not isinstance(
+        modification.properties[THING.getProperty("Points")], Substitution
+    )
+
+    composed = compose(Model(), Model(components=[thing]), Model(components=[edited]))
+    (addition,) = composed.components
+    assert isinstance(addition, ComponentAddition)
+    values = {
+        str(property): value.value for property, value in addition.properties.items()
+    }
+    assert values == {"Name": "x", "Points": [1, 2]}
+
+
+def test_addition_refuses_unrecorded_delta_only_change():
+    points = Property("Points", IntegerList, "Points", deltaOnly=True)
+    thingType = ComponentType(
+        "Thing",
+        Thing,
+        TABLE,
+        [
+            Property("Name", StringValue, "Name"),
+            Property("N", IntegerValue, "N"),
+            points,
+        ],
+    )
+    addition = ComponentAddition(thingType, Thing().Id)
+    addition.properties[thingType.getProperty("Name")] = StringValue("x")
+    modification = ComponentModification(thingType, addition.id)
+    modification.properties[points] = IntegerList([1, 2]).diff(IntegerList([2]))
+
+    with pytest.raises(Exception, match="Change to Points"):
+        addition.compose(modification, RecordingSession())
@@ -0,0 +1,51 @@
+import os
+import time
+
+from opennurbs_diffutils.abstractmodel import ModelDelta
+from opennurbs_diffutils.abstractmodel.deltacache import (
+    ABANDONED_AFTER,
+    SUFFIX,
+    DeltaCache,
+)
+
+from .fakemodel import MODEL_TYPE, Model, Thing, compareModels
+
+
+def createDelta():
+    return ModelDelta(MODEL_TYPE)
+
+
+def someDelta():
+    older = Thing(Name="a", N=1)
+    newer = Thing(older.Id, "a", 2)
+    return compareModels(Model(components=[older]), Model(components=[newer]))
+
+
+def test_abandoned_temporary_files_are_removed(tmp_path):
+    abandoned = tmp_path / "abandoned.123.tmp"
+    recent = tmp_path / "recent.456.tmp"
+    abandoned.write_bytes(b"x" * 10)
+    recent.write_bytes(b"x" * 10)
+    old = time.time() - ABANDONED_AFTER - 60
+    os.utime(abandoned, (old, old))
+
+    DeltaCache(tmp_path, createDelta).put("key", someDelta())
+
+    assert not abandoned.exists()
+    assert recent.exists()
+    assert len(list(tmp_path.glob("*" + SUFFIX))) == 1
+
+
+def test_temporary_files_count_towards_the_size_bound(tmp_path):
+    DeltaCache(tmp_path, createDelta).put("first", someDelta())
+    (entry,) = tmp_path.glob("*" + SUFFIX)
+    size = entry.stat().st_size
+    old = time.time() - 60
+    os.utime(entry, (old, old))
+    (tmp_path / "writing.789.tmp").write_bytes(b"x" * size)
+
+    cache = DeltaCache(tmp_path, createDelta, maxBytes=2 * size)
+    cache.put("second", someDelta())
+
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
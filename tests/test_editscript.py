@@ -0,0 +1,133 @@
+import pickle
+
+import pytest
+
+from opennurbs_diffutils.abstractmodel import (
+    SequenceEdit,
+    StringEdit,
+    StringValue,
+    Substitution,
+)
+
+from .fakemodel import IntegerList, RecordingSession
+
+IntegerListEdit = IntegerList.deltaType()
+
+
+def diff(older, newer):
+    return IntegerList(older).diff(IntegerList(newer))
+
+
+@pytest.mark.parametrize(
+    "older, newer",
+    [
+        ([1, 2, 3], [1, 2, 3, 4]),
+        ([1, 2, 3], [0, 1, 2, 3]),
+        ([1, 2, 3, 4, 5], [1, 5]),
+        ([1, 2, 3, 4, 5], [1, 9, 3, 8, 5]),
+        ([], [1, 2]),
+        ([1, 2], []),
+    ],
+)
+def test_sequence_edit_applies_and_reverses(older, newer):
+    edit = diff(older, newer)
+    assert isinstance(edit, SequenceEdit)
+    session = RecordingSession()
+    assert edit.apply(IntegerList(older), session).value == newer
+    assert edit.reverse().apply(IntegerList(newer), session).value == older
+    assert session.warnings == []
+
+
+def test_sequence_edit_records_only_changed_runs():
+    edit = diff(list(range(100)), list(range(50)) + [0] + list(range(50, 100)))
+    assert edit.edits == [(50, [], [0])]
+    assert str(edit) == "edit(@50 [] -> [0])"
+
+
+def test_sequence_edit_warns_when_applied_to_other_value():
+    edit = diff([1, 2, 3], [1, 4, 3])
+    session = RecordingSession()
+    assert not edit.matches(IntegerList([1, 5, 3]))
+    assert edit.apply(IntegerList([1, 5, 3]), session).value == [1, 4, 3]
+    assert len(session.warnings) == 1
+
+
+@pytest.mark.parametrize(
+    "first, second, third",
+    [
+        ([1, 2, 3, 4], [1, 9, 3, 4], [1, 9, 3, 8]),
+        ([1, 2, 3, 4], [1, 2, 7, 7, 3, 4], [1, 7, 3]),
+        ([1, 2, 3], [1, 2, 3, 4], [0, 1, 2, 3, 4]),
+        ([1, 2, 3, 4, 5], [1, 5], [1, 6, 5]),
+    ],
+)
+def test_sequence_edits_compose(first, second, third):
+    composed = diff(first, second).compose(diff(second, third), RecordingSession())
+    assert composed.apply(IntegerList(first), RecordingSession()).value == third
+
+
+def test_sequence_edits_that_cancel_compose_to_nothing():
+    edit = diff([1, 2, 3], [1, 3])
+    assert edit.compose(edit.reverse(), RecordingSession()) is None
+
+
+def test_sequence_edit_composes_with_substitution():
+    edit = diff([1, 2, 3], [1, 3])
+    substitution = Substitution.specialize(IntegerList)(
+        IntegerList([1, 3]), IntegerList([7])
+    )
+    composed = edit.compose(substitution, RecordingSession())
+    assert composed.older.value == [1, 2, 3]
+    assert composed.newer.value == [7]
+
+
+def test_sequence_edit_round_trips():
+    edit = diff([1, 2, 3, 4], [0, 1, 3, 4, 5])
+    parsed, remainder = IntegerListEdit.fromString(str(edit) + " rest")
+    assert parsed == edit
+    assert remainder == " rest"
+    assert IntegerListEdit.fromJSON(edit.toJSON()) == edit
+    assert pickle.loads(pickle.dumps(edit)) == edit
+
+
+StringDelta = StringValue.deltaType()
+
+
+def test_long_string_change_is_an_edit_script():
+    older = "a long description of a component " * 4
+    newer = older.replace("description", "account", 1)
+    edit = StringValue(older).diff(StringValue(newer))
+    assert isinstance(edit, StringEdit)
+    assert edit.apply(StringValue(older), RecordingSession()).value == newer
+    assert edit.reverse().apply(StringValue(newer), RecordingSession()).value == older
+
+
+def test_short_string_change_is_a_substitution():
+    substitution = StringValue("ab").diff(StringValue("cd"))
+    assert isinstance(substitution, Substitution)
+    parsed, _ = StringDelta.fromString(str(substitution))
+    assert isinstance(parsed, Substitution)
+    assert parsed.newer.value == "cd"
+
+
+@pytest.mark.parametrize("newer", ['quote " and \\ backslash', "new\nline", ""])
+def test_string_edit_round_trips(newer):
+    older = "the same long prefix, " * 3 + "and then something"
+    edit = StringDelta.between(StringValue(older), StringValue(newer))
+    parsed, remainder = StringDelta.fromString(str(edit))
+    assert parsed == edit
+    assert remainder == ""
+    assert StringDelta.fromJSON(edit.toJSON()) == edit
+    assert parsed.apply(StringValue(older), RecordingSession()).value == newer
+
+
+def test_string_edits_compose():
+    first = "the quick brown fox jumps over the lazy dog"
+    second = "the quick red fox jumps over the lazy dog"
+    third = "the quick red fox leaps over the lazy cat"
+    edits = [
+        StringDelta.between(StringValue(a), StringValue(b))
+        for a, b in [(first, second), (second, third)]
+    ]
+    composed = edits[0].compose(edits[1], RecordingSession())
+    assert composed.apply(StringValue(first), RecordingSession()).value == third
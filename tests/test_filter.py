@@ -0,0 +1,42 @@
+from uuid import UUID
+
+import pytest
+
+from opennurbs_diffutils.abstractmodel import Filter
+
+from .fakemodel import THING
+
+
+def test_filter_without_patterns_includes_everything():
+    filter = Filter()
+    assert filter.includesTable("Things")
+    assert filter.includesType("Thing")
+    assert filter.includesProperty("Thing", "Name")
+    assert filter.includesComponent(UUID(int=1))
+
+
+def test_only_and_exclude_patterns():
+    filter = Filter(["type:T*", "property:thing.name"], ["type:Tree"])
+    assert filter.includesType("Thing")
+    assert not filter.includesType("Tree")
+    assert not filter.includesType("Other")
+    assert filter.includesProperty("Thing", "NAME")
+    assert not filter.includesProperty("Thing", "N")
+    assert not filter.includesProperty("Other", "Name")
+
+
+def test_id_patterns():
+    id = UUID("12345678-0000-0000-0000-000000000000")
+    filter = Filter(["id:12345678-*"])
+    assert filter.includesComponent(id)
+    assert not filter.includesComponent(UUID(int=1))
+
+
+def test_property_list_is_filtered():
+    filter = Filter(exclude=["property:N*"])
+    assert [p.name for p in filter.properties("Thing", THING.properties)] == ["Points"]
+
+
+def test_pattern_without_category_is_rejected():
+    with pytest.raises(ValueError):
+        Filter(["Thing"])
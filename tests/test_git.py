@@ -0,0 +1,28 @@
+import subprocess
+
+import pytest
+
+from opennurbs_diffutils.cmd.git import ObjectReader
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a model.3dm").write_bytes(b"contents\nof the model")
+    for command in [
+        ["init", "-q"],
+        ["add", "a model.3dm"],
+        ["-c", "user.name=test", "-c", "user.email=test@example.com"]
+        + ["commit", "-q", "-m", "add model"],
+    ]:
+        subprocess.run(["git", *command], check=True)
+    return tmp_path
+
+
+def test_object_reader_reads_blobs_and_missing_names(repository):
+    with ObjectReader() as reader:
+        assert reader.read("HEAD:./a model.3dm") == b"contents\nof the model"
+        assert reader.read("HEAD:./another model.3dm") is None
+        assert reader.read("HEAD:./a model.3dm") == b"contents\nof the model"
+        with pytest.raises(ValueError):
+            reader.read("HEAD")
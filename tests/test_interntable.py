@@ -0,0 +1,36 @@
+import io
+
+from opennurbs_diffutils.abstractmodel import ModelDelta, StringValue
+from opennurbs_diffutils.abstractmodel.interntable import InternTable
+
+from .fakemodel import MODEL_TYPE, THING, Model, Thing, compareModels
+
+
+def test_same_text_is_parsed_once():
+    interns = InternTable()
+    first = interns.parse(StringValue, '"x"')
+    assert interns.parse(StringValue, '"x"') is first
+    assert interns.parse(StringValue, '"y"') is not first
+
+
+def test_substitutions_share_their_values():
+    interns = InternTable()
+    Substitution = THING.getProperty("N").type.deltaType()
+    first = interns.parse(Substitution, "1 -> 2")
+    second = interns.parse(Substitution, "2 -> 1")
+    assert first.newer is second.older
+    assert first.older is second.newer
+
+
+def test_deltas_read_from_text_share_values():
+    older = [Thing(Name="a", N=1) for _ in range(3)]
+    newer = [Thing(t.Id, "a", 2) for t in older]
+    output = io.StringIO()
+    compareModels(Model(components=older), Model(components=newer)).write(output)
+
+    delta = ModelDelta(MODEL_TYPE)
+    output.seek(0)
+    delta.read(output)
+    N = THING.getProperty("N")
+    first, *rest = (d.properties[N] for d in delta.components)
+    assert all(substitution is first for substitution in rest)
@@ -0,0 +1,72 @@
+from opennurbs_diffutils.abstractmodel import ModelDelta
+from opennurbs_diffutils.abstractmodel.matching import SpatialGrid, matchByGeometry
+
+from .fakemodel import MODEL_TYPE, TABLE, Model, Other, RecordingSession, Thing
+
+
+def box(x, y=0.0, z=0.0, size=1.0):
+    return (x, y, z, x + size, y + size, z + size)
+
+
+def match(deleted, added, tolerance=0.01):
+    return matchByGeometry(
+        {c.Id: c for c in deleted},
+        {c.Id: c for c in added},
+        TABLE,
+        MODEL_TYPE.componentTypes,
+        tolerance,
+    )
+
+
+def test_grid_finds_boxes_in_neighbouring_cells():
+    grid = SpatialGrid(1.0)
+    grid.insert("key", box(0.9), "a")
+    grid.insert("key", box(3.0), "b")
+    grid.insert("other", box(1.0), "c")
+    assert [item for _, item in grid.nearby("key", box(1.1))] == ["a"]
+    grid.remove("key", box(0.9), "a")
+    assert list(grid.nearby("key", box(1.1))) == []
+
+
+def test_components_are_paired_with_closest_match():
+    deleted = Thing(Box=box(0.0))
+    near = Thing(Box=box(0.004))
+    nearer = Thing(Box=box(0.001))
+    far = Thing(Box=box(0.5))
+    assert match([deleted], [near, nearer, far]) == [(deleted.Id, nearer.Id)]
+
+
+def test_each_added_component_is_claimed_once():
+    first, second = Thing(Box=box(0.0)), Thing(Box=box(0.0))
+    added = Thing(Box=box(0.0))
+    assert match([first, second], [added]) == [(first.Id, added.Id)]
+
+
+def test_components_with_different_geometry_in_the_same_box_are_not_paired():
+    deleted = Thing(Points=[0, 1], Box=box(0.0))
+    corners = Thing(Points=[0, 1, 0], Box=box(0.0))
+    moved = Thing(Points=[0, 2], Box=box(0.0))
+    same = Thing(Points=[0, 1], Box=box(0.005))
+    assert match([deleted], [corners, moved]) == []
+    assert match([deleted], [corners, moved, same]) == [(deleted.Id, same.Id)]
+
+
+def test_components_without_boxes_or_types_are_not_paired():
+    assert match([Thing()], [Thing()]) == []
+    unknown = Other()
+    unknown.Box = box(0.0)
+    assert match([unknown], [Thing(Box=box(0.0))]) == []
+
+
+def test_compare_describes_matched_components_as_modifications():
+    older = Thing(Name="x", N=1, Box=box(2.0))
+    newer = Thing(Name="x", N=2, Box=box(2.0))
+    delta = ModelDelta(MODEL_TYPE)
+    delta.compare(
+        (Model(components=[older]), Model(components=[newer])),
+        RecordingSession(),
+        matchTolerance=0.01,
+    )
+    (modification,) = delta.components
+    assert (modification.id, modification.newId) == (older.Id, newer.Id)
+    assert [property.name for property in modification.properties] == ["N"]
@@ -0,0 +1,129 @@
+import io
+import json
+
+import pytest
+
+from opennurbs_diffutils.abstractmodel import (
+    Filter,
+    ModelDelta,
+    Property,
+    PropertyDeltaMap,
+    StringValue,
+)
+
+from .fakemodel import (
+    MODEL_TYPE,
+    Model,
+    Other,
+    RecordingSession,
+    THING,
+    Thing,
+    compareModels,
+)
+
+
+def differs(older: Model, newer: Model) -> bool:
+    return ModelDelta(MODEL_TYPE).differs((older, newer), RecordingSession())
+
+
+def test_differs_finds_changed_property():
+    thing = Thing(Name="x")
+    assert not differs(Model(components=[thing]), Model(components=[thing]))
+    changed = Thing(Id=thing.Id, Name="y")
+    assert differs(Model(components=[thing]), Model(components=[changed]))
+
+
+def test_differs_ignores_components_of_unregistered_types():
+    thing = Thing(Name="x")
+    older = Model(components=[thing])
+    newer = Model(components=[Thing(Id=thing.Id, Name="x"), Other()])
+    assert not differs(older, newer)
+
+
+def test_differs_finds_component_replaced_by_unregistered_type():
+    thing = Thing(Name="x")
+    older = Model(components=[thing])
+    newer = Model(components=[Other(Id=thing.Id)])
+    assert differs(older, newer)
+    assert differs(newer, older)
+
+
+@pytest.mark.parametrize("format", ["text", "jsonl"])
+def test_read_skips_model_properties_of_excluded_model_type(format):
+    thing = Thing(Name="x")
+    delta = compareModels(
+        Model("old", [thing]), Model("new", [Thing(Id=thing.Id, Name="y")])
+    )
+    output = io.StringIO()
+    delta.write(output, format)
+
+    read = ModelDelta(MODEL_TYPE)
+    rejects = io.StringIO()
+    output.seek(0)
+    read.read(output, Filter(["type:Thing"]), rejects)
+    assert len(read.properties) == 0
+    assert len(list(read.components)) == 1
+    assert "Title" in rejects.getvalue()
+
+
+def write(delta: ModelDelta, format="text") -> str:
+    output = io.StringIO()
+    delta.write(output, format)
+    return output.getvalue()
+
+
+def changedModels():
+    things = [Thing(Name=f"thing {i}", N=i, Points=[i]) for i in range(3)]
+    older = Model("old", things)
+    newer = Model(
+        "new",
+        [
+            Thing(things[0].Id, 'say "hi"\n', 0, [0, 1]),
+            Thing(things[1].Id, "thing 1", 5, [1]),
+            Thing(Name="added", Points=[4, 5]),
+        ],
+    )
+    return older, newer
+
+
+def test_json_lines_round_trip():
+    delta = compareModels(*changedModels())
+    lines = write(delta, "jsonl")
+    assert all(json.loads(line) for line in lines.splitlines())
+
+    read = ModelDelta(MODEL_TYPE)
+    read.read(io.StringIO(lines))
+    assert write(read) == write(delta)
+    assert write(read, "jsonl") == lines
+
+
+def test_json_lines_rejects_excluded_properties():
+    delta = compareModels(*changedModels())
+    read = ModelDelta(MODEL_TYPE)
+    rejects = io.StringIO()
+    read.read(
+        io.StringIO(write(delta, "jsonl")), Filter(exclude=["property:N"]), rejects
+    )
+
+    assert all(
+        property.name != "N" for d in read.components for property in d.properties
+    )
+    records = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert records[0]["record"] == "header"
+    assert {name for r in records[1:] for name in r.get("properties", {})} == {"N"}
+
+
+def test_check_reports_each_mismatch_once():
+    name = THING.getProperty("Name")
+    label = Property("Label", StringValue, "Name", affectedBy=name)
+    changes = PropertyDeltaMap(
+        [
+            (name, StringValue("x").diff(StringValue("y"))),
+            (label, StringValue("y").diff(StringValue("z"))),
+        ]
+    )
+    session = RecordingSession()
+    assert changes.check(Thing(Name="q"), session) == 1
+    assert len(session.warnings) == 1
+    assert changes.check(Thing(Name="x"), session) == 0
+    assert len(session.warnings) == 1
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+from opennurbs_diffutils.abstractmodel import ModelDelta, Query
+
+from .fakemodel import MODEL_TYPE, Model, RecordingSession, Thing, compareModels
+
+
+def models():
+    kept = Thing(Name="kept", N=1)
+    renamed = Thing(Name="old name", N=2)
+    deleted = Thing(Name="deleted")
+    older = Model(components=[kept, renamed, deleted])
+    newer = Model(
+        components=[
+            Thing(Id=kept.Id, Name="kept", N=5),
+            Thing(Id=renamed.Id, Name="new name", N=2),
+            Thing(Name="added"),
+        ]
+    )
+    return older, newer, (kept, renamed, deleted)
+
+
+def names(deltas):
+    return sorted(f"{delta.operation} {delta.id}" for delta in deltas)
+
+
+CRITERIA = [
+    {},
+    {"operation": "modified"},
+    {"operation": "added"},
+    {"property": "Name"},
+    {"property": "n", "operation": "modified"},
+    {"type": "Thing"},
+    {"type": "Other"},
+    {"table": "Things", "operation": "deleted"},
+]
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_queries_agree_across_sources(criteria):
+    older, newer, _ = models()
+    delta = compareModels(older, newer)
+    expected = names(delta.query(**criteria))
+
+    text = io.StringIO()
+    delta.write(text)
+    text.seek(0)
+    assert names(ModelDelta(MODEL_TYPE).queryInput(text, **criteria)) == expected
+
+    found = ModelDelta(MODEL_TYPE).queryModels(
+        (older, newer), RecordingSession(), **criteria
+    )
+    assert names(found) == expected
+
+
+def test_query_selects_by_id_and_property():
+    older, newer, (kept, renamed, _) = models()
+    delta = compareModels(older, newer)
+    assert [d.id for d in delta.query(property="Name", operation="modified")] == [
+        renamed.Id
+    ]
+    assert [d.id for d in delta.query(id=str(kept.Id))] == [kept.Id]
+
+
+def test_query_reads_only_the_queried_property():
+    older, newer, (kept, _, _) = models()
+    (found,) = ModelDelta(MODEL_TYPE).queryModels(
+        (older, newer), RecordingSession(), id=str(kept.Id), property="N"
+    )
+    assert [property.name for property in found.properties] == ["N"]
+
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ValueError):
+        Query(operation="renamed")
@@ -0,0 +1,93 @@
+from opennurbs_diffutils.abstractmodel import (
+    ComponentType,
+    ComponentTypeRegistry,
+    ModelDelta,
+    ModelType,
+    Property,
+    Value,
+)
+from opennurbs_diffutils.abstractmodel.snapshot import fingerprint
+
+from .fakemodel import (
+    MODEL_TYPE,
+    TABLE,
+    THING,
+    Model,
+    RecordingSession,
+    Thing,
+    ThingTable,
+)
+
+
+class Box:
+    """An object whose textual representation includes its address."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def __eq__(self, other):
+        return self.size == other.size
+
+    __hash__ = None
+
+
+BOXED_THING = ComponentType("BoxedThing", Thing, TABLE, [Property("Box", Value, "Box")])
+
+
+def test_fingerprints_of_equal_components_match():
+    properties = list(THING.properties)
+    first = Thing(Name="a", N=1, Points=[1, 2])
+    second = Thing(Name="a", N=1, Points=[1, 2])
+    assert fingerprint(THING, first, properties) == fingerprint(
+        THING, second, properties
+    )
+    second.Points.append(3)
+    assert fingerprint(THING, first, properties) != fingerprint(
+        THING, second, properties
+    )
+
+
+def test_fingerprints_of_opaque_values_never_match():
+    properties = list(BOXED_THING.properties)
+    thing = Thing(Box=Box(1))
+    assert fingerprint(BOXED_THING, thing, properties) != fingerprint(
+        BOXED_THING, thing, properties
+    )
+
+
+class CountingTable(ThingTable):
+    """A table that counts how many times the components of each model are listed."""
+
+    def __init__(self):
+        super().__init__("Things")
+        self.listed = []
+
+    def allComponents(self, model):
+        self.listed.append(model)
+        return super().allComponents(model)
+
+
+def test_incremental_comparison_lists_base_model_once():
+    table = CountingTable()
+    thingType = ComponentType("Thing", Thing, table, list(THING.properties))
+    modelType = ModelType(
+        [table], ComponentTypeRegistry([thingType]), list(MODEL_TYPE.properties)
+    )
+    kept, changed = Thing(Name="kept"), Thing(Name="changed", N=1)
+    base = Model(components=[kept, changed])
+
+    snapshot = None
+    counts = []
+    for n in (1, 2, 1):
+        newer = Model(
+            components=[Thing(kept.Id, "kept"), Thing(changed.Id, "changed", n)]
+        )
+        delta = ModelDelta(modelType)
+        snapshot = delta.compareIncrementally(
+            (base, newer), RecordingSession(), snapshot
+        )
+        counts.append(len(list(delta.components)))
+
+    assert counts == [0, 1, 0]
+    assert table.listed.count(base) == 1
+    assert len(snapshot.baseFingerprints) == 2
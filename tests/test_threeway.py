@@ -0,0 +1,74 @@
+from opennurbs_diffutils.abstractmodel import (
+    ComponentType,
+    ComponentTypeRegistry,
+    ModelDelta,
+    ModelType,
+    Property,
+    StringValue,
+)
+
+from .fakemodel import MODEL_TYPE, TABLE, THING, Model, RecordingSession, Thing
+
+
+class Widget(Thing):
+    pass
+
+
+WIDGET = ComponentType("Widget", Widget, TABLE, [Property("Name", StringValue, "Name")])
+TWO_TYPES = ModelType(
+    [TABLE], ComponentTypeRegistry([THING, WIDGET]), list(MODEL_TYPE.properties)
+)
+
+
+def merge(base: Model, mine: Model, yours: Model, modelType=MODEL_TYPE):
+    delta = ModelDelta(modelType)
+    conflicts = delta.compareThreeWay((base, mine, yours), RecordingSession())
+    return delta, conflicts
+
+
+def test_changes_on_either_side_are_merged():
+    thing = Thing(Name="x", N=1, Points=[1, 2])
+    base = Model("title", [thing])
+    mine = Model("new title", [Thing(thing.Id, "y", 1, [1, 2])])
+    yours = Model("title", [Thing(thing.Id, "x", 2, [1, 2])])
+    delta, conflicts = merge(base, mine, yours)
+    assert conflicts == []
+
+    delta.apply(base, RecordingSession())
+    assert base.Title == "new title"
+    assert (thing.Name, thing.N, thing.Points) == ("y", 2, [1, 2])
+
+
+def test_different_changes_to_a_property_conflict():
+    thing = Thing(Name="x")
+    _, conflicts = merge(
+        Model(components=[thing]),
+        Model(components=[Thing(thing.Id, "y")]),
+        Model(components=[Thing(thing.Id, "z")]),
+    )
+    (conflict,) = conflicts
+    assert (conflict.id, conflict.property.name) == (thing.Id, "Name")
+
+
+def test_change_of_type_conflicts():
+    thing = Thing(Name="x")
+    _, conflicts = merge(
+        Model(components=[thing]),
+        Model(components=[Widget(thing.Id, "x")]),
+        Model(components=[Thing(thing.Id, "x")]),
+        TWO_TYPES,
+    )
+    (conflict,) = conflicts
+    assert (conflict.mine, conflict.yours) == ("Widget", "Thing")
+
+
+def test_compare_reports_change_of_type():
+    thing = Thing(Name="x")
+    session = RecordingSession()
+    delta = ModelDelta(TWO_TYPES)
+    delta.compare(
+        (Model(components=[thing]), Model(components=[Widget(thing.Id, "x")])),
+        session,
+    )
+    assert not delta.hasDifferences
+    assert session.warnings == [f"'Thing {thing.Id} became a Widget'"]